@@ -0,0 +1,165 @@
+"""
+import 시간(cold start) 벤치마크.
+
+측정 항목마다 새 Python 프로세스를 띄워 import(또는 짧은 스크립트)만 실행하고 끝나는 시간을 잰다.
+빈 인터프리터(`python -c pass`) 시작 시간을 뺀 값을 보고한다.
+headless로 쓰는 모듈이 tkinter(또는 작은 입력에서 numpy)를 불러오면 실패로 보고한다.
+.pyc는 임시 디렉터리(PYTHONPYCACHEPREFIX)에 만들어 소스 트리에 __pycache__를 남기지 않는다
+(항목마다 측정 전에 한 번 실행해서 표준 라이브러리까지 .pyc를 채워 둔다).
+
+    python benchmarks/bench_import.py -o import.json
+    python benchmarks/bench_import.py --compare import.json --threshold 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA = 1
+
+_LOAD_V03 = ("import importlib.util; "
+             "spec = importlib.util.spec_from_file_location('waveform_gen_v0_3', 'waveform_gen_v0.3.py'); "
+             "spec.loader.exec_module(importlib.util.module_from_spec(spec))")
+_GENERATE = ("from waveform_core import VerilogAGenerator; "
+             "VerilogAGenerator.generate([[0, 1, 1, 0] * 64, [0, 1] * 128], ['a', 'b'], ['one-shot', '반복'], "
+             "{'tck_str': '10n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 1.2, 'vlow': 0.0})")
+
+# (이름, 실행할 코드, 불러오면 안 되는 모듈)
+CASES: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("waveform_storage", "import waveform_storage", ("tkinter", "numpy")),
+    ("waveform_edges", "import waveform_edges", ("tkinter", "numpy")),
+    ("waveform_io", "import waveform_io", ("tkinter", "numpy")),
+    ("waveform_core", "import waveform_core", ("tkinter", "numpy")),
+    ("waveform_spice", "import waveform_spice", ("tkinter", "numpy")),
+    ("waveform_vcd", "import waveform_vcd", ("tkinter", "numpy")),
+    ("waveform_batch", "import waveform_batch", ("tkinter", "numpy", "multiprocessing")),
+    ("waveform_gen", "import waveform_gen", ("tkinter",)),
+    ("waveform_gen_v0.3", _LOAD_V03, ("tkinter",)),
+    ("generate_small", _GENERATE, ("tkinter", "numpy")),
+    # 참고용: 편집기를 띄울 때만 내는 GUI 모듈 import 비용
+    ("tkinter", "import tkinter, tkinter.ttk, tkinter.filedialog, tkinter.messagebox", ()),
+]
+
+_PROBE = "\nimport sys; print(' '.join(m for m in {mods!r} if m in sys.modules))"
+
+
+def run_once(code: str, forbidden: Sequence[str] = (), pycache: Optional[str] = None) -> Tuple[float, List[str]]:
+    """
+    새 프로세스에서 code를 실행한 시간(초)과, 불러온 forbidden 모듈 목록.
+    pycache를 주면 .pyc를 그 디렉터리에서 읽고 쓴다. 없으면 .pyc를 새로 쓰지 않는다.
+    """
+    if pycache is None:
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    else:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)  # 임시 디렉터리에는 써야 다음 실행이 .pyc를 읽는다
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code + _PROBE.format(mods=tuple(forbidden))],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    return elapsed, proc.stdout.split()
+
+
+def bench(repeat: int, only: Optional[Sequence[str]] = None, quiet: bool = False) -> Tuple[float, List[Dict]]:
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as pycache:
+        return _bench(repeat, only, quiet, pycache)
+
+
+def _bench(repeat: int, only: Optional[Sequence[str]], quiet: bool, pycache: str) -> Tuple[float, List[Dict]]:
+    # 버리는 실행으로 .pyc를 미리 만들어 두어 첫 실행의 컴파일 시간이 섞이지 않게 한다
+    run_once("pass", pycache=pycache)
+    base = min(run_once("pass", pycache=pycache)[0] for _ in range(repeat))
+    if not quiet:
+        print(f"interpreter start {base * 1e3:.1f} ms (빼고 보고)")
+    results = []
+    for name, code, forbidden in CASES:
+        if only and name not in only:
+            continue
+        times, loaded = [], set()
+        run_once(code, forbidden, pycache)
+        for _ in range(repeat):
+            t, mods = run_once(code, forbidden, pycache)
+            times.append(max(0.0, t - base))
+            loaded.update(mods)
+        r = {"name": name, "best": min(times), "median": statistics.median(times), "repeat": repeat,
+             "forbidden_loaded": sorted(loaded)}
+        results.append(r)
+        if not quiet:
+            flag = f"  !! loaded {', '.join(r['forbidden_loaded'])}" if loaded else ""
+            print(f"  {name:20s} {r['best'] * 1e3:9.1f} ms  (median {r['median'] * 1e3:.1f} ms){flag}")
+    return base, results
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float, min_time: float) -> List[str]:
+    """baseline보다 (1 + threshold)배 넘게 느려진 항목 목록. min_time보다 짧은 차이는 잡음으로 보고 제외."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get(r["name"])
+        if base is None or r["best"] - base["best"] < min_time:
+            continue
+        ratio = r["best"] / base["best"] if base["best"] > 0 else float("inf")
+        r["baseline"] = base["best"]
+        r["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{r['name']}: {base['best'] * 1e3:.1f} ms -> {r['best'] * 1e3:.1f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--only", nargs="+", help="측정할 항목 이름")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용 속도 저하 비율 (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=5e-3, help="비교에서 무시할 차이 (초)")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    base, results = bench(args.repeat, args.only, args.quiet)
+    report = {
+        "schema": SCHEMA,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "interpreter_start": base,
+        "params": {"repeat": args.repeat},
+        "results": results,
+    }
+    status = 0
+    leaks = [f"{r['name']} imports {', '.join(r['forbidden_loaded'])}" for r in results if r["forbidden_loaded"]]
+    report["leaks"] = leaks
+    if leaks:
+        status = 1
+        print(f"\n{len(leaks)} module(s) pull in heavy/GUI dependencies:")
+        for line in leaks:
+            print("  " + line)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.min_time)
+        report["regressions"] = regressions
+        if regressions:
+            status = 1
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+        elif not args.quiet:
+            print(f"\nno regressions over {args.threshold:.0%}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
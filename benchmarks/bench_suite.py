@@ -0,0 +1,312 @@
+"""
+성능 회귀 벤치마크 모음 (cycle 수 x 신호 수 격자).
+
+측정 항목
+- find_high_pulses          : waveform_gen.find_high_pulses (신호 전체)
+- generate_repeat/oneshot   : VerilogAGenerator.generate ("반복" / "one-shot" 모드)
+- save_state_for_undo / undo: WaveformModel 전체 스냅샷 기록과 되돌리기
+- json_save / json_load     : waveform_io JSON 저장 / 불러오기 (모든 신호 decode 포함)
+- redraw_all / redraw_fit   : WaveformEditor._redraw_all (mock canvas, 기본 배율 / 전체 보기)
+
+결과는 JSON으로 저장하고, 이전 결과와 비교해서 threshold 이상 느려진 항목이 있으면 exit code 1.
+짧은 항목은 측정 시간 합이 --min-total이 될 때까지 더 반복하고 최솟값(best)으로 비교한다.
+느려진 정도가 --min-time(절대값)보다 작으면 잡음으로 보고 회귀로 치지 않는다.
+
+    python benchmarks/bench_suite.py -o bench.json
+    python benchmarks/bench_suite.py --cycles 1000 100000 --signals 4 64 --compare bench.json --threshold 0.2
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from waveform_core import VerilogAGenerator, WaveformConfig, WaveformModel  # noqa: E402
+from waveform_gen import find_high_pulses  # noqa: E402
+from waveform_io import read_json, write_json  # noqa: E402
+from waveform_render import WaveformRenderer  # noqa: E402
+from waveform_storage import BitWaveform, EdgeWaveform  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # NumPy는 선택 사항
+    np = None
+
+SCHEMA = 1
+
+
+# ==========================================
+# 실행 환경 준비 (Tk 창 없이)
+# ==========================================
+class MockCanvas:
+    """WaveformRenderer가 쓰는 Canvas 메서드만 구현한 offscreen canvas (item 좌표/옵션만 보관)."""
+
+    def __init__(self, width: int = 1600, height: int = 900):
+        self.width, self.height = width, height
+        self.items: Dict[int, list] = {}
+        self.tags: Dict[int, tuple] = {}
+        self._next = 0
+        self._region = (0, 0, width, height)
+        self._x0 = 0
+
+    def _create(self, *coords, **opts):
+        self._next += 1
+        tags = opts.pop("tags", ())
+        self.items[self._next] = [coords, opts]
+        self.tags[self._next] = (tags,) if isinstance(tags, str) else tuple(tags)
+        return self._next
+
+    create_line = create_rectangle = create_polygon = create_text = _create
+
+    def coords(self, item, *coords):
+        if not coords:
+            return self.items[item][0]
+        self.items[item][0] = coords
+
+    def itemconfigure(self, item, **opts):
+        self.items[item][1].update(opts)
+
+    def delete(self, *tags):
+        for tag in tags:
+            for item in [i for i, t in self.tags.items() if i == tag or tag in t or tag == "all"]:
+                del self.items[item], self.tags[item]
+
+    def tag_lower(self, *args):
+        pass
+
+    tag_raise = tag_lower
+
+    def configure(self, **opts):
+        if "scrollregion" in opts:
+            self._region = opts["scrollregion"]
+
+    def after_idle(self, func, *args):
+        func(*args)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasx(self, x):
+        return x + self._x0
+
+    def canvasy(self, y):
+        return y
+
+    def xview_moveto(self, fraction):
+        self._x0 = float(fraction) * (self._region[2] - self._region[0])
+
+
+def _load_editor_module():
+    """waveform_gen_v0.3.py를 불러온다 (파일 이름에 '.'이 있어 importlib 사용, Tk 창은 만들지 않음)."""
+    spec = importlib.util.spec_from_file_location("waveform_gen_v0_3", os.path.join(ROOT, "waveform_gen_v0.3.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ==========================================
+# 입력 데이터
+# ==========================================
+def make_waveforms(n_signals: int, n_cycles: int, density: float, seed: int) -> List[BitWaveform]:
+    """cycle당 토글 확률 density인 임의 파형 (edge 목록에서 바로 생성)."""
+    rng = random.Random(seed)
+    waves = []
+    for _ in range(n_signals):
+        n_edges = min(n_cycles - 1, max(1, int(n_cycles * density)))
+        edges = sorted(rng.sample(range(1, n_cycles), n_edges)) if n_cycles > 1 else []
+        waves.append(BitWaveform(EdgeWaveform.from_edges(rng.getrandbits(1), edges, n_cycles)))
+    return waves
+
+
+def make_editor(module, waves: List[BitWaveform]):
+    """Tk 위젯 없이 모델/렌더러만 갖춘 WaveformEditor."""
+    editor = module.WaveformEditor.__new__(module.WaveformEditor)
+    editor.cfg = WaveformConfig()
+    editor.cfg.num_cycles = len(waves[0])
+    editor.cfg.num_waves = len(waves)
+    editor.model = WaveformModel(editor.cfg.num_cycles, 0)
+    for i, wf in enumerate(waves):
+        editor.model.add_signal(f"sig_{i}", "one-shot", wf.copy())
+    editor.perf = editor.model.perf
+    editor.canvas = MockCanvas()
+    editor.renderer = WaveformRenderer(editor.canvas, editor.cfg, editor.model)
+    editor.cursor_index = 0
+    return editor
+
+
+# ==========================================
+# 측정
+# ==========================================
+def measure(func: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None,
+            min_total: float = 0.0, max_repeat: int = 1000) -> List[float]:
+    """
+    func를 실행한 시간 목록 (setup은 측정에서 제외, GC는 끈 상태로 측정).
+    최소 repeat번, 측정 시간 합이 min_total이 될 때까지 더 (최대 max_repeat번) 반복한다.
+    setup이 무거운 항목이 끝없이 돌지 않도록 추가 반복은 setup 포함 경과 시간 5 * min_total까지만.
+    """
+    times = []
+    deadline = time.perf_counter() + 5 * min_total
+    while len(times) < repeat or (sum(times) < min_total and len(times) < max_repeat
+                                  and time.perf_counter() < deadline):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return times
+
+
+def bench_case(module, n_cycles: int, n_signals: int, args, tmpdir: str) -> List[Dict]:
+    waves = make_waveforms(n_signals, n_cycles, args.density, args.seed)
+    names = [f"sig_{i}" for i in range(n_signals)]
+    params = {'tck_str': '10n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 1.2, 'vlow': 0.0}
+    cells = n_cycles * n_signals
+    cases: List[Tuple[str, Callable, Optional[Callable]]] = []
+
+    cases.append(("find_high_pulses", lambda: [find_high_pulses(w) for w in waves], None))
+    for mode, label in (("반복", "generate_repeat"), ("one-shot", "generate_oneshot")):
+        cases.append((label, lambda mode=mode: VerilogAGenerator.generate(
+            waves, names, [mode] * n_signals, params), None))
+
+    editor = make_editor(module, waves)
+    model = editor.model
+
+    def reset_history():
+        model.undo_stack.clear()
+        model.redo_stack.clear()
+        model._history_bytes = 0
+
+    def snapshot():
+        reset_history()
+        model.save_state_for_undo()
+
+    cases.append(("save_state_for_undo", model.save_state_for_undo, reset_history))
+    cases.append(("undo", model.undo, snapshot))
+
+    if cells <= args.max_json_cells:
+        path = os.path.join(tmpdir, f"bench_{n_cycles}_{n_signals}.json")
+        signals = [(n, "one-shot", w) for n, w in zip(names, waves)]
+        cases.append(("json_save", lambda: write_json(path, n_cycles, signals), None))
+        cases.append(("json_load", lambda: [s.load() for s in read_json(path)[1]],
+                      lambda: os.path.exists(path) or write_json(path, n_cycles, signals)))
+
+    def fit():
+        editor.renderer.zoom_fit()
+
+    cases.append(("redraw_all", editor._redraw_all, editor.renderer.zoom_reset))
+    cases.append(("redraw_fit", editor._redraw_all, fit))
+
+    results = []
+    for name, func, setup in cases:
+        if args.only and name not in args.only:
+            continue
+        times = measure(func, args.repeat, setup, args.min_total)
+        results.append({"name": name, "cycles": n_cycles, "signals": n_signals,
+                        "best": min(times), "median": statistics.median(times),
+                        "mean": sum(times) / len(times), "repeat": len(times)})
+        if not args.quiet:
+            print(f"  {name:20s} {min(times) * 1e3:11.3f} ms  (median {statistics.median(times) * 1e3:.3f} ms, "
+                  f"x{len(times)})")
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float, min_time: float) -> List[str]:
+    """baseline보다 (1 + threshold)배 넘게, 그리고 min_time(초) 넘게 느려진 항목 목록 (best끼리 비교)."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["cycles"], r["signals"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get((r["name"], r["cycles"], r["signals"]))
+        if base is None or r["best"] - base["best"] < min_time:
+            continue
+        ratio = r["best"] / base["best"] if base["best"] > 0 else float("inf")
+        r["baseline"] = base["best"]
+        r["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{r['name']} ({r['cycles']} cyc x {r['signals']} sig): "
+                               f"{base['best'] * 1e3:.3f} ms -> {r['best'] * 1e3:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--signals", type=int, nargs="+", default=[4, 64, 1000])
+    parser.add_argument("--max-cells", type=float, default=2e8,
+                        help="cycles x signals 가 이보다 큰 조합은 건너뜀")
+    parser.add_argument("--max-json-cells", type=float, default=1e7,
+                        help="JSON 저장/불러오기를 측정할 최대 cycles x signals")
+    parser.add_argument("--density", type=float, default=0.02, help="cycle당 토글 확률")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 최소 반복 횟수")
+    parser.add_argument("--min-total", type=float, default=0.2,
+                        help="항목별 최소 측정 시간 합 (초). 짧은 항목은 이만큼 될 때까지 더 반복")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", help="측정할 항목 이름")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용 속도 저하 비율 (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=2e-3,
+                        help="이보다 작게 느려진 항목은 잡음으로 보고 회귀에서 제외 (초)")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    module = _load_editor_module()
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_signals in args.signals:
+            for n_cycles in args.cycles:
+                if n_cycles * n_signals > args.max_cells:
+                    if not args.quiet:
+                        print(f"{n_signals} signals x {n_cycles} cycles: skipped (--max-cells)")
+                    continue
+                if not args.quiet:
+                    print(f"{n_signals} signals x {n_cycles} cycles")
+                results.extend(bench_case(module, n_cycles, n_signals, args, tmpdir))
+
+    report = {
+        "schema": SCHEMA,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+        "params": {"density": args.density, "repeat": args.repeat, "min_total": args.min_total,
+                   "seed": args.seed},
+        "results": results,
+    }
+    status = 0
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.min_time)
+        report["regressions"] = regressions
+        if regressions:
+            status = 1
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+        elif not args.quiet:
+            print(f"\nno regressions over {args.threshold:.0%}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
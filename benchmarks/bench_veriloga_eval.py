@@ -0,0 +1,164 @@
+"""
+Verilog-A 출력 방식별 timestep당 평가 비용 비교 (Python 참조 평가기).
+
+waveform_gen.generate_veriloga가 만든 소스를 그대로 파싱해서 시뮬레이터처럼 평가한다.
+- chain : 매 timestep마다 신호별 $abstime/tau 비교 체인을 위에서부터 훑는다 (O(edges))
+- event : @(timer) 이벤트를 시간순 큐로 관리하고, 지난 이벤트만 적용한다 (O(1) amortized)
+두 방식의 출력(vsel)이 모든 샘플 시각에서 같은지도 확인한다.
+
+    python benchmarks/bench_veriloga_eval.py --signals 16 --cycles 4096 --steps 20000
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waveform_gen import generate_veriloga  # noqa: E402
+from waveform_storage import BitWaveform  # noqa: E402
+
+_NUM = r"([-+0-9.eE]+)"
+_TAU = re.compile(rf"tau_(\d+) = \$abstime - {_NUM}\*floor")
+_COND = re.compile(rf"(?:else )?if \((?:\$abstime|tau_\d+) < {_NUM}\) vsel_(\d+) = {_NUM};")
+_ELSE = re.compile(rf"(?:^|\s)(?:else )?vsel_(\d+) = {_NUM};")
+_TIMER = re.compile(rf"@\(timer\({_NUM}(?:, {_NUM})?\)\) vsel_(\d+) = {_NUM};")
+
+
+class ChainModel:
+    """if/else 체인 방식 소스의 참조 평가기."""
+
+    def __init__(self, source: str):
+        self.chains: Dict[int, List[Tuple[float, float]]] = {}
+        self.default: Dict[int, float] = {}
+        self.period: Dict[int, float] = {}
+        for line in source.splitlines():
+            line = line.strip()
+            m = _TAU.search(line)
+            if m:
+                self.period[int(m.group(1))] = float(m.group(2))
+                continue
+            m = _COND.match(line)
+            if m:
+                self.chains.setdefault(int(m.group(2)), []).append((float(m.group(1)), float(m.group(3))))
+                continue
+            m = _ELSE.match(line)
+            if m and not line.startswith("real"):
+                self.default[int(m.group(1))] = float(m.group(2))
+        self.signals = sorted(self.default)
+        self.compares = 0
+
+    def eval(self, t: float) -> List[float]:
+        out = []
+        for idx in self.signals:
+            tau = t
+            if idx in self.period:
+                p = self.period[idx]
+                tau = t - p * math.floor(t / p)
+            value = self.default[idx]
+            for t_edge, v in self.chains.get(idx, ()):
+                self.compares += 1
+                if tau < t_edge:
+                    value = v
+                    break
+            out.append(value)
+        return out
+
+
+class EventModel:
+    """@(timer) 이벤트 방식 소스의 참조 평가기 (시간순 이벤트 큐)."""
+
+    def __init__(self, source: str):
+        self.values: Dict[int, float] = {}
+        self.queue: List[Tuple[float, int, float, float]] = []
+        in_init = False
+        for line in source.splitlines():
+            line = line.strip()
+            if line.startswith("@(initial_step)"):
+                in_init = True
+                continue
+            if in_init:
+                if line == "end":
+                    in_init = False
+                    continue
+                m = _ELSE.match(line)
+                self.values[int(m.group(1))] = float(m.group(2))
+                continue
+            m = _TIMER.match(line)
+            if m:
+                period = float(m.group(2)) if m.group(2) else 0.0
+                self.queue.append((float(m.group(1)), int(m.group(3)), float(m.group(4)), period))
+        heapq.heapify(self.queue)
+        self.signals = sorted(self.values)
+        self.fired = 0
+
+    def eval(self, t: float) -> List[float]:
+        queue = self.queue
+        while queue and queue[0][0] <= t:
+            t_event, idx, v, period = heapq.heappop(queue)
+            self.values[idx] = v
+            self.fired += 1
+            if period:
+                heapq.heappush(queue, (t_event + period, idx, v, period))
+        return [self.values[idx] for idx in self.signals]
+
+
+def make_waveforms(n_signals: int, n_cycles: int, toggle_prob: float) -> List[BitWaveform]:
+    waves = []
+    for _ in range(n_signals):
+        level, bits = 0, []
+        for _ in range(n_cycles):
+            if random.random() < toggle_prob:
+                level ^= 1
+            bits.append(level)
+        waves.append(BitWaveform(bits))
+    return waves
+
+
+def run(n_signals: int, n_cycles: int, steps: int, toggle_prob: float, periods: float) -> None:
+    tclk = 1e-9
+    waves = make_waveforms(n_signals, n_cycles, toggle_prob)
+    names = [f"s{i}" for i in range(n_signals)]
+    modes = ["pulse" if i % 2 else "pwl" for i in range(n_signals)]
+    n_edges = sum(len(w.transitions()) for w in waves)
+    # 샘플 시각은 edge와 겹치지 않도록 cycle 중간에서 시작
+    t_end = n_cycles * tclk * periods
+    times = [(k + 0.5) * t_end / steps for k in range(steps)]
+    print(f"{n_signals} signals x {n_cycles} cycles, {n_edges} edges, {steps} timesteps")
+
+    results = {}
+    for style, model_cls in (("chain", ChainModel), ("event", EventModel)):
+        source = generate_veriloga(waves, names, modes, tclk, 0.0, 1.2, 1e-12, style)
+        model = model_cls(source)
+        t0 = time.perf_counter()
+        outputs = [model.eval(t) for t in times]
+        elapsed = time.perf_counter() - t0
+        work = model.compares if style == "chain" else model.fired
+        results[style] = outputs
+        print(f"  {style:5s}: {elapsed * 1e6 / steps:9.2f} us/step  "
+              f"{work / steps:9.1f} {'compares' if style == 'chain' else 'events'}/step  "
+              f"source {len(source) / 1024:8.1f} KiB")
+    print("  outputs match:", results["chain"] == results["event"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signals", type=int, default=16)
+    parser.add_argument("--cycles", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--toggle", type=float, default=0.3, help="cycle당 토글 확률")
+    parser.add_argument("--periods", type=float, default=2.0, help="시뮬레이션 길이 (파형 길이 배수)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    for n_cycles in args.cycles:
+        run(args.signals, n_cycles, args.steps, args.toggle, args.periods)
+
+
+if __name__ == "__main__":
+    main()
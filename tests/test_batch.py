@@ -0,0 +1,96 @@
+"""waveform_batch: 저장된 프로젝트를 Tk 없이 일괄 변환."""
+import json
+import random
+
+import pytest
+
+import waveform_batch
+from waveform_batch import collect_inputs, main, run_batch
+from waveform_core import VerilogAGenerator
+from waveform_io import write_binary, write_json
+from waveform_storage import BitWaveform
+
+PARAMS = {'tck_str': '10n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 1.2, 'vlow': 0.0}
+
+
+def _project(seed, num_cycles=64):
+    rng = random.Random(seed)
+    names = [f"sig_{seed}_{i}" for i in range(4)]
+    modes = ["one-shot", "반복", "one-shot", "반복"]
+    waves = [[1 if rng.random() < 0.3 else 0 for _ in range(num_cycles)] for _ in names]
+    waves[1] = [0, 1] * (num_cycles // 2)
+    return waves, names, modes
+
+
+@pytest.fixture
+def projects(tmp_path):
+    """JSON 프로젝트 하나, binary 프로젝트 하나가 든 디렉터리."""
+    src = tmp_path / "projects"
+    src.mkdir()
+    a, b = _project(1), _project(2, 100)
+    write_json(str(src / "a.json"), 64, list(zip(a[1], a[2], a[0])))
+    write_binary(str(src / "b.wfb"), 100, list(zip(b[1], b[2], [BitWaveform(w) for w in b[0]])))
+    (src / "notes.txt").write_text("not a project", encoding="utf-8")
+    return src, {"a": a, "b": b}
+
+
+def test_collect_inputs_picks_project_files(projects):
+    src, _ = projects
+    assert collect_inputs([str(src)]) == [str(src / "a.json"), str(src / "b.wfb")]
+    assert collect_inputs([str(src / "notes.txt")]) == [str(src / "notes.txt")]
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_run_batch_matches_generate(tmp_path, projects, use_cache):
+    src, expected = projects
+    out = tmp_path / "out"
+    cache_dir = str(tmp_path / "cache") if use_cache else None
+    results = run_batch(collect_inputs([str(src)]), str(out), PARAMS, jobs=1, verbose=False,
+                        cache_dir=cache_dir)
+    assert [r["error"] for r in results] == [None, None]
+    assert [(r["signals"], r["cycles"]) for r in results] == [(4, 64), (4, 100)]
+    for name, (waves, names, modes) in expected.items():
+        text = (out / f"{name}.va").read_text(encoding="utf-8")
+        assert text == VerilogAGenerator.generate(waves, names, modes, PARAMS)
+    waveform_batch._caches.clear()
+
+
+def test_output_defaults_to_input_directory(projects):
+    src, expected = projects
+    results = run_batch([str(src / "a.json")], None, dict(PARAMS, share_timers=False), jobs=1, verbose=False)
+    assert results[0]["out"] == str(src / "a.va")
+    waves, names, modes = expected["a"]
+    assert (src / "a.va").read_text(encoding="utf-8") == \
+        VerilogAGenerator.generate(waves, names, modes, dict(PARAMS, share_timers=False))
+
+
+def test_non_project_json_is_reported(tmp_path, projects, capsys):
+    src, _ = projects
+    (src / "settings.json").write_text(json.dumps({"theme": "dark"}), encoding="utf-8")
+    out = tmp_path / "out"
+    results = run_batch(collect_inputs([str(src)]), str(out), PARAMS, jobs=1, verbose=False)
+    errors = {r["path"]: r["error"] for r in results}
+    assert errors[str(src / "settings.json")] == "KeyError: 'config'"
+    assert errors[str(src / "a.json")] is None and errors[str(src / "b.wfb")] is None
+    assert (out / "a.va").exists() and (out / "b.va").exists()  # 나머지 파일은 계속 변환
+
+    assert main([str(src), "-o", str(out), "-j", "1"]) == 1
+    report = capsys.readouterr().out
+    assert "ERROR KeyError: 'config'" in report and "2/3 files" in report
+
+
+def test_main_exit_codes(tmp_path, projects, capsys):
+    src, expected = projects
+    out = tmp_path / "out"
+    assert main([str(src / "a.json"), str(src / "b.wfb"), "-o", str(out), "-j", "1", "-q",
+                 "--tck", "5n", "--vhigh", "3.3", "--no-share-timers", "--no-min-period"]) == 0
+    assert capsys.readouterr().out == ""
+    waves, names, modes = expected["b"]
+    params = {'tck_str': '5n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 3.3, 'vlow': 0.0,
+              'share_timers': False, 'minimize_period': False}
+    assert (out / "b.va").read_text(encoding="utf-8") == VerilogAGenerator.generate(waves, names, modes, params)
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert main([str(empty), "-q"]) == 1
+    assert "No project files found." in capsys.readouterr().err
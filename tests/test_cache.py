@@ -0,0 +1,93 @@
+"""waveform_cache: export 조각 캐시 (메모리/디스크)."""
+import os
+import random
+import stat
+
+import pytest
+
+import waveform_cache
+from waveform_cache import Fragment, FragmentCache, content_key
+from waveform_core import VerilogAGenerator
+from waveform_storage import BitWaveform, EdgeWaveform
+
+PARAMS = {'tck_str': '10n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 1.2, 'vlow': 0.0}
+
+
+def _waves(n=6, length=300, seed=3):
+    rng = random.Random(seed)
+    waves = [[rng.random() < 0.3 for _ in range(length)] for _ in range(n)]
+    waves.append([0, 1, 1, 0] * (length // 4))  # 반복 단위가 있는 신호
+    return [[int(v) for v in w] for w in waves]
+
+
+@pytest.mark.parametrize("share_timers", [True, False])
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_cached_output_matches_uncached(tmp_path, share_timers, storage):
+    waves = [storage(w) for w in _waves()]
+    names = [f"s{i}" for i in range(len(waves))]
+    modes = ["반복" if i % 2 else "one-shot" for i in range(len(waves))]
+    params = dict(PARAMS, share_timers=share_timers)
+    expected = VerilogAGenerator.generate(waves, names, modes, params)
+
+    cache = FragmentCache(directory=str(tmp_path))
+    assert VerilogAGenerator.generate(waves, names, modes, params, cache) == expected  # 채우기
+    assert VerilogAGenerator.generate(waves, names, modes, params, cache) == expected  # 메모리 hit
+    assert cache.hits == len(waves)
+    disk_only = FragmentCache(directory=str(tmp_path))
+    assert VerilogAGenerator.generate(waves, names, modes, params, disk_only) == expected  # 디스크 hit
+    assert disk_only.hits == len(waves) and disk_only.misses == 0
+
+
+def test_unwritable_directory_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = FragmentCache(directory=str(blocker / "cache"))  # 파일 아래에는 디렉터리를 만들 수 없음
+    assert cache.directory is None
+    cache.put("k", Fragment(4, None, "text"))
+    assert cache.get("k") == Fragment(4, None, "text")
+
+
+@pytest.mark.skipif(os.name != "posix" or os.geteuid() == 0, reason="needs a non-root POSIX user")
+def test_read_only_parent_falls_back_to_memory(tmp_path):
+    tmp_path.chmod(stat.S_IRUSR | stat.S_IXUSR)
+    try:
+        assert FragmentCache(directory=str(tmp_path / "cache")).directory is None
+    finally:
+        tmp_path.chmod(stat.S_IRWXU)
+
+
+def test_disk_cache_is_pruned_to_size_cap(tmp_path):
+    cache = FragmentCache(directory=str(tmp_path), max_disk_bytes=4000)
+    for i in range(40):
+        cache.put(f"{i:040x}", Fragment(1, None, "x" * 200))
+    files = [f for f in os.listdir(tmp_path) if f.endswith(".frag")]
+    assert sum(os.path.getsize(tmp_path / f) for f in files) <= 4000
+    assert f"{39:040x}.frag" in files  # 마지막에 쓴 조각은 남는다
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def test_overwriting_a_key_keeps_disk_total_exact(tmp_path):
+    cache = FragmentCache(directory=str(tmp_path), max_disk_bytes=4000)
+    for i in range(5):
+        cache.put(f"{i:040x}", Fragment(1, None, "x" * 200))
+    for _ in range(50):  # 같은 키를 계속 덮어써도 합계가 늘지 않는다
+        cache.put(f"{0:040x}", Fragment(1, None, "y" * 200))
+    cache.put(f"{1:040x}", Fragment(1, None, "z" * 50))  # 크기가 다른 조각으로 교체
+    files = [f for f in os.listdir(tmp_path) if f.endswith(".frag")]
+    assert len(files) == 5  # 정리가 일찍 일어나지 않음
+    assert cache._disk_bytes == sum(os.path.getsize(tmp_path / f) for f in files)
+
+
+def test_same_key_from_two_writers(tmp_path):
+    a, b = FragmentCache(directory=str(tmp_path)), FragmentCache(directory=str(tmp_path))
+    a.put("k", Fragment(3, None, "from a"))
+    b.put("k", Fragment(3, None, "from b"))
+    assert os.listdir(tmp_path) == ["k.frag"]
+    assert FragmentCache(directory=str(tmp_path)).get("k").text == "from b"
+
+
+def test_key_depends_on_cache_version(monkeypatch):
+    wf = BitWaveform([0, 1, 1, 0])
+    key = content_key(wf, "one-shot")
+    monkeypatch.setattr(waveform_cache, "CACHE_VERSION", waveform_cache.CACHE_VERSION + 1)
+    assert content_key(wf, "one-shot") != key
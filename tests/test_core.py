@@ -0,0 +1,308 @@
+"""waveform_core: 드래그 구간 모으기, Undo/Redo 기록, 선택 영역 일괄 편집."""
+import random
+
+import pytest
+
+from waveform_core import DragStroke, Selection, WaveformModel
+from waveform_storage import BitWaveform, EdgeWaveform
+
+
+def _bits(model):
+    return [model.signals[r].waveform.tolist() for r in range(model.num_waves)]
+
+
+def _cells(spans):
+    return {row: [c for s, e in ranges for c in range(s, e)] for row, ranges in spans.items()}
+
+
+# -------------------- DragStroke -------------------- #
+
+def test_drag_interpolates_within_row():
+    stroke = DragStroke(0, 2, 1)
+    stroke.add(0, 6)
+    stroke.add(0, 4)
+    assert stroke.take() == {0: [(2, 7)]}
+
+
+def test_drag_leaving_and_returning_to_row_keeps_gap():
+    stroke = DragStroke(0, 2, 1)
+    stroke.add(1, 5)
+    stroke.add(0, 10)
+    spans = stroke.take()
+    assert spans == {0: [(2, 3), (10, 11)], 1: [(5, 6)]}
+    assert 5 not in _cells(spans)[0]
+
+
+def test_drag_merges_only_overlapping_or_adjacent_spans():
+    stroke = DragStroke(0, 2, 1)
+    stroke.add(1, 0)
+    stroke.add(0, 3)    # (2,3)에 맞닿음 -> (2,4)
+    stroke.add(1, 0)
+    stroke.add(0, 8)
+    stroke.add(1, 0)
+    stroke.add(0, 4)    # (2,4)와 겹침
+    stroke.add(0, 7)    # 4..7 보간 -> (8,9)와 맞닿아 하나로
+    assert stroke.take()[0] == [(2, 9)]
+
+
+def test_drag_take_empties_spans():
+    stroke = DragStroke(3, 1, 0)
+    assert stroke.take() == {3: [(1, 2)]}
+    assert stroke.take() == {}
+    stroke.add(3, 4)
+    assert stroke.take() == {3: [(1, 5)]}
+
+
+# -------------------- Undo 단위 묶기 -------------------- #
+
+def test_each_mutator_call_is_its_own_undo_step():
+    model = WaveformModel(32, 2)
+    model.write_range(0, 2, 5, 1)
+    model.set_meta(1, name="data")
+    model.move_wave(0, "down")
+    assert len(model.undo_stack) == 3
+    model.undo()
+    assert model.signals[1].name == "data" and model.signals[0].name == "Signal_1"
+    model.undo()
+    assert model.signals[1].name == "Signal_2"
+    assert _bits(model)[0][2:5] == [1, 1, 1]
+    model.undo()
+    assert not any(_bits(model)[0])
+
+
+def test_edit_after_explicit_group_is_not_merged():
+    model = WaveformModel(32, 2)
+    model.begin_edit()
+    model.write_range(0, 0, 1, 1)
+    model.write_range(0, 1, 4, 1)
+    model.end_edit()
+    model.active_wave_idx = 0
+    model.copy_active_wave()
+    model.active_wave_idx = 1
+    model.paste_to_active_wave()
+    assert len(model.undo_stack) == 2
+    model.undo()
+    assert model.signals[1].name == "Signal_2" and not any(_bits(model)[1])
+    assert _bits(model)[0][:4] == [1, 1, 1, 1]
+    model.undo()
+    assert not any(_bits(model)[0])
+
+
+def test_nested_edit_groups_close_at_outermost():
+    model = WaveformModel(16, 1)
+    with model.edit():
+        model.write_range(0, 0, 2, 1)
+        with model.edit():
+            model.write_range(0, 4, 6, 1)
+        model.write_range(0, 8, 10, 1)
+    model.write_range(0, 12, 14, 1)
+    assert len(model.undo_stack) == 2
+    model.undo()
+    model.undo()
+    assert not any(_bits(model)[0])
+
+
+def test_undo_closes_open_group():
+    model = WaveformModel(16, 1)
+    model.begin_edit()
+    model.write_range(0, 0, 2, 1)
+    model.undo()
+    model.write_range(0, 4, 6, 1)
+    model.end_edit()  # Undo로 이미 닫힘: 아무 일도 안 함
+    model.write_range(0, 8, 10, 1)
+    assert len(model.undo_stack) == 2
+
+
+# -------------------- Undo/Redo delta 기록 -------------------- #
+
+@pytest.fixture(params=[BitWaveform, EdgeWaveform], ids=["bits", "edges"])
+def storage(request):
+    return request.param
+
+
+def test_two_edits_two_undos(storage):
+    model = WaveformModel(64, 1, storage)
+    model.write_range(0, 0, 10, 1)
+    model.write_range(0, 20, 30, 1)
+    model.undo()
+    assert _bits(model)[0] == [1] * 10 + [0] * 54
+    model.undo()
+    assert not any(_bits(model)[0])
+    assert model.undo() is None
+
+
+def test_random_edits_round_trip(storage):
+    rng = random.Random(7)
+    model = WaveformModel(200, 4, storage)
+    states = [(_bits(model), [s.name for s in model.signals])]
+    for step in range(60):
+        kind = rng.randrange(5)
+        if kind == 0:
+            start = rng.randrange(200)
+            model.write_range(rng.randrange(4), start, start + rng.randrange(1, 40), rng.randrange(2))
+        elif kind == 1:
+            model.move_wave(rng.randrange(4), rng.choice(("up", "down")))
+        elif kind == 2:
+            model.set_meta(rng.randrange(4), name=f"n{step}")
+        elif kind == 3:
+            start = rng.randrange(190)
+            sel = Selection((0, 2, 3), start, start + rng.randrange(1, 50))
+            rng.choice((lambda: model.invert_selection(sel),
+                        lambda: model.shift_selection(sel, rng.randrange(-5, 6), rng.random() < 0.5),
+                        lambda: model.tile_selection(sel, rng.randrange(1, 6))))()
+        else:
+            model.begin_edit()
+            model.write_range(1, 0, 5, 1)
+            model.write_range(2, 50, 80, 1)
+            model.end_edit()
+        if len(model.undo_stack) == len(states):
+            states.append((_bits(model), [s.name for s in model.signals]))
+    assert len(model.undo_stack) == len(states) - 1
+    for expected in reversed(states[:-1]):
+        model.undo()
+        assert (_bits(model), [s.name for s in model.signals]) == expected
+    for expected in states[1:]:
+        model.redo()
+        assert (_bits(model), [s.name for s in model.signals]) == expected
+
+
+def test_reconfigure_undo_restores_grid(storage):
+    model = WaveformModel(40, 2, storage)
+    model.write_range(1, 30, 40, 1)
+    model.save_state_for_undo()
+    model.reconfigure(20, 3)
+    assert model.num_waves == 3 and all(len(s.waveform) == 20 for s in model.signals)
+    model.undo()
+    assert model.num_cycles == 40 and model.num_waves == 2
+    assert _bits(model)[1] == [0] * 30 + [1] * 10
+
+
+def test_new_edit_clears_redo():
+    model = WaveformModel(16, 1)
+    model.write_range(0, 0, 4, 1)
+    model.undo()
+    model.write_range(0, 8, 9, 1)
+    assert model.redo() is None
+    assert _bits(model)[0] == [0] * 8 + [1] + [0] * 7
+
+
+def test_history_is_trimmed_to_max_bytes():
+    model = WaveformModel(8000, 1)
+    model.history_max_bytes = 4000
+    states = [_bits(model)[0]]
+    for i in range(50):
+        model.write_range(0, i * 100, 8000, i % 2)
+        states.append(_bits(model)[0])
+    assert model._history_bytes <= model.history_max_bytes
+    assert model._history_bytes == sum(r.nbytes for r in model.undo_stack)
+    kept = len(model.undo_stack)
+    assert 1 <= kept < 50
+    while model.undo() is not None:
+        pass
+    # 가장 오래된 기록부터 버려졌으므로 남은 기록만큼만 되돌아간다
+    assert _bits(model)[0] == states[50 - kept]
+
+
+# -------------------- 선택 영역 일괄 편집 -------------------- #
+
+ROWS = [
+    [0, 1, 1, 0, 0, 1, 0, 0, 0, 1, 1, 1],
+    [1, 0, 0, 0, 1, 1, 0, 1, 0, 0, 0, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+]
+SEL = Selection((0, 1), 2, 9)  # row 0: [1, 0, 0, 1, 0, 0, 0], row 1: [0, 0, 1, 1, 0, 1, 0]
+
+
+def _model(storage):
+    model = WaveformModel(len(ROWS[0]), len(ROWS), storage)
+    for sig, row in zip(model.signals, ROWS):
+        sig.waveform = row
+    return model
+
+
+def _spliced(row, start, seg):
+    return ROWS[row][:start] + seg + ROWS[row][start + len(seg):]
+
+
+def _apply(model, op, *args):
+    """
+    op 한 번이 Undo 기록을 정확히 하나 남기고 Undo/Redo가 맞는지 확인한 뒤 결과를 반환.
+    모델은 다시 Undo해서 ROWS 상태로 돌려 둔다.
+    """
+    before = len(model.undo_stack)
+    changed = op(*args)
+    result = _bits(model)
+    assert len(model.undo_stack) == before + 1
+    model.undo()
+    assert _bits(model) == ROWS
+    model.redo()
+    assert _bits(model) == result
+    model.undo()
+    return changed, result
+
+
+def test_fill_selection(storage):
+    model = _model(storage)
+    changed, result = _apply(model, model.fill_selection, SEL, 1)
+    assert changed == 2
+    assert result == [_spliced(0, 2, [1] * 7), _spliced(1, 2, [1] * 7), ROWS[2]]
+    model = _model(storage)
+    _, result = _apply(model, model.fill_selection, Selection((1,), 0, 12), 0)
+    assert result == [ROWS[0], [0] * 12, ROWS[2]]
+
+
+def test_invert_selection(storage):
+    model = _model(storage)
+    _, result = _apply(model, model.invert_selection, SEL)
+    assert result == [_spliced(0, 2, [0, 1, 1, 0, 1, 1, 1]), _spliced(1, 2, [1, 1, 0, 0, 1, 0, 1]), ROWS[2]]
+
+
+@pytest.mark.parametrize("amount, wrap, row0, row1", [
+    (2, False, [0, 0, 1, 0, 0, 1, 0], [0, 0, 0, 0, 1, 1, 0]),
+    (2, True, [0, 0, 1, 0, 0, 1, 0], [1, 0, 0, 0, 1, 1, 0]),
+    (-3, False, [1, 0, 0, 0, 0, 0, 0], [1, 0, 1, 0, 0, 0, 0]),
+    (-3, True, [1, 0, 0, 0, 1, 0, 0], [1, 0, 1, 0, 0, 0, 1]),
+    (7, False, [0] * 7, [0] * 7),                                # 구간 길이 이상: 모두 밀려 나감
+    (-10, False, [0] * 7, [0] * 7),
+    (9, True, [0, 0, 1, 0, 0, 1, 0], [1, 0, 0, 0, 1, 1, 0]),    # 9 % 7 == 2
+    (-7, True, [1, 0, 0, 1, 0, 0, 0], [0, 0, 1, 1, 0, 1, 0]),   # 한 바퀴: 그대로
+])
+def test_shift_selection(storage, amount, wrap, row0, row1):
+    model = _model(storage)
+    _, result = _apply(model, model.shift_selection, SEL, amount, wrap)
+    assert result == [_spliced(0, 2, row0), _spliced(1, 2, row1), ROWS[2]]
+
+
+def test_tile_selection(storage):
+    model = _model(storage)
+    _, result = _apply(model, model.tile_selection, SEL, 3)
+    assert result == [_spliced(0, 2, [1, 0, 0, 1, 0, 0, 1]), _spliced(1, 2, [0, 0, 1, 0, 0, 1, 0]), ROWS[2]]
+    model = _model(storage)
+    _, result = _apply(model, model.tile_selection, SEL, 20)  # 주기가 구간보다 길면 그대로
+    assert result == ROWS
+    with pytest.raises(ValueError):
+        model.tile_selection(SEL, 0)
+
+
+def test_paste_selection_cycles_rows_and_tiles(storage):
+    model = _model(storage)
+    assert model.paste_selection(SEL) == 0 and not model.undo_stack  # 클립보드 없음
+    assert model.copy_selection(Selection((0, 1), 0, 3)) == 2
+    assert not model.undo_stack  # 복사는 기록 없음
+    # 복사한 2행을 3행에 붙이면 행이 순환한다
+    _, result = _apply(model, model.paste_selection, Selection((0, 1, 2), 9, 12))
+    assert result == [_spliced(0, 9, [0, 1, 1]), _spliced(1, 9, [1, 0, 0]), _spliced(2, 9, [0, 1, 1])]
+    # 더 긴 구간에는 반복해서 채운다 (선택 행은 정렬된 순서로 클립보드 행에 대응)
+    _, result = _apply(model, model.paste_selection, Selection((2, 1), 0, 5))
+    assert result == [ROWS[0], _spliced(1, 0, [0, 1, 1, 0, 1]), _spliced(2, 0, [1, 0, 0, 1, 0])]
+    # 더 짧은 구간에는 앞부분만
+    _, result = _apply(model, model.paste_selection, Selection((2,), 4, 6))
+    assert result == [ROWS[0], ROWS[1], _spliced(2, 4, [0, 1])]
+
+
+def test_selection_is_clipped_to_grid(storage):
+    model = _model(storage)
+    _, result = _apply(model, model.fill_selection, Selection((1, 5), 10, 40), 0)
+    assert result == [ROWS[0], _spliced(1, 10, [0, 0]), ROWS[2]]
+    assert model.fill_selection(Selection((7,), 0, 4), 1) == 0
+    assert model.fill_selection(Selection((0,), 5, 5), 1) == 0
@@ -0,0 +1,171 @@
+"""waveform_edges: edge/pulse 추출이 cycle 단위 Python 루프와 같은 결과를 내는지."""
+import random
+
+import pytest
+
+import waveform_edges
+from waveform_edges import detect_edges, find_pulses, iter_transitions, minimal_period, transitions
+from waveform_storage import BitWaveform, EdgeWaveform
+
+try:
+    import numpy
+except ImportError:  # NumPy는 선택 사항
+    numpy = None
+
+
+def _naive(wf):
+    """예전 find_high_pulses와 같은 cycle 단위 루프."""
+    wf = [1 if v else 0 for v in wf]
+    rising = [i for i in range(1, len(wf)) if wf[i - 1] == 0 and wf[i] == 1]
+    falling = [i for i in range(1, len(wf)) if wf[i - 1] == 1 and wf[i] == 0]
+    pulses, start = [], None
+    for i, v in enumerate(wf + [0]):
+        if v and start is None:
+            start = i
+        elif not v and start is not None:
+            pulses.append((start, i - start))
+            start = None
+    return rising, falling, pulses
+
+
+def _naive_period(wf):
+    wf = list(wf)
+    n = len(wf)
+    for p in range(1, n + 1):
+        if n % p == 0 and wf[p:] + wf[:p] == wf:
+            return p
+    return 0
+
+
+def _waves(seed, count=20):
+    rng = random.Random(seed)
+    out = [[], [0], [1], [1, 1, 1], [0, 1, 0], [1, 0, 1], [1, 0, 0, 1]]
+    for _ in range(count):
+        density = rng.choice([0.02, 0.3, 0.5, 0.9])
+        out.append([1 if rng.random() < density else 0 for _ in range(rng.randrange(1, 300))])
+    return out
+
+
+@pytest.fixture(params=["fallback", "numpy"])
+def backend(request, monkeypatch):
+    """NumPy 경로와 정규식 fallback 경로를 모두 검사."""
+    if request.param == "numpy":
+        if numpy is None:
+            pytest.skip("numpy not installed")
+        monkeypatch.setattr(waveform_edges, "np", numpy)
+    else:
+        monkeypatch.setattr(waveform_edges, "np", None)
+    monkeypatch.setattr(waveform_edges, "_numpy_checked", True)
+    return request.param
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_detect_edges_matches_naive_loop(backend, storage):
+    for ref in _waves(1):
+        rising, falling, pulses = _naive(ref)
+        wf = storage(ref)
+        e = detect_edges(wf)
+        assert (e.rising, e.falling, e.pulses) == (rising, falling, pulses)
+        assert find_pulses(wf) == pulses
+        assert transitions(wf) == sorted(rising + falling)
+        assert list(iter_transitions(wf, chunk=7)) == sorted(rising + falling)
+
+
+def test_detect_edges_batch(backend):
+    rng = random.Random(2)
+    same_len = [[1 if rng.random() < 0.4 else 0 for _ in range(50)] for _ in range(6)]
+    mixed = _waves(3, 5)
+    for batch in (same_len, mixed, [BitWaveform(w) for w in mixed], [EdgeWaveform(w) for w in mixed]):
+        result = detect_edges(batch)
+        assert [(e.rising, e.falling, e.pulses) for e in result] == [_naive(list(w)) for w in batch]
+    if backend == "numpy":
+        result = detect_edges(numpy.array(same_len, dtype=numpy.uint8))
+        assert [(e.rising, e.falling, e.pulses) for e in result] == [_naive(w) for w in same_len]
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_minimal_period_matches_naive(backend, storage):
+    rng = random.Random(4)
+    cases = _waves(5, 10)
+    for _ in range(30):
+        unit = [rng.randrange(2) for _ in range(rng.randrange(1, 9))]
+        cases.append(unit * rng.randrange(1, 12))
+    cases.append([0, 1] * 2048)  # 클럭
+    for ref in cases:
+        assert minimal_period(storage(ref)) == _naive_period(ref), ref
+
+
+# -------------------- EdgeIndex -------------------- #
+
+def _check_index(index, wf):
+    """색인이 파형을 처음부터 다시 훑은 결과와 같은지."""
+    ref = list(wf)
+    _, _, pulses = _naive(ref)
+    edges = [i for i in range(1, len(ref)) if ref[i] != ref[i - 1]]
+    assert index.pulses() == pulses and len(index) == len(pulses)
+    assert index.edge_count() == len(edges)
+    widths = [w for _, w in pulses]
+    assert index.summary() == {
+        "pulses": len(pulses),
+        "high": sum(ref),
+        "duty": sum(ref) / len(ref) if ref else 0.0,
+        "min": min(widths, default=0),
+        "max": max(widths, default=0),
+        "mean": sum(ref) / len(pulses) if pulses else 0.0,
+    }
+    for i in range(-1, len(ref) + 1):
+        assert index.next_edge(i) == next((e for e in edges if e > i), None), i
+        assert index.prev_edge(i) == next((e for e in reversed(edges) if e < i), None), i
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+@pytest.mark.parametrize("seed", range(4))
+def test_edge_index_update_matches_rebuild(storage, seed):
+    rng = random.Random(seed)
+    n = rng.randrange(1, 120)
+    wf = storage([1 if rng.random() < 0.3 else 0 for _ in range(n)])
+    index = waveform_edges.EdgeIndex(wf)
+    _check_index(index, wf)
+    for _ in range(200):
+        if rng.random() < 0.5:  # 한 칸 쓰기 (클릭)
+            a = rng.randrange(n)
+            b = a + 1
+        else:  # 구간 채우기 / 지우기
+            a = rng.randrange(n)
+            b = rng.randrange(a, n + 1)
+        value = rng.randrange(2)
+        if storage is list:
+            wf[a:b] = [value] * (b - a)
+        else:
+            wf.fill(a, b, value)
+        index.update(wf, a, b)
+        _check_index(index, wf)
+
+
+@pytest.mark.parametrize("storage", [BitWaveform, EdgeWaveform])
+def test_model_keeps_edge_index_in_sync(storage):
+    from waveform_core import Selection, WaveformModel
+
+    rng = random.Random(9)
+    model = WaveformModel(90, 4, storage)
+    indexes = [sig.edge_index for sig in model.signals]  # 색인을 먼저 만들어 두어야 갱신 경로를 탄다
+    for _ in range(150):
+        op = rng.randrange(6)
+        a = rng.randrange(90)
+        b = rng.randrange(a, 91)
+        sel = Selection(tuple(rng.sample(range(4), rng.randrange(1, 4))), a, b)
+        if op == 0:
+            model.write_range(rng.randrange(4), a, b, rng.randrange(2))
+        elif op == 1:
+            model.fill_selection(sel, rng.randrange(2))
+        elif op == 2:
+            model.invert_selection(sel)
+        elif op == 3:
+            model.shift_selection(sel, rng.randrange(-5, 6), wrap=rng.random() < 0.5)
+        elif op == 4:
+            model.undo()
+        else:
+            model.redo()
+        for sig, index in zip(model.signals, indexes):
+            assert sig.edge_index is index  # 다시 만들지 않고 갱신만 했는지
+            _check_index(index, sig.waveform)
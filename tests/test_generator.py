@@ -0,0 +1,316 @@
+"""VerilogAGenerator: 최적화 옵션을 끄면 예전 출력과 byte 단위로 같고, 켜도 같은 파형을 낸다."""
+import math
+import random
+import re
+
+import pytest
+
+from waveform_core import VerilogAGenerator
+from waveform_storage import BitWaveform, EdgeWaveform
+
+PARAMS = {'tck_str': '10n', 'tr_str': '10p', 'tf_str': '10p', 'vhigh': 1.2, 'vlow': 0.0}
+BASELINE = dict(PARAMS, share_timers=False, minimize_period=False)
+
+
+def _baseline_generate(waveforms, names, modes, params):
+    """최적화 옵션 추가 전 VerilogAGenerator.generate의 출력 (당시 코드 그대로)."""
+    tck_str = params.get('tck_str', '10n')
+    tr_str = params.get('tr_str', '10p')
+    tf_str = params.get('tf_str', '10p')
+    vhigh = params['vhigh']
+    vlow = params['vlow']
+    sanitized_names = [VerilogAGenerator.sanitize_name(n, f"sig_{i}") for i, n in enumerate(names)]
+    has_periodic = any(m == "반복" for m in modes)
+    gui_len = len(waveforms[0]) if waveforms else 0
+    lines = [
+        '// Auto-generated by Python Waveform Editor (Event-Driven Version)',
+        '`include "discipline.h"',
+        '`include "constants.h"',
+        '',
+        f'module pwl_waves({", ".join(sanitized_names)});',
+        f'    output {", ".join(sanitized_names)};',
+        f'    electrical {", ".join(sanitized_names)};',
+        '',
+        '    // User Parameters',
+        f'    parameter real tck = {tck_str};  // Clock Period (1 Cycle)',
+        f'    parameter real tr  = {tr_str};   // Rising Time',
+        f'    parameter real tf  = {tf_str};   // Falling Time',
+        f'    parameter real vlow = {vlow};',
+        f'    parameter real vhigh = {vhigh};',
+        ''
+        '    // Repetition Parameters (auto-generated for periodic signals)',
+    ]
+    if has_periodic and gui_len > 0:
+        lines.append(f"    parameter real period_factor = {gui_len * 0.5:.12g}; "
+                     f"// Period factor for all periodic signals")
+        lines.append('')
+    real_vars = set()
+    initial_block = []
+    analog_body = []
+    transitions = []
+    for idx, wf in enumerate(waveforms):
+        name = sanitized_names[idx]
+        mode = modes[idx]
+        vsel = f"vsel_{idx}"
+        real_vars.add(vsel)
+        init_val = vhigh if wf and wf[0] else vlow
+        initial_block.append(f"        {vsel} = {init_val:.12g};")
+        analog_body.append(f"    // Logic for {name} ({mode}) - Event Driven")
+        if mode == "반복":
+            period_expr = "(period_factor * tck)"
+            prev_val = wf[-1]
+            for i in range(len(wf)):
+                curr_val = wf[i]
+                if curr_val != prev_val:
+                    time_offset = i * 0.5
+                    target_volt = vhigh if curr_val else vlow
+                    if time_offset == 0:
+                        analog_body.append(f"    @(timer(0, {period_expr})) {vsel} = {target_volt:.12g};")
+                    else:
+                        analog_body.append(f"    @(timer({time_offset:.12g} * tck, {period_expr})) "
+                                           f"{vsel} = {target_volt:.12g};")
+                prev_val = curr_val
+        else:
+            prev_val = wf[0]
+            for i in range(1, len(wf)):
+                curr_val = wf[i]
+                if curr_val != prev_val:
+                    target_volt = vhigh if curr_val else vlow
+                    analog_body.append(f"    @(timer({i * 0.5:.12g} * tck)) {vsel} = {target_volt:.12g};")
+                    prev_val = curr_val
+            end_time_expr = f"({gui_len * 0.5:.12g} * tck)"
+            if prev_val != 0:
+                analog_body.append(f"    @(timer({end_time_expr})) {vsel} = {vlow:.12g};")
+        analog_body.append("")
+        transitions.append(f"    V({name}) <+ transition({vsel}, 0, tr, tf);")
+    if real_vars:
+        lines.append(f"    real {', '.join(sorted(list(real_vars)))};")
+    lines.append("\n    analog begin")
+    if initial_block:
+        lines.append("        @(initial_step) begin")
+        lines.extend(initial_block)
+        lines.append("        end\n")
+    lines.extend(analog_body)
+    lines.extend(transitions)
+    lines.append("    end")
+    lines.append("endmodule")
+    return "\n".join(lines)
+
+
+# -------------------- 출력 평가 (시각 단위: tck) -------------------- #
+
+_PARAM = re.compile(r"parameter real (period_factor\w*) = ([-+0-9.eE]+);")
+_TIMER = re.compile(r"@\(timer\((.+?)(?:, \((\w+) \* tck\))?\)\)(.*)$")
+_ASSIGN = re.compile(r"(vsel_\d+) = ([-+0-9.eE]+);")
+
+
+def _time(expr):
+    """timer 시작 시각 식("0", "1.5 * tck", "(64 * tck)")을 tck 단위 숫자로."""
+    return float(expr.strip("()").replace(" * tck", ""))
+
+
+def _timers(source):
+    """소스의 모든 timer 할당 [(시작, 주기 또는 None, vsel, 값)]과 초기값 {vsel: 값}."""
+    periods = {name: float(v) for name, v in _PARAM.findall(source)}
+    init_block = source.split("@(initial_step) begin", 1)[1].split("end\n", 1)[0]
+    init = {vsel: float(v) for vsel, v in _ASSIGN.findall(init_block)}
+    timers = []
+    lines = iter(source.splitlines())
+    for line in lines:
+        m = _TIMER.search(line)
+        if not m:
+            continue
+        start = _time(m.group(1))
+        period = periods[m.group(2)] if m.group(2) else None
+        body = m.group(3).strip()
+        if body == "begin":
+            assigns = []
+            for inner in lines:
+                if inner.strip() == "end":
+                    break
+                assigns.extend(_ASSIGN.findall(inner))
+        else:
+            assigns = _ASSIGN.findall(body)
+        timers.extend((start, period, vsel, float(v)) for vsel, v in assigns)
+    return timers, init
+
+
+def _values_at(timers, init, t):
+    """시각 t(tck 단위)에서의 vsel 값. 신호별로 t 이전에 마지막으로 발생한 timer의 값."""
+    latest = {vsel: (-math.inf, v) for vsel, v in init.items()}
+    for start, period, vsel, v in timers:
+        if t < start:
+            continue
+        fired = start + period * math.floor((t - start) / period) if period else start
+        if fired > latest[vsel][0]:
+            latest[vsel] = (fired, v)
+    return {vsel: v for vsel, (_, v) in latest.items()}
+
+
+def _expected_at(waves, modes, k):
+    """k번째 cycle(길이를 넘으면 반복 신호는 순환, one-shot은 Low)의 기대 전압."""
+    out = {}
+    for idx, (wf, mode) in enumerate(zip(waves, modes)):
+        n = len(wf)
+        level = wf[k % n] if mode == "반복" else (wf[k] if k < n else 0)
+        out[f"vsel_{idx}"] = PARAMS['vhigh'] if level else PARAMS['vlow']
+    return out
+
+
+def _check_reproduces(source, waves, modes, repeats=3):
+    timers, init = _timers(source)
+    n = len(waves[0])
+    for k in range(repeats * n):
+        # cycle k는 [k * 0.5, (k + 1) * 0.5) tck 구간 (가운데에서 샘플)
+        assert _values_at(timers, init, (k + 0.5) * 0.5) == _expected_at(waves, modes, k), k
+
+
+def _waves(seed=0, n=8, length=48):
+    rng = random.Random(seed)
+    waves = [[1 if rng.random() < 0.3 else 0 for _ in range(length)] for _ in range(n)]
+    waves.append([0, 0, 1, 1, 1, 0] * (length // 6))  # 짧은 단위가 반복되는 신호
+    waves.append([1, 0] * (length // 2))              # 클럭
+    waves.append([1] * length)                        # 값이 일정한 신호
+    return waves
+
+
+def _modes(n):
+    return ["반복" if i % 2 else "one-shot" for i in range(n)]
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+@pytest.mark.parametrize("seed", range(3))
+def test_options_off_is_byte_identical_to_previous_generator(storage, seed):
+    raw = _waves(seed)
+    names = [f"sig {i}" if i % 3 else f"{i}x" for i in range(len(raw))]  # sanitize 경로 포함
+    modes = _modes(len(raw))
+    expected = _baseline_generate(raw, names, modes, PARAMS)
+    waves = [storage(w) for w in raw]
+    assert VerilogAGenerator.generate(waves, names, modes, BASELINE) == expected
+    # 모든 신호가 one-shot이면 period_factor 파라미터도 없어야 한다
+    one_shot = ["one-shot"] * len(raw)
+    assert VerilogAGenerator.generate(waves, names, one_shot, BASELINE) == \
+        _baseline_generate(raw, names, one_shot, PARAMS)
+
+
+def test_baseline_output_reproduces_waveforms():
+    # 평가기 자체를 예전 출력으로 검증
+    raw = _waves(5)
+    modes = _modes(len(raw))
+    _check_reproduces(_baseline_generate(raw, [f"s{i}" for i in range(len(raw))], modes, PARAMS), raw, modes)
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_shared_timers_reproduce_waveforms(storage):
+    raw = _waves(1)
+    modes = _modes(len(raw))
+    waves = [storage(w) for w in raw]
+    params = dict(PARAMS, share_timers=True, minimize_period=False)
+    source = VerilogAGenerator.generate(waves, [f"s{i}" for i in range(len(raw))], modes, params)
+    _check_reproduces(source, raw, modes)
+    # 같은 (시각, 주기)의 timer는 하나뿐
+    heads = [m.group(1, 2) for m in map(_TIMER.search, source.splitlines()) if m]
+    assert len(heads) == len(set(heads))
+
+
+def test_shared_timers_collapse_bus_edges():
+    rng = random.Random(3)
+    pattern = [1 if rng.random() < 0.2 else 0 for _ in range(256)]
+    # 64비트 버스: 모든 비트가 같은 cycle에 바뀜 (값은 비트마다 반전 여부만 다름)
+    bus = [pattern if b % 2 else [1 - v for v in pattern] for b in range(64)]
+    modes = ["one-shot"] * 64
+    names = [f"d{b}" for b in range(64)]
+    shared = VerilogAGenerator.generate(bus, names, modes, dict(PARAMS, share_timers=True))
+    separate = VerilogAGenerator.generate(bus, names, modes, dict(PARAMS, share_timers=False))
+    edges = sum(1 for i in range(1, 256) if pattern[i] != pattern[i - 1])
+    count = lambda src: sum(1 for line in src.splitlines() if _TIMER.search(line))
+    assert count(separate) >= 64 * edges
+    assert count(shared) <= edges + 1  # + 끝에서 Low로 떨어뜨리는 timer
+    _check_reproduces(shared, bus, modes)
+
+
+@pytest.mark.parametrize("share_timers", [True, False])
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_minimal_period_reproduces_waveforms(storage, share_timers):
+    raw = _waves(2, length=60)
+    raw.append([1, 1, 0] * 20)
+    raw.append([0] * 59 + [1])  # 마지막 cycle만 High (단위 = 전체 길이)
+    modes = ["반복"] * len(raw)
+    params = dict(PARAMS, share_timers=share_timers, minimize_period=True)
+    source = VerilogAGenerator.generate([storage(w) for w in raw], [f"s{i}" for i in range(len(raw))],
+                                        modes, params)
+    _check_reproduces(source, raw, modes)
+
+
+def test_drawn_clock_exports_one_unit():
+    clock = [0, 1] * 2048
+    for share_timers in (True, False):
+        params = dict(PARAMS, share_timers=share_timers)
+        source = VerilogAGenerator.generate([BitWaveform(clock)], ["clk"], ["반복"], params)
+        timers, _ = _timers(source)
+        assert sorted((start, period) for start, period, _, _ in timers) == [(0.0, 1.0), (0.5, 1.0)]
+        assert "parameter real period_factor_0 = 1;" in source
+
+
+def test_period_parameter_only_for_shorter_units():
+    waves = [[0, 1, 1, 0] * 4, [1, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1, 0, 0, 1, 0, 0]]
+    source = VerilogAGenerator.generate(waves, ["a", "b"], ["반복", "반복"], dict(PARAMS, minimize_period=True))
+    assert "parameter real period_factor_0 = 2;" in source  # 4 cycle 단위
+    assert "period_factor_1" not in source                   # 반복 단위 없음: 공통 period_factor
+    periods = {p for _, p, vsel, _ in _timers(source)[0] if vsel == "vsel_1"}
+    assert periods == {8.0}
+
+
+class _Sink:
+    """write() 호출을 기록하는 텍스트 sink."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+
+@pytest.mark.parametrize("options", [{}, {"share_timers": False}, {"minimize_period": False},
+                                     {"share_timers": False, "minimize_period": False}])
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_write_matches_generate(tmp_path, storage, options):
+    import io
+    from waveform_cache import FragmentCache
+
+    raw = _waves(4)
+    waves = [storage(w) for w in raw]
+    names = [f"s{i}" for i in range(len(raw))]
+    modes = _modes(len(raw))
+    params = dict(PARAMS, **options)
+    expected = VerilogAGenerator.generate(waves, names, modes, params)
+    fp = io.StringIO()
+    VerilogAGenerator.write(fp, waves, names, modes, params)
+    assert fp.getvalue() == expected
+    path = tmp_path / "out.va"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        VerilogAGenerator.write(f, waves, names, modes, params, FragmentCache())
+    assert path.read_text(encoding="utf-8") == expected
+
+
+def test_write_streams_line_by_line():
+    rng = random.Random(6)
+    waves = [[1 if rng.random() < 0.5 else 0 for _ in range(20000)] for _ in range(4)]
+    names = [f"s{i}" for i in range(4)]
+    for options in ({}, {"share_timers": False}):
+        sink = _Sink()
+        VerilogAGenerator.write(sink, waves, names, ["one-shot"] * 4, dict(PARAMS, **options))
+        # 모듈 전체(수 MB)를 한 번에 쓰지 않고 한 줄(또는 줄바꿈)씩 쓴다
+        assert max(len(c) for c in sink.chunks) < 200
+        assert len(sink.chunks) > 20000
+
+
+def test_iter_lines_starts_before_analysis():
+    class Exploding(list):
+        """파형 내용에 접근하면 실패 (헤더는 파형을 보지 않고 나와야 한다)."""
+
+        def __getitem__(self, key):
+            raise AssertionError("waveform read too early")
+
+    lines = VerilogAGenerator.iter_lines([Exploding([0, 1])], ["a"], ["one-shot"], PARAMS)
+    assert next(lines).startswith("// Auto-generated")
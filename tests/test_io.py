@@ -0,0 +1,129 @@
+"""waveform_io: binary(WFB1) / JSON 프로젝트 저장-불러오기 왕복."""
+import json
+import random
+
+import pytest
+
+import waveform_io
+from waveform_core import Signal
+from waveform_io import read_binary, read_project, write_binary, write_json, write_project
+from waveform_storage import BitWaveform, EdgeWaveform
+
+
+def _signals(storage, num_cycles=203, seed=0):
+    rng = random.Random(seed)
+    dense = [1 if rng.random() < 0.5 else 0 for _ in range(num_cycles)]
+    sparse = [0] * num_cycles
+    sparse[num_cycles // 5:num_cycles // 5 + 5] = [1] * 5
+    high_first = [1] * 7 + [0] * (num_cycles - 7)
+    return [
+        ("CLK", "반복", storage([0, 1] * (num_cycles // 2) + [0] * (num_cycles % 2))),
+        ("data", "one-shot", storage(dense)),
+        ("en", "one-shot", storage(sparse)),
+        ("rst_n", "one-shot", storage(high_first)),
+        ("zero", "one-shot", storage([0] * num_cycles)),
+    ]
+
+
+def _header(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    _, header_len = waveform_io._PREFIX.unpack_from(data, 0)
+    return json.loads(data[waveform_io._PREFIX.size:waveform_io._PREFIX.size + header_len])
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_binary_round_trip(tmp_path, storage):
+    path = str(tmp_path / "p.wfb")
+    signals = _signals(storage)
+    write_binary(path, 203, signals)
+    num_cycles, loaded = read_binary(path)
+    assert num_cycles == 203
+    assert [(s.name, s.mode) for s in loaded] == [(n, m) for n, m, _ in signals]
+    for (_, _, wf), lazy in zip(signals, loaded):
+        assert len(wf) == 203 and lazy.load().tolist() == list(wf)
+    assert not (tmp_path / "p.wfb.tmp").exists()
+
+
+def test_binary_encoding_choice(tmp_path):
+    path = str(tmp_path / "p.wfb")
+    signals = _signals(EdgeWaveform, 10000)
+    write_binary(path, 10000, signals)
+    encodings = {e["name"]: e["encoding"] for e in _header(path)["signals"]}
+    # edge가 적은 EdgeWaveform만 run-length로, 나머지는 bit-packed로 저장
+    assert encodings == {"CLK": "bits", "data": "bits", "en": "edges", "rst_n": "edges", "zero": "edges"}
+    _, loaded = read_binary(path)
+    for (_, _, wf), lazy in zip(signals, loaded):
+        decoded = lazy.load()
+        assert isinstance(decoded, EdgeWaveform if encodings[lazy.name] == "edges" else BitWaveform)
+        assert decoded == wf.tolist()
+
+
+def test_binary_uses_64bit_edges_for_huge_projects(tmp_path):
+    num_cycles = (1 << 32) + 10
+    wf = EdgeWaveform.from_edges(0, [5, (1 << 32) + 3], num_cycles)
+    path = str(tmp_path / "huge.wfb")
+    write_binary(path, num_cycles, [("s", "one-shot", wf)])
+    assert _header(path)["signals"][0]["itemsize"] == 8
+    n, loaded = read_binary(path)
+    assert n == num_cycles and loaded[0].load() == wf
+
+
+def test_binary_payloads_are_aligned(tmp_path):
+    path = str(tmp_path / "p.wfb")
+    write_binary(path, 13, _signals(list, 13))
+    for entry in _header(path)["signals"]:
+        assert entry["offset"] % waveform_io._ALIGN == 0
+
+
+def test_lazy_signal_decodes_on_first_access(tmp_path):
+    path = str(tmp_path / "p.wfb")
+    signals = _signals(BitWaveform)
+    write_binary(path, 203, signals)
+    _, loaded = read_binary(path)
+    calls = []
+
+    def load(lazy=loaded[1]):
+        calls.append(1)
+        return lazy.load()
+
+    sig = Signal("data", "one-shot", [])
+    sig.set_lazy(load)
+    assert not calls
+    assert sig.waveform == signals[1][2] and len(calls) == 1
+    assert sig.waveform == signals[1][2] and len(calls) == 1
+
+
+def test_project_format_by_extension_and_magic(tmp_path):
+    signals = _signals(BitWaveform, 37)
+    for name in ("p.json", "p.JSON", "p.wfb", "p.bin"):
+        path = str(tmp_path / name)
+        write_project(path, 37, signals)
+        assert waveform_io.is_binary_project(path) == (not name.lower().endswith(".json"))
+        num_cycles, loaded = read_project(path)
+        assert num_cycles == 37
+        assert [(s.name, s.mode, list(s.load())) for s in loaded] == \
+            [(n, m, wf.tolist()) for n, m, wf in signals]
+
+
+def test_legacy_json_is_importable(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({
+        "config": {"num_cycles": 4, "num_waves": 2},
+        "signals": [{"name": "A", "mode": "one-shot", "waveform": [0, 1, 1, 0]},
+                    {"name": "B", "mode": "반복", "waveform": [1, 0, 1, 0]}],
+    }, indent=2), encoding="utf-8")
+    num_cycles, loaded = read_project(str(path))
+    assert num_cycles == 4
+    assert [(s.name, s.mode, s.load()) for s in loaded] == [("A", "one-shot", [0, 1, 1, 0]),
+                                                          ("B", "반복", [1, 0, 1, 0])]
+    again = tmp_path / "again.json"
+    write_json(str(again), 4, [(s.name, s.mode, s.load()) for s in loaded])
+    assert json.loads(again.read_text(encoding="utf-8")) == json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_rejects_unknown_magic(tmp_path):
+    path = tmp_path / "x.wfb"
+    path.write_bytes(b"NOPE" + bytes(16))
+    with pytest.raises(ValueError):
+        read_binary(str(path))
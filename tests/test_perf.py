@@ -0,0 +1,144 @@
+"""waveform_perf: 편집 단계별 시간, item 수, percentile, CSV 내보내기 (Tk 없이)."""
+import csv
+
+import pytest
+
+import waveform_perf
+from waveform_perf import PerfMonitor
+
+
+class _Clock:
+    """perf_counter/time을 대신하는 수동 시계 (초)."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return 1700000000.0 + self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class _Canvas:
+    """create_*/delete/find_withtag만 있는 canvas."""
+
+    def __init__(self):
+        self.items = {}
+        self._next = 0
+
+    def create_line(self, *coords, tags=()):
+        self._next += 1
+        self.items[self._next] = (tags,) if isinstance(tags, str) else tuple(tags)
+        return self._next
+
+    create_rectangle = create_text = create_line
+
+    def find_withtag(self, tag):
+        return [i for i, tags in self.items.items() if i == tag or tag in tags or tag == "all"]
+
+    def delete(self, *tags):
+        for tag in tags:
+            for item in self.find_withtag(tag):
+                del self.items[item]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(waveform_perf, "time", c)
+    return c
+
+
+@pytest.mark.parametrize("n, q, expected", [
+    (100, 50, 49), (100, 95, 94), (100, 99, 98), (100, 100, 99),
+    (10, 50, 4), (10, 95, 9), (20, 95, 18), (20, 50, 9),
+    (1, 50, 0), (1, 99, 0), (3, 50, 1), (7, 1, 0),
+])
+def test_percentile_is_nearest_rank(n, q, expected):
+    assert PerfMonitor._percentile(list(range(n)), q) == expected
+
+
+def test_percentile_of_no_samples():
+    assert PerfMonitor._percentile([], 95) == 0.0
+    assert PerfMonitor().percentiles("total") == [0.0, 0.0, 0.0]
+
+
+def test_disabled_monitor_records_nothing(clock):
+    perf = PerfMonitor()
+    with perf.edit("click"):
+        with perf.stage("mutation"):
+            clock.advance(1.0)
+    assert perf.stage("render") is perf.edit("x")  # 공유 null context
+    assert not perf.edits and perf.count == 0
+
+
+def test_nested_stages_are_counted_once(clock):
+    perf = PerfMonitor()
+    perf.enable()
+    with perf.edit("drag"):
+        with perf.stage("mutation"):
+            clock.advance(0.010)
+            with perf.stage("undo"):
+                clock.advance(0.003)
+            clock.advance(0.002)
+        with perf.stage("render"):
+            clock.advance(0.005)
+            with perf.edit("inner"):  # 중첩된 편집은 바깥 편집에 합쳐진다
+                with perf.stage("render"):
+                    clock.advance(0.001)
+    assert perf.count == 1 and len(perf.edits) == 1
+    row = perf.edits[0]
+    assert row["label"] == "drag"
+    assert row["mutation"] == pytest.approx(0.012)
+    assert row["undo"] == pytest.approx(0.003)
+    assert row["render"] == pytest.approx(0.006)
+    # 단계 시간 합 == 편집 전체 시간 (중첩 단계가 두 번 세어지지 않음)
+    assert row["total"] == pytest.approx(0.021)
+    assert sum(row[s] for s in waveform_perf.STAGES if s in row) == pytest.approx(row["total"])
+
+
+def test_item_counters(clock):
+    canvas = _Canvas()
+    perf = PerfMonitor()
+    perf.enable(canvas=canvas)
+    with perf.edit("redraw"):
+        for _ in range(3):
+            canvas.create_line(0, 0, 1, 1, tags=("wave",))
+        canvas.create_text(0, 0, tags="label")
+    with perf.edit("clear"):
+        canvas.delete("wave")
+    assert [(e["created"], e["deleted"]) for e in perf.edits] == [(4, 0), (0, 3)]
+    assert perf.items_created == 4 and perf.items_deleted == 3
+    perf.disable()
+    canvas.create_line(0, 0, 1, 1)
+    assert perf.items_created == 4  # wrapper가 제거됨
+    assert "create_line" not in canvas.__dict__ and "delete" not in canvas.__dict__
+
+
+def test_export_csv(tmp_path, clock):
+    perf = PerfMonitor(window=3)
+    perf.enable()
+    for k in range(5):  # window보다 많이: 앞의 두 편집은 밀려난다
+        with perf.edit(f"e{k}"):
+            with perf.stage("mutation"):
+                clock.advance(0.001 * (k + 1))
+    path = tmp_path / "perf.csv"
+    perf.export_csv(str(path))
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    columns = ("total",) + waveform_perf.STAGES
+    assert rows[0] == ["edit", "time", "label"] + [f"{c}_ms" for c in columns] + \
+        ["items_created", "items_deleted"]
+    edits, summary = rows[1:4], rows[4:]
+    assert [r[0] for r in edits] == ["3", "4", "5"]
+    assert [r[2] for r in edits] == ["e2", "e3", "e4"]
+    assert [float(r[3]) for r in edits] == pytest.approx([3.0, 4.0, 5.0])    # total_ms
+    assert [float(r[4]) for r in edits] == pytest.approx([3.0, 4.0, 5.0])    # mutation_ms
+    assert [float(r[5]) for r in edits] == [0.0, 0.0, 0.0]                   # undo_ms
+    assert [r[-2:] for r in edits] == [["0", "0"]] * 3
+    assert [r[0] for r in summary] == ["p50", "p95", "p99"]
+    assert [float(r[3]) for r in summary] == pytest.approx([4.0, 5.0, 5.0])
@@ -0,0 +1,251 @@
+"""waveform_render: min/max 피라미드, 렌더러 갱신 (Tk 없이 call을 세는 canvas로)."""
+import random
+from collections import Counter
+
+import pytest
+
+from waveform_core import WaveformConfig, WaveformModel
+from waveform_render import BASE_BUCKET, HIGH, LOW, MIXED, MinMaxPyramid, WaveformRenderer, _ItemPool
+from waveform_storage import BitWaveform, EdgeWaveform
+
+
+class CountingCanvas:
+    """WaveformRenderer가 쓰는 Canvas 메서드만 구현하고 호출 수를 센다 (benchmarks의 MockCanvas와 같은 방식)."""
+
+    def __init__(self, width=1000, height=600):
+        self.width, self.height = width, height
+        self.items = {}   # item -> [coords, opts]
+        self.calls = Counter()
+        self._next = 0
+        self._region = (0, 0, width, height)
+        self._x0 = 0.0
+
+    def _create(self, *coords, **opts):
+        self.calls["create"] += 1
+        self._next += 1
+        self.items[self._next] = [coords, opts]
+        return self._next
+
+    create_line = create_rectangle = create_polygon = create_text = _create
+
+    def coords(self, item, *coords):
+        if not coords:
+            return self.items[item][0]
+        self.calls["coords"] += 1
+        self.items[item][0] = coords
+
+    def itemconfigure(self, item, **opts):
+        self.calls["itemconfigure"] += 1
+        self.items[item][1].update(opts)
+
+    def delete(self, *tags):
+        self.calls["delete"] += 1
+
+    def state(self, item):
+        return self.items[item][1].get("state", "normal")
+
+    def tag_lower(self, *args):
+        pass
+
+    tag_raise = tag_lower
+
+    def configure(self, **opts):
+        self._region = opts.get("scrollregion", self._region)
+
+    def after_idle(self, func, *args):
+        func(*args)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasx(self, x):
+        return x + self._x0
+
+    def canvasy(self, y):
+        return y
+
+    def xview_moveto(self, fraction):
+        self._x0 = float(fraction) * (self._region[2] - self._region[0])
+
+
+def _renderer(num_cycles, num_waves, storage=BitWaveform, seed=0):
+    cfg = WaveformConfig()
+    cfg.num_cycles, cfg.num_waves = num_cycles, num_waves
+    model = WaveformModel(num_cycles, num_waves, storage)
+    rng = random.Random(seed)
+    for sig in model.signals:
+        sig.waveform = [1 if rng.random() < 0.3 else 0 for _ in range(num_cycles)]
+    canvas = CountingCanvas()
+    renderer = WaveformRenderer(canvas, cfg, model)
+    renderer.rebuild()
+    return renderer, model, canvas
+
+
+def _naive_levels(wf):
+    """bucket마다 Low/High 포함 여부를 직접 세어 만든 피라미드."""
+    wf = list(wf)
+    levels = []
+    size = BASE_BUCKET
+    while True:
+        codes = []
+        for s in range(0, len(wf), size):
+            chunk = wf[s:s + size]
+            codes.append((LOW if 0 in chunk else 0) | (HIGH if 1 in chunk else 0))
+        levels.append(bytearray(codes))
+        if len(codes) <= 1:
+            return levels
+        size *= 2
+
+
+@pytest.mark.parametrize("length", [1, 5, 8, 9, 15, 16, 63, 64, 100, 203])
+def test_pyramid_matches_naive_buckets(length):
+    rng = random.Random(length)
+    wf = [1 if rng.random() < 0.5 else 0 for _ in range(length)]
+    wf[:3] = [1, 1, 1]  # 첫 bucket이 섞이도록
+    for storage in (list, BitWaveform, EdgeWaveform):
+        assert MinMaxPyramid(storage(wf)).levels == _naive_levels(wf)
+    assert MinMaxPyramid([0] * length).levels[-1] == bytearray([LOW])
+    assert MinMaxPyramid([1] * length).levels[-1] == bytearray([HIGH])
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+@pytest.mark.parametrize("length", [3, 8, 13, 64, 77, 130, 1001])
+def test_pyramid_update_matches_rebuild(storage, length):
+    # 마지막 bucket이 8보다 짧은 길이(3, 13, 77, 130, 1001) 포함
+    rng = random.Random(length)
+    wf = storage([1 if rng.random() < 0.3 else 0 for _ in range(length)])
+    pyr = MinMaxPyramid(wf)
+    for _ in range(150):
+        r = rng.random()
+        if r < 0.4:  # 한 칸
+            a = rng.randrange(length)
+            b = a + 1
+        elif r < 0.9:  # 임의 정렬의 구간
+            a = rng.randrange(length)
+            b = rng.randrange(a, length + 1)
+        else:  # 끝 bucket만
+            a = rng.randrange(max(0, length - BASE_BUCKET), length)
+            b = length
+        value = rng.randrange(2)
+        if storage is list:
+            wf[a:b] = [value] * (b - a)
+        else:
+            wf.fill(a, b, value)
+        pyr.update(wf, a, b)
+        assert pyr.levels == MinMaxPyramid(wf).levels, (a, b)
+    pyr.update(wf, length, length + 10)  # 범위 밖 구간은 무시
+    assert pyr.levels == MinMaxPyramid(wf).levels
+
+
+def test_pyramid_update_of_mixed_last_bucket():
+    wf = BitWaveform([0] * 21)  # 마지막 bucket은 5 cycle
+    pyr = MinMaxPyramid(wf)
+    wf.fill(16, 21, 1)
+    pyr.update(wf, 16, 21)
+    assert pyr.levels[0] == bytearray([LOW, LOW, HIGH])
+    wf[20] = 0
+    pyr.update(wf, 20, 21)
+    assert pyr.levels[0] == bytearray([LOW, LOW, MIXED])
+    assert pyr.levels[-1] == bytearray([MIXED])
+
+
+def test_level_for_boundaries():
+    pyr = MinMaxPyramid([0] * 1024)  # level 0..7 (bucket 8 .. 1024 cycle)
+    assert len(pyr.levels) == 8
+    # bucket 하나(BASE_BUCKET * 2^k cycle)가 1 pixel을 넘지 않는 가장 거친 level
+    cases = [(0.01, 0), (1.0, 0), (8.0, 0), (15.99, 0), (16.0, 1), (31.99, 1), (32.0, 2),
+             (64.0, 3), (1023.0, 6), (1024.0, 7), (1e9, 7)]
+    for cycles_per_pixel, level in cases:
+        assert pyr.level_for(cycles_per_pixel) == level, cycles_per_pixel
+    # level이 하나뿐인 짧은 파형은 항상 0
+    short = MinMaxPyramid([1, 0, 1])
+    assert [short.level_for(c) for c in (0.5, 8.0, 1e6)] == [0, 0, 0]
+
+
+@pytest.mark.parametrize("storage", [BitWaveform, EdgeWaveform])
+def test_renderer_keeps_cached_pyramids_in_sync(storage):
+    n = 50003  # 전체 보기에서 pixel당 ~50 cycle: 피라미드로 그린다
+    renderer, model, canvas = _renderer(n, 3, storage)
+    renderer.zoom_fit()
+    assert set(renderer._pyramids) == {0, 1, 2}
+    rng = random.Random(1)
+    for _ in range(30):
+        row = rng.randrange(3)
+        a = rng.randrange(n)
+        b = min(n, a + rng.choice([1, 7, 100, n]))
+        model.write_range(row, a, b, rng.randrange(2))
+        renderer.mark_dirty(row, a, b)
+        renderer.flush()
+        for r, pyr in renderer._pyramids.items():
+            assert pyr.levels == MinMaxPyramid(model.signals[r].waveform).levels
+
+
+
+# -------------------- item 재사용 -------------------- #
+
+def _pass(pool, n):
+    pool.begin()
+    items = [pool.place(i, 0, i, 10) for i in range(n)]
+    pool.end()
+    return items
+
+
+def test_item_pool_reuses_and_hides_items():
+    canvas = CountingCanvas()
+    pool = _ItemPool(canvas, "line", "grid", fill="gray")
+    first = _pass(pool, 5)
+    assert canvas.calls["create"] == 5
+    assert canvas.items[first[0]][1] == {"tags": "grid", "fill": "gray"}
+
+    canvas.calls.clear()
+    assert _pass(pool, 5) == first  # 같은 item을 coords()로 옮긴다
+    assert canvas.calls == Counter(coords=5)
+
+    canvas.calls.clear()
+    assert _pass(pool, 2) == first[:2]
+    assert canvas.calls["create"] == 0 and canvas.calls["delete"] == 0
+    assert [canvas.state(i) for i in first] == ["normal"] * 2 + ["hidden"] * 3
+
+    canvas.calls.clear()
+    assert _pass(pool, 4) == first[:4]  # 숨긴 item을 다시 보이게 해서 재사용
+    assert canvas.calls["create"] == 0 and canvas.calls["delete"] == 0
+    assert [canvas.state(i) for i in first] == ["normal"] * 4 + ["hidden"]
+    assert canvas.items[first[3]][0] == (3, 0, 3, 10)
+
+    canvas.calls.clear()
+    assert len(_pass(pool, 7)) == 7  # 모자랄 때만 새로 만든다
+    assert canvas.calls["create"] == 2
+    assert all(canvas.state(i) == "normal" for i in pool.items)
+
+
+def test_redraw_reuses_canvas_items():
+    renderer, model, canvas = _renderer(2000, 20)
+    created = canvas.calls["create"]
+    assert created > 0
+    for _ in range(2):  # 같은 창을 두 번 다시 그려도 item 생성/삭제 없음
+        canvas.calls.clear()
+        renderer.update_view(force=True)
+        assert canvas.calls["create"] == 0 and canvas.calls["delete"] == 0
+        assert canvas.calls["coords"] > 0
+    # 편집 후 flush도 기존 item 좌표만 바꾼다
+    canvas.calls.clear()
+    model.write_range(1, 10, 30, 1)
+    renderer.mark_dirty(1, 10, 30)
+    renderer.flush()
+    assert canvas.calls["create"] == 0 and canvas.calls["delete"] == 0
+    assert canvas.calls["coords"] >= 1
+    # 확대/축소로 그리드 선 수가 바뀌어도 지우지 않고 숨기거나 다시 보인다
+    canvas.calls.clear()
+    hidden = lambda: sum(canvas.state(i) == "hidden" for i in canvas.items)
+    before = hidden()
+    renderer.zoom(0.25)  # 축소: 보이는 cycle이 늘어 그리드 item이 더 필요
+    renderer.zoom(4.0)   # 다시 확대: 남는 item은 숨긴다
+    assert canvas.calls["delete"] == 0
+    assert hidden() > before
+    total = len(canvas.items)
+    renderer.zoom(0.25)
+    renderer.zoom(4.0)
+    assert len(canvas.items) == total
@@ -0,0 +1,127 @@
+"""waveform_spice: PWL 전압원 출력과 Verilog-A 출력의 시각 비교."""
+import io
+import re
+
+import pytest
+
+from waveform_core import VerilogAGenerator
+from waveform_spice import iter_points, parse_spice_value, write_netlist
+
+TCK, TR, TF = 10e-9, 10e-12, 20e-12
+PARAMS = {'tck_str': '10n', 'tr_str': '10p', 'tf_str': '20p', 'vhigh': 1.2, 'vlow': 0.0,
+          'share_timers': False}
+WAVES = [  # GUI처럼 모두 같은 길이
+    [0, 1, 1, 0, 0, 0, 1, 0, 1, 1, 0, 0],  # one-shot, Low로 끝남
+    [1, 1, 0, 1, 0, 0, 1, 1, 1, 1, 0, 1],  # one-shot, High로 끝남 -> 끝에서 Low
+    [0, 1, 1, 0] * 3,                 # 반복, 최소 단위 4칸 (wrap 없음)
+    [1, 0, 0, 1, 1, 0, 0, 0, 1, 0, 1, 0],  # 반복, 마지막 값 != 첫 값 -> wrap 전환
+]
+MODES = ["one-shot", "one-shot", "반복", "반복"]
+
+
+def _verilog_a_transitions(text, idx):
+    """신호 idx의 timer 할당을 (시작 시각[s], 목표 전압, 주기[s] 또는 None)으로."""
+    factors = {m.group(1): float(m.group(2))
+               for m in re.finditer(r"parameter real (period_factor\w*) = ([\d.e+-]+);", text)}
+    events = []
+    pattern = r"@\(timer\(\(?([\d.e+-]+)(?: \* tck)?\)?(?:, \((\w+) \* tck\))?\)\) vsel_%d = ([\d.e+-]+);" % idx
+    for m in re.finditer(pattern, text):
+        period = factors[m.group(2)] * TCK if m.group(2) else None
+        events.append((float(m.group(1)) * TCK, float(m.group(3)), period))
+    return events
+
+
+def _pwl_sources(text):
+    """spectre netlist의 신호별 (점 목록, period 또는 None)."""
+    sources = []
+    for m in re.finditer(r"vsource type=pwl wave=\[ \\\n(.*?)\]( period=([\d.e+-]+))?\n", text, re.S):
+        values = [float(v) for v in m.group(1).replace("\\", " ").split()]
+        sources.append((list(zip(values[::2], values[1::2])), float(m.group(3)) if m.group(3) else None))
+    return sources
+
+
+def test_pwl_edges_match_verilog_a_timers():
+    names = [f"s{i}" for i in range(len(WAVES))]
+    va = VerilogAGenerator.generate(WAVES, names, MODES, PARAMS)
+    buf = io.StringIO()
+    write_netlist(buf, WAVES, names, MODES, PARAMS)
+    sources = _pwl_sources(buf.getvalue())
+    assert len(sources) == len(WAVES)
+    assert "transition(vsel_0, 0, tr, tf)" in va
+
+    for idx, (points, pwl_period) in enumerate(sources):
+        events = _verilog_a_transitions(va, idx)
+        assert events, idx
+        times = [t for t, _ in points]
+        level = points[0][1]
+        wraps = [e for e in events if e[0] == 0 and e[2] is not None]
+        for start, volt, period in events:
+            if (start, volt, period) in wraps:
+                continue
+            ramp = TR if volt == PARAMS['vhigh'] else TF
+            k = min(range(len(times)), key=lambda j: abs(times[j] - start))
+            assert times[k] == pytest.approx(start, abs=1e-18), (idx, start)
+            assert points[k][1] == level
+            assert points[k + 1] == (pytest.approx(start + ramp, abs=1e-18), volt)
+            if period is not None:
+                assert pwl_period == pytest.approx(period)
+            level = volt
+        for _, volt, period in wraps:
+            # wrap은 Verilog-A에서 주기 경계(k * period)의 timer. PWL은 주기마다 0초부터 반복되므로
+            # 0초 값(DC)이 첫 값이 되도록 이 전환을 주기 끝에서 마친다
+            ramp = TR if volt == PARAMS['vhigh'] else TF
+            assert pwl_period == pytest.approx(period)
+            assert points[-2:] == [(pytest.approx(period - ramp), level), (pytest.approx(period), volt)]
+            assert points[0][1] == volt
+        if MODES[idx] == "반복" and not wraps:
+            assert points[-1] == (pytest.approx(pwl_period), level)
+
+
+@pytest.mark.parametrize("tr,tf", [(0.3, 0.3), (0.7, 0.2), (1.3, 1.1)])
+@pytest.mark.parametrize("periodic", [False, True])
+def test_overlapping_ramps_are_clamped(tr, tf, periodic):
+    # 1칸(0.5 tck) pulse보다 긴 tr + tf: 예전에는 ValueError, 이제는 중간 전압에서 다시 전환
+    wf = [0, 1, 0, 1, 1, 0, 1, 0]
+    points = list(iter_points(wf, len(wf), 1.0, tr, tf, 1.0, 0.0, periodic))
+    times = [t for t, _ in points]
+    assert all(b > a for a, b in zip(times, times[1:]))
+    assert all(0.0 <= v <= 1.0 for _, v in points)
+    assert points[0] == (0.0, 0.0)
+    if periodic:
+        assert points[-1] == (pytest.approx(4.0), 0.0)
+
+
+def test_overlap_follows_interrupted_transition():
+    # 상승 전환(1 tck) 도중 0.5 tck에 하강 시작: 그 시각의 전압(0.5)에서 tf 동안 떨어진다
+    points = list(iter_points([0, 1, 0, 0], 4, 1.0, 1.0, 0.1, 1.0, 0.0, False))
+    assert points == [(0.0, 0.0), (0.5, 0.0), (1.0, 0.5), (1.1, 0.0)]
+
+
+@pytest.mark.parametrize("tr,tf", [(0.0, 1e-11), (1e-11, 0.0), (-1e-12, 1e-11)])
+def test_zero_or_negative_edge_time_is_rejected(tr, tf):
+    with pytest.raises(ValueError):
+        list(iter_points([0, 1], 2, 1e-8, tr, tf, 1.0, 0.0, False))
+
+
+def test_parse_spice_value():
+    assert parse_spice_value("10n") == pytest.approx(10e-9)
+    assert parse_spice_value("2meg") == pytest.approx(2e6)
+    assert parse_spice_value("1.5ps") == pytest.approx(1.5e-12)
+    with pytest.raises(ValueError):
+        parse_spice_value("abc")
+
+
+def test_zero_edge_time_fails_before_writing():
+    buf = io.StringIO()
+    with pytest.raises(ValueError):
+        write_netlist(buf, WAVES, ["a", "b", "c", "d"], MODES, dict(PARAMS, tr_str="0"))
+    assert buf.getvalue() == ""
+
+
+def test_empty_waveform_is_rejected_before_writing():
+    with pytest.raises(ValueError, match="empty"):
+        iter_points([], 0, 1e-8, 1e-11, 1e-11, 1.0, 0.0, False)
+    buf = io.StringIO()
+    with pytest.raises(ValueError, match="'b' is empty"):
+        write_netlist(buf, [[0, 1], [], [1]], ["a", "b", "c"], ["one-shot", "반복", "one-shot"], PARAMS)
+    assert buf.getvalue() == ""
@@ -0,0 +1,146 @@
+"""waveform_storage: 저장소가 List[int]와 똑같이 동작하는지 (무작위 연산 비교)."""
+import random
+
+import pytest
+
+from waveform_storage import BitWaveform, EdgeWaveform
+
+STORAGES = [BitWaveform, EdgeWaveform]
+
+
+def _random_wave(rng, length, density=0.3):
+    return [1 if rng.random() < density else 0 for _ in range(length)]
+
+
+def _check(wf, ref):
+    assert len(wf) == len(ref)
+    assert wf.tolist() == ref
+    assert list(wf) == ref
+    assert wf == ref
+    assert wf.transitions() == [i for i in range(1, len(ref)) if ref[i] != ref[i - 1]]
+    assert wf.count(1) == sum(ref) and wf.count(0) == len(ref) - sum(ref)
+
+
+@pytest.mark.parametrize("cls", STORAGES)
+@pytest.mark.parametrize("seed", range(5))
+def test_random_ops_match_list(cls, seed):
+    rng = random.Random(seed)
+    ref = _random_wave(rng, rng.randrange(0, 80))
+    wf = cls(ref)
+    _check(wf, ref)
+    for _ in range(300):
+        n = len(ref)
+        op = rng.randrange(7)
+        if op == 0 and n:  # 단일 cycle 쓰기 (음수 인덱스 포함)
+            i = rng.randrange(-n, n)
+            v = rng.randrange(2)
+            wf[i] = v
+            ref[i] = v
+        elif op == 1:  # 범위 채우기 (범위를 벗어난 끝값은 잘라냄)
+            a = rng.randrange(-3, n + 3)
+            b = rng.randrange(-3, n + 3)
+            v = rng.randrange(2)
+            wf.fill(a, b, v)
+            for i in range(max(0, a), min(n, b)):
+                ref[i] = v
+        elif op == 2:  # 슬라이스에 scalar / list 대입
+            a = rng.randrange(0, n + 1)
+            b = rng.randrange(a, n + 1)
+            if rng.random() < 0.5:
+                v = rng.randrange(2)
+                wf[a:b] = v
+                ref[a:b] = [v] * (b - a)
+            else:
+                vals = _random_wave(rng, b - a, 0.5)
+                wf[a:b] = vals
+                ref[a:b] = vals
+        elif op == 3:  # 같은 저장소의 슬라이스를 다른 위치에 대입
+            a = rng.randrange(0, n + 1)
+            b = rng.randrange(a, n + 1)
+            c = rng.randrange(0, n - (b - a) + 1)
+            part = wf[a:b]
+            assert isinstance(part, cls) and part == ref[a:b]
+            wf[c:c + (b - a)] = part
+            ref[c:c + (b - a)] = ref[a:b]
+        elif op == 4:  # 길이 변경
+            m = rng.randrange(0, 100)
+            wf.resize(m)
+            ref = (ref + [0] * m)[:m]
+        elif op == 5:  # 이어 붙이기
+            vals = _random_wave(rng, rng.randrange(0, 20))
+            wf.extend(vals)
+            ref = ref + vals
+        else:  # 새 파형을 만드는 연산
+            other = _random_wave(rng, rng.randrange(0, 20))
+            assert (wf + other) == ref + other
+            assert (wf + cls(other)) == ref + other
+            times = rng.randrange(0, 5)
+            assert (wf * times) == ref * times
+            assert wf.inverted() == [1 - v for v in ref]
+            assert wf.copy() == ref
+        _check(wf, ref)
+
+
+@pytest.mark.parametrize("cls", STORAGES)
+def test_indexing_matches_list(cls):
+    ref = [0, 1, 1, 0, 1, 0, 0, 0, 1, 1, 1]
+    wf = cls(ref)
+    for i in range(-len(ref), len(ref)):
+        assert wf[i] == ref[i]
+    for key in (slice(2, 7), slice(None, 4), slice(-3, None), slice(5, 2), slice(None, None, 2),
+                slice(9, 1, -3)):
+        assert wf[key] == ref[key]
+    for i in (len(ref), -len(ref) - 1):
+        with pytest.raises(IndexError):
+            wf[i]
+    with pytest.raises(ValueError):
+        wf[1:4] = [1, 0]
+    with pytest.raises(ValueError):
+        wf[::2] = 1
+
+
+@pytest.mark.parametrize("cls", STORAGES)
+def test_empty_and_zeros(cls):
+    assert cls([]).tolist() == [] and cls([]).transitions() == []
+    z = cls.zeros(13)
+    assert z == [0] * 13 and z.count(1) == 0
+    z.resize(0)
+    z.resize(5)
+    assert z == [0] * 5
+
+
+def test_bits_frombytes_round_trip():
+    rng = random.Random(7)
+    for length in (0, 1, 7, 8, 9, 64, 203):
+        ref = _random_wave(rng, length, 0.5)
+        wf = BitWaveform(ref)
+        assert BitWaveform.frombytes(wf.tobytes(), length) == ref
+        assert wf.nbytes == (length + 7) // 8
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conversions_between_storages(seed):
+    rng = random.Random(seed)
+    for length in (0, 1, 9, 100):
+        ref = _random_wave(rng, length, 0.4)
+        bits, edges = BitWaveform(ref), EdgeWaveform(ref)
+        assert EdgeWaveform(bits) == edges and BitWaveform(edges) == bits
+        assert bits == edges.tolist() and edges == bits.tolist()
+        assert EdgeWaveform.from_edges(ref[0] if ref else 0, bits.transitions(), length) == edges
+
+
+def test_edges_splice_keeps_edge_list_canonical():
+    wf = EdgeWaveform([0] * 20)
+    wf[5:10] = EdgeWaveform([1, 1, 0, 0, 1])
+    wf[9:12] = EdgeWaveform([1, 1, 1])
+    assert wf == [0] * 5 + [1, 1, 0, 0, 1, 1, 1] + [0] * 8
+    # 같은 값이 이어지는 경계에는 edge가 남지 않는다
+    assert wf.transitions() == [5, 7, 9, 12]
+    assert wf == EdgeWaveform(wf.tolist())
+
+
+def test_edges_from_edges_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        EdgeWaveform.from_edges(0, [0, 3], 5)
+    with pytest.raises(ValueError):
+        EdgeWaveform.from_edges(0, [2, 5], 5)
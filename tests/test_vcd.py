@@ -0,0 +1,106 @@
+"""waveform_vcd: VCD dump -> cycle 파형 가져오기."""
+import random
+
+import pytest
+
+from waveform_vcd import read_vcd, scan_vcd
+from waveform_storage import BitWaveform
+
+HEADER = """$date today $end
+$timescale 1ps $end
+$scope module tb $end
+{vars}
+$upscope $end
+$enddefinitions $end
+"""
+
+
+def _write_vcd(path, declarations, changes, t_end):
+    """declarations: $var 줄 목록, changes: {시각: [값 변화 줄]}."""
+    lines = [HEADER.format(vars="\n".join(declarations))]
+    for t in sorted(changes):
+        lines.append(f"#{t}")
+        lines.extend(changes[t])
+    lines.append(f"#{t_end}")
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def _random_waves(n, length, seed):
+    rng = random.Random(seed)
+    return [[rng.randrange(2) for _ in range(length)] for _ in range(n)]
+
+
+def test_round_trip_scalars_and_vector(tmp_path):
+    """칸 k의 값을 시각 k * 5000ps에 dump하고 같은 주기로 샘플링하면 원래 파형."""
+    length, step = 200, 5000
+    a, b, *bus = _random_waves(6, length, 11)  # bus: MSB(bus[3])부터
+    changes = {}
+    for k in range(length):
+        if k == 0 or a[k] != a[k - 1]:
+            changes.setdefault(k * step, []).append(f"{a[k]}!")
+        if k == 0 or b[k] != b[k - 1]:
+            changes.setdefault(k * step, []).append(f"{b[k]}\"")
+        if k == 0 or any(w[k] != w[k - 1] for w in bus):
+            changes.setdefault(k * step, []).append("b" + "".join(str(w[k]) for w in bus) + " #")
+    path = _write_vcd(tmp_path / "dump.vcd",
+                      ["$var wire 1 ! a $end", "$var reg 1 \" b $end", "$var wire 4 # bus [3:0] $end"],
+                      changes, (length - 1) * step)
+    num_cycles, signals = read_vcd(path, ["tb.a", "tb.b", "tb.bus", "tb.bus[1]"], period="5n")
+    assert num_cycles == length
+    assert [name for name, _, _ in signals] == \
+        ["tb.a", "tb.b", "tb.bus[3]", "tb.bus[2]", "tb.bus[1]", "tb.bus[0]", "tb.bus[1]"]
+    got = [list(wf) for _, _, wf in signals]
+    assert got == [a, b] + bus + [bus[2]]
+
+    # 저장소 지정, 칸 수 제한
+    num_cycles, signals = read_vcd(path, ["tb.a"], period="5n", num_cycles=50, storage=BitWaveform)
+    assert num_cycles == 50 and type(signals[0][2]) is BitWaveform and signals[0][2].tolist() == a[:50]
+
+
+def test_clock_sampling(tmp_path):
+    length = 40
+    (d,) = _random_waves(1, length, 5)
+    changes = {}
+    for k in range(length):
+        # 데이터는 clock edge 직전에 바뀐다
+        changes.setdefault(k * 1000 + 100, []).append(f"{d[k]}!")
+        changes.setdefault(k * 1000 + 500, []).append(f"{k % 2}\"")
+    path = _write_vcd(tmp_path / "clk.vcd", ["$var wire 1 ! d $end", "$var wire 1 \" clk $end"],
+                      changes, length * 1000)
+    num_cycles, signals = read_vcd(path, ["tb.d"], clock="tb.clk")
+    assert num_cycles == length - 1  # 첫 clock 값은 edge가 아님
+    assert list(signals[0][2]) == d[1:]
+
+
+def test_separately_declared_bits_are_distinct(tmp_path):
+    changes = {0: ["0!", "1\""], 5000: ["1!"], 10000: ["0\""]}
+    path = _write_vcd(tmp_path / "bits.vcd",
+                      ["$var wire 1 ! data [0] $end", "$var wire 1 \" data [1] $end"], changes, 15000)
+    header = scan_vcd(path)
+    assert [v.full_name for v in header.vars] == ["tb.data[0]", "tb.data[1]"]
+    _, signals = read_vcd(path, ["tb.data[0]", "tb.data[1]"], period="5n", header=header)
+    assert [(name, list(wf)) for name, _, wf in signals] == \
+        [("tb.data[0]", [0, 1, 1, 1]), ("tb.data[1]", [1, 1, 0, 0])]
+    with pytest.raises(ValueError, match="ambiguous"):
+        read_vcd(path, ["tb.data"], period="5n", header=header)
+
+
+def test_same_name_declared_twice(tmp_path):
+    # 같은 계층 이름이 다시 열린 scope에서 다른 신호로 선언됨
+    decl = ("$timescale 1ps $end\n$scope module tb $end\n$var wire 1 ! x $end\n$upscope $end\n"
+            "$scope module tb $end\n$var wire 1 \" x $end\n$var wire 1 ! y $end\n$upscope $end\n"
+            "$enddefinitions $end\n#0\n1!\n0\"\n#5000\n")
+    path = tmp_path / "dup.vcd"
+    path.write_text(decl)
+    with pytest.raises(ValueError, match="ambiguous"):
+        read_vcd(str(path), ["tb.x"], period="5n")
+    # 같은 id code의 별칭은 모호하지 않다
+    _, signals = read_vcd(str(path), ["tb.y"], period="5n")
+    assert list(signals[0][2]) == [1, 1]
+
+
+def test_unknown_signal(tmp_path):
+    path = _write_vcd(tmp_path / "u.vcd", ["$var wire 1 ! a $end"], {0: ["0!"]}, 5000)
+    with pytest.raises(KeyError):
+        read_vcd(path, ["tb.nope"], period="5n")
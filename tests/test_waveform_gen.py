@@ -0,0 +1,141 @@
+"""waveform_gen.generate_veriloga: chain 방식은 예전 출력과 byte 단위로 같고, event 방식은 같은 파형을 낸다."""
+import math
+import random
+import re
+
+import pytest
+
+from waveform_gen import generate_veriloga
+from waveform_storage import BitWaveform, EdgeWaveform
+
+TCLK, VLOW, VHIGH, EDGE = 1e-9, 0.0, 1.2, 1e-12
+
+_NUM = r"([-+0-9.eE]+)"
+_TIMER = re.compile(rf"@\(timer\({_NUM}(?:, {_NUM})?\)\) vsel_(\d+) = {_NUM};")
+_INIT = re.compile(rf"vsel_(\d+) = {_NUM};")
+
+
+def _baseline_export(waveforms, outs, modes, tclk, vlow, vhigh, edge_time):
+    """event 방식 추가 전 WaveformEditor._export_veriloga의 출력 (대화상자만 뺀 그대로)."""
+    def to_pwl_points(wf):
+        points = []
+        cur_val = wf[0]
+        cur_time = 0.0
+        points.append((cur_time, vhigh if cur_val else vlow))
+        for i in range(1, len(wf)):
+            if wf[i] != cur_val:
+                cur_val = wf[i]
+                cur_time = i * tclk
+                points.append((cur_time, vhigh if cur_val else vlow))
+        points.append((len(wf) * tclk, vhigh if cur_val else vlow))
+        return points
+
+    port_decl = ", ".join(outs)
+    body_lines = []
+    for idx, wf in enumerate(waveforms):
+        mode = modes[idx]
+        pwl_pts = to_pwl_points(wf)
+        times = [pt[0] for pt in pwl_pts]
+        vals = [pt[1] for pt in pwl_pts]
+        if mode == "pulse":
+            period = len(wf) * tclk
+            body_lines.append(f"    // {outs[idx]} : pulse (periodic)")
+            body_lines.append(f"    real tau_{idx}, vsel_{idx};")
+            body_lines.append(f"    tau_{idx} = $abstime - {period:.12g}*floor($abstime/{period:.12g});")
+            conds = [(times[i], vals[i - 1]) for i in range(1, len(times))]
+            for i, (t_edge, v_prev) in enumerate(conds):
+                if_clause = "if" if i == 0 else "else if"
+                body_lines.append(f"    {if_clause} (tau_{idx} < {t_edge:.12g}) vsel_{idx} = {v_prev:.12g};")
+            body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
+        else:
+            body_lines.append(f"    // {outs[idx]} : pwl (one-shot, finite edge)")
+            body_lines.append(f"    real vsel_{idx};")
+            if len(times) == 1:
+                body_lines.append(f"    vsel_{idx} = {vals[0]:.12g};")
+            else:
+                for i in range(1, len(times)):
+                    if_clause = "if" if i == 1 else "else if"
+                    body_lines.append(f"    {if_clause} ($abstime < {times[i]:.12g}) vsel_{idx} = {vals[i - 1]:.12g};")
+                body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
+        body_lines.append(f"    V({outs[idx]}) <+ transition(vsel_{idx}, 0, {edge_time:.12g});")
+    body = "\n".join(body_lines)
+    return f"""// Auto-generated from WaveformEditor (all waves)
+`include "discipline.h"
+`include "constants.h"
+
+module pwl_waves(output electrical {port_decl});
+    parameter real vlow = {vlow};
+    parameter real vhigh = {vhigh};
+    analog begin
+{body}
+    end
+endmodule
+"""
+
+
+def _waves(seed=0, n=8, length=40):
+    rng = random.Random(seed)
+    waves = [[1 if rng.random() < 0.4 else 0 for _ in range(length)] for _ in range(n)]
+    waves += [[0] * length, [1] * length, [1, 0] * (length // 2)]
+    return waves
+
+
+def _event_values(source, t):
+    """event 방식 소스에서 시각 t의 vsel 값 (신호별로 t 이전 마지막 timer 발생)."""
+    init_block = source.split("@(initial_step) begin", 1)[1].split("end", 1)[0]
+    values = {int(i): (-math.inf, float(v)) for i, v in _INIT.findall(init_block)}
+    for m in _TIMER.finditer(source):
+        t0 = float(m.group(1))
+        period = float(m.group(2)) if m.group(2) else None
+        idx, v = int(m.group(3)), float(m.group(4))
+        if t < t0:
+            continue
+        fired = t0 + period * math.floor((t - t0) / period) if period else t0
+        if fired > values[idx][0]:
+            values[idx] = (fired, v)
+    return [values[i][1] for i in sorted(values)]
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform, EdgeWaveform])
+def test_chain_style_is_byte_identical_to_previous_export(storage):
+    waves = [storage(w) for w in _waves(1)]
+    outs = [f"s{i}" for i in range(len(waves))]
+    modes = ["pulse" if i % 3 == 0 else "pwl" for i in range(len(waves))]
+    expected = _baseline_export([list(w) for w in waves], outs, modes, TCLK, VLOW, VHIGH, EDGE)
+    assert generate_veriloga(waves, outs, modes, TCLK, VLOW, VHIGH, EDGE, "chain") == expected
+    # 한 cycle짜리 파형 (edge 없음)
+    single = [[1], [0]]
+    assert generate_veriloga(single, ["a", "b"], ["pwl", "pulse"], TCLK, VLOW, VHIGH, EDGE, "chain") == \
+        _baseline_export(single, ["a", "b"], ["pwl", "pulse"], TCLK, VLOW, VHIGH, EDGE)
+
+
+@pytest.mark.parametrize("storage", [list, BitWaveform])
+def test_event_style_reproduces_waveforms(storage):
+    raw = _waves(2)
+    waves = [storage(w) for w in raw]
+    modes = ["pulse" if i % 2 else "pwl" for i in range(len(waves))]
+    source = generate_veriloga(waves, [f"s{i}" for i in range(len(waves))], modes,
+                               TCLK, VLOW, VHIGH, EDGE, "event")
+    n = len(raw[0])
+    for k in range(3 * n):  # 파형 길이 3배까지 (cycle 중간에서 샘플)
+        got = _event_values(source, (k + 0.5) * TCLK)
+        expected = []
+        for wf, mode in zip(raw, modes):
+            if mode == "pulse":
+                level = wf[k % n]
+            else:
+                level = wf[min(k, n - 1)]
+            expected.append(VHIGH if level else VLOW)
+        assert got == expected, k
+
+
+def test_event_style_has_one_timer_per_edge():
+    waves = [BitWaveform([0, 1] * 500)]
+    source = generate_veriloga(waves, ["clk"], ["pwl"], TCLK, VLOW, VHIGH, EDGE, "event")
+    assert len(_TIMER.findall(source)) == 999
+    assert "$abstime" not in source
+
+
+def test_unknown_style_is_rejected():
+    with pytest.raises(ValueError):
+        generate_veriloga([[0, 1]], ["a"], ["pwl"], TCLK, VLOW, VHIGH, EDGE, "table")
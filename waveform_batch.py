@@ -0,0 +1,162 @@
+"""
+Headless batch exporter.
+
+저장된 파형 프로젝트(.json / .wfb, WaveformEditor._save_waveform 형식)를 Tk 없이
+waveform_core.VerilogAGenerator로 일괄 변환한다. 작업은 프로세스 풀에 분산된다.
+--format spectre/spice 이면 Verilog-A 대신 simulator 내장 PWL 전압원 netlist를 쓴다.
+
+    python waveform_batch.py projects/ -o out/ -j 8 --tck 10n --vhigh 1.2
+    python waveform_batch.py projects/ -o out/ --format spectre --pwl-files
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from waveform_cache import FragmentCache
+from waveform_core import VerilogAGenerator
+from waveform_io import BINARY_EXT, read_project
+from waveform_spice import export_pwl
+
+OUTPUT_EXT = {"veriloga": ".va", "spectre": ".scs", "spice": ".sp"}
+
+_caches: Dict[str, FragmentCache] = {}
+
+
+def load_project(path: str) -> Tuple[List[Sequence[int]], List[str], List[str]]:
+    """프로젝트 파일을 읽어 (waveforms, names, modes)를 반환한다."""
+    _, signals = read_project(path)
+    waveforms = [s.load() for s in signals]
+    names = [s.name for s in signals]
+    modes = [s.mode for s in signals]
+    return waveforms, names, modes
+
+
+def _get_cache(cache_dir: Optional[str]) -> Optional[FragmentCache]:
+    """워커 프로세스마다 캐시 디렉터리별 FragmentCache 하나를 유지."""
+    if not cache_dir:
+        return None
+    if cache_dir not in _caches:
+        _caches[cache_dir] = FragmentCache(directory=cache_dir)
+    return _caches[cache_dir]
+
+
+def export_project(path: str, out_dir: Optional[str], params: Dict,
+                   cache_dir: Optional[str] = None) -> Dict:
+    """프로젝트 하나를 변환한다. 워커 프로세스에서 실행되며 결과를 dict로 반환."""
+    t0 = time.perf_counter()
+    fmt = params.get('format', 'veriloga')
+    base = os.path.splitext(os.path.basename(path))[0]
+    out_path = os.path.join(out_dir or os.path.dirname(path), base + OUTPUT_EXT[fmt])
+    result = {"path": path, "out": out_path, "signals": 0, "cycles": 0, "error": None}
+    try:
+        waveforms, names, modes = load_project(path)
+        if fmt == "veriloga":
+            with open(out_path, "w", encoding="utf-8") as f:
+                VerilogAGenerator.write(f, waveforms, names, modes, params, _get_cache(cache_dir))
+        else:
+            export_pwl(out_path, waveforms, names, modes, params, fmt, params.get('pwl_files', False))
+        result["signals"] = len(waveforms)
+        result["cycles"] = len(waveforms[0]) if waveforms else 0
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.perf_counter() - t0
+    return result
+
+
+def collect_inputs(inputs: List[str]) -> List[str]:
+    """파일/디렉터리 인자를 프로젝트 파일 목록으로 펼친다 (디렉터리는 *.json, *.wfb)."""
+    paths = []
+    for p in inputs:
+        if os.path.isdir(p):
+            paths.extend(sorted(os.path.join(p, n) for n in os.listdir(p)
+                                if n.endswith((".json", BINARY_EXT))))
+        else:
+            paths.append(p)
+    return paths
+
+
+def run_batch(paths: List[str], out_dir: Optional[str], params: Dict,
+              jobs: int = 0, verbose: bool = True, cache_dir: Optional[str] = None) -> List[Dict]:
+    """paths를 jobs개의 프로세스로 변환한다. jobs == 1이면 현재 프로세스에서 실행."""
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    results = []
+
+    def report(r):
+        results.append(r)
+        if verbose:
+            status = "ERROR " + r["error"] if r["error"] else f"{r['signals']} sig x {r['cycles']} cyc"
+            print(f"{r['elapsed'] * 1000:9.2f} ms  {r['path']}  ({status})")
+
+    if jobs == 1 or len(paths) <= 1:
+        for p in paths:
+            report(export_project(p, out_dir, params, cache_dir))
+    else:
+        # multiprocessing은 import가 무거워서 실제로 병렬 실행할 때만 불러온다
+        from concurrent.futures import ProcessPoolExecutor
+        # 작은 파일이 많을 때 IPC 비용을 줄이기 위해 chunk 단위로 분배
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for r in pool.map(export_project, paths, [out_dir] * len(paths),
+                              [params] * len(paths), [cache_dir] * len(paths), chunksize=chunksize):
+                report(r)
+
+    total = time.perf_counter() - t0
+    if verbose:
+        ok = [r for r in results if not r["error"]]
+        n_sig = sum(r["signals"] for r in ok)
+        rate = len(ok) / total if total > 0 else float("inf")
+        print(f"\n{len(ok)}/{len(results)} files in {total:.3f} s "
+              f"({rate:.1f} files/s, {n_sig / total if total > 0 else 0:.1f} signals/s, jobs={jobs})")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch export waveform projects to Verilog-A or PWL netlists (headless).")
+    parser.add_argument("inputs", nargs="+", help="project .json/.wfb files or directories")
+    parser.add_argument("-o", "--out-dir", help="output directory (default: next to each input)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: CPU count)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress per-file report")
+    parser.add_argument("--tck", default="10n", help="clock period (GUI 2 cells)")
+    parser.add_argument("--tr", default="10p", help="rising time")
+    parser.add_argument("--tf", default="10p", help="falling time")
+    parser.add_argument("--vhigh", type=float, default=1.2)
+    parser.add_argument("--vlow", type=float, default=0.0)
+    parser.add_argument("--no-share-timers", action="store_true",
+                        help="emit one timer per signal edge instead of one per event time")
+    parser.add_argument("--cache-dir", help="reuse per-signal code fragments stored in this directory")
+    parser.add_argument("--no-min-period", action="store_true",
+                        help="use the full drawn length as the period of repeating signals")
+    parser.add_argument("--format", choices=sorted(OUTPUT_EXT), default="veriloga",
+                        help="veriloga module, or native PWL sources as a spectre/spice netlist")
+    parser.add_argument("--pwl-files", action="store_true",
+                        help="with --format spectre/spice, write PWL points to external files")
+    args = parser.parse_args(argv)
+
+    params = {
+        'tck_str': args.tck,
+        'tr_str': args.tr,
+        'tf_str': args.tf,
+        'vhigh': args.vhigh,
+        'vlow': args.vlow,
+        'share_timers': not args.no_share_timers,
+        'minimize_period': not args.no_min_period,
+        'format': args.format,
+        'pwl_files': args.pwl_files
+    }
+    paths = collect_inputs(args.inputs)
+    if not paths:
+        print("No project files found.", file=sys.stderr)
+        return 1
+    results = run_batch(paths, args.out_dir, params, args.jobs, verbose=not args.quiet,
+                        cache_dir=args.cache_dir)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
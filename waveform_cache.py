@@ -0,0 +1,192 @@
+"""
+Verilog-A export용 신호별 코드 조각 캐시.
+
+키 = 파형 내용 hash + 모드/이름/관련 파라미터. 값 = 신호 하나의 분석 결과
+(반복 단위 길이, 단위 안의 edge 목록 또는 완성된 timer 코드 조각).
+메모리에서는 크기(byte) 기준 LRU로 관리하고, directory를 주면 디스크에도 저장해서
+프로그램을 다시 실행해도 바뀌지 않은 신호는 다시 계산하지 않는다.
+디스크 캐시도 전체 크기를 max_disk_bytes로 제한하고, 넘으면 오래 쓰지 않은 파일부터 지운다.
+디렉터리를 만들 수 없으면(읽기 전용 home 등) 메모리 캐시만 쓴다.
+
+키에는 CACHE_VERSION이 들어가므로 코드 조각 형식(Verilog-A 출력 template)이나 파일 형식을 바꾸면
+CACHE_VERSION을 올려서 이전 조각이 재사용되지 않게 한다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Sequence
+
+from waveform_storage import BitWaveform, EdgeWaveform
+
+# Fragment 내용/형식(출력 template 포함)이 바뀌면 올린다
+CACHE_VERSION = 1
+
+
+class Fragment(NamedTuple):
+    unit_len: int
+    edges: Optional[array]   # 반복 단위 안의 edge (share_timers 출력용)
+    text: Optional[str]      # 신호별 timer 코드 조각 (share_timers=False 출력용)
+
+    @property
+    def nbytes(self) -> int:
+        return 64 + (len(self.edges) * self.edges.itemsize if self.edges is not None else 0) + \
+            (len(self.text) if self.text is not None else 0)
+
+
+def content_key(waveform: Sequence[int], *parts) -> str:
+    """파형 내용과 부가 정보(parts)로 캐시 키를 만든다. 파형은 저장 형식 그대로 hash."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(b"v%d:" % CACHE_VERSION)
+    if isinstance(waveform, BitWaveform):
+        h.update(b"bits")
+        h.update(waveform.tobytes())
+    elif isinstance(waveform, EdgeWaveform):
+        h.update(b"edges")
+        h.update(bytes([waveform[0] if len(waveform) else 0]))
+        h.update(array("Q", waveform.transitions()).tobytes())
+    else:
+        h.update(b"list")
+        h.update(bytes(1 if v else 0 for v in waveform))
+    h.update(repr((len(waveform),) + parts).encode("utf-8"))
+    return h.hexdigest()
+
+
+class FragmentCache:
+    """크기 제한 LRU + (선택) 크기 제한 디스크 캐시."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, directory: Optional[str] = None,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = directory
+        self._entries: "OrderedDict[str, Fragment]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            except OSError:
+                self.directory = None  # 디스크 캐시 없이 메모리 캐시만
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Fragment]:
+        fragment = self._entries.get(key)
+        if fragment is not None:
+            self._entries.move_to_end(key)
+        elif self.directory:
+            fragment = self._load(key)
+            if fragment is not None:
+                self._insert(key, fragment)
+        if fragment is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fragment
+
+    def put(self, key: str, fragment: Fragment) -> None:
+        self._insert(key, fragment)
+        if self.directory:
+            self._store(key, fragment)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _insert(self, key: str, fragment: Fragment) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        if fragment.nbytes > self.max_bytes:
+            return
+        self._entries[key] = fragment
+        self._bytes += fragment.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    # -------------------- 디스크 -------------------- #
+    # 파일 형식: JSON 헤더 한 줄 + edge 배열 bytes (로컬 캐시이므로 native byte order)
+    # 여러 프로세스(batch 워커)가 같은 디렉터리를 쓸 수 있으므로 임시 파일은 프로세스마다 따로 만든다.
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".frag")
+
+    def _disk_files(self):
+        """디스크 캐시 파일 (경로, 크기, 마지막 사용 시각) 목록."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".frag"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue  # 다른 프로세스가 지우는 중
+                    yield entry.path, st.st_size, st.st_mtime
+
+    def _store(self, key: str, fragment: Fragment) -> None:
+        edges = fragment.edges
+        header = {"unit_len": fragment.unit_len, "text": fragment.text,
+                  "typecode": edges.typecode if edges is not None else None}
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=key[:8], dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                if edges is not None:
+                    f.write(edges.tobytes())
+                size = f.tell()
+            try:  # 같은 키를 덮어쓰면 이전 파일 크기는 빼야 _disk_bytes가 실제 합과 맞는다
+                self._disk_bytes -= os.stat(self._path(key)).st_size
+            except OSError:
+                pass
+            os.replace(tmp_path, self._path(key))
+            tmp_path = None
+            self._disk_bytes += size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+        except OSError:
+            pass  # 디스크 캐시는 최선 노력 (쓰기 실패해도 export에는 영향 없음)
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _prune_disk(self) -> None:
+        """오래 쓰지 않은 파일부터 지워 디스크 캐시를 max_disk_bytes의 3/4 이하로 줄인다."""
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 3 // 4
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def _load(self, key: str) -> Optional[Fragment]:
+        try:
+            with open(self._path(key), "rb") as f:
+                header = json.loads(f.readline().decode("utf-8"))
+                edges = None
+                if header["typecode"]:
+                    edges = array(header["typecode"])
+                    edges.frombytes(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(self._path(key))  # 정리할 때 최근에 쓴 파일이 남도록
+        except OSError:
+            pass
+        return Fragment(header["unit_len"], edges, header["text"])
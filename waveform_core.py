@@ -0,0 +1,817 @@
+"""
+파형 편집기의 순수 데이터 core (Tk 없이 사용 가능).
+
+- WaveformConfig   : 설정 값
+- VerilogAGenerator: Verilog-A 코드 생성
+- Signal           : 신호 하나 (__slots__, 이름/모드는 일반 문자열)
+- WaveformModel    : 신호 목록, 편집, Undo/Redo. subscribe()로 변경 알림을 받을 수 있다.
+- Selection        : 신호 집합 x cycle 구간 사각형 선택 (일괄 편집 대상)
+- DragStroke       : 드래그 편집 구간 모으기
+
+GUI(waveform_gen_v0.3.py)는 모델을 구독하는 view 중 하나일 뿐이라서,
+스크립트/batch에서도 같은 모델과 generator를 그대로 쓸 수 있다.
+
+    model = WaveformModel(1000, 2)
+    model.subscribe(lambda event, *args: print(event, args))
+    model.write_range(0, 10, 20, 1)      # -> range (0, 10, 20)
+    model.set_meta(1, name="CLK")        # -> meta (1, 'Signal_2', 'one-shot')
+    model.undo()                         # 편집 메서드 호출 하나가 Undo 단위 하나 (이름 변경만 되돌림)
+
+    with model.edit():                   # 여러 편집을 Undo 단위 하나로 묶기
+        model.write_range(0, 30, 40, 1)
+        model.write_range(1, 30, 40, 1)
+"""
+from typing import Callable, List, NamedTuple, Tuple, Dict, Sequence, Optional, Iterator, TextIO
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain, groupby
+import heapq
+import os
+import re
+from array import array
+from waveform_storage import BitWaveform
+from waveform_edges import EdgeIndex, minimal_period, iter_transitions as find_transitions
+from waveform_cache import Fragment, FragmentCache, content_key
+from waveform_perf import PerfMonitor
+
+# ==========================================
+# 1. Configuration Class (설정 관리)
+# ==========================================
+class WaveformConfig:
+    """애플리케이션의 모든 상수와 설정을 관리하는 클래스"""
+    def __init__(self):
+        self.num_cycles = 64      # 기본 사이클 수
+        self.num_waves = 4        # 기본 파형 개수
+        self.cell_width = 20      # 한 클럭의 픽셀 너비
+        self.row_height = 50      # 파형 한 줄의 높이
+        
+        # UI Colors & Layout
+        self.high_y_offset = 10
+        self.low_y_offset = 40
+        self.grid_color = "#e0e0e0"
+        self.wave_color = "#000000"
+        self.sidebar_width = 340  # 컨트롤 패널 너비
+
+        # 파형 저장 방식: "bits"(bit-packed) | "edges"(edge list, 긴 one-shot 파형용)
+        self.storage = "bits"
+        # 드래그 편집을 모아서 적용하는 주기 (약 1 frame)
+        self.stroke_interval_ms = 16
+        # Verilog-A export 조각 캐시 디렉터리 (None이면 메모리 캐시만 사용)
+        self.export_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "waveform_editor")
+
+    @property
+    def total_width(self):
+        return self.num_cycles * self.cell_width
+
+    @property
+    def total_height(self):
+        return self.num_waves * self.row_height
+
+# ==========================================
+# 2. Logic Class: Verilog-A Generator
+# ==========================================
+class VerilogAGenerator:
+    """
+    GUI와 독립적으로 Verilog-A 코드를 생성하는 로직 클래스.
+    ★ Drift 해결: $abstime 계산 방식을 버리고, @timer 이벤트 기반으로 값을 직접 할당.
+    """
+    
+    @staticmethod
+    def sanitize_name(name: str, default: str = "wave") -> str:
+        s = name.strip()
+        s = re.sub(r"[^A-Za-z0-9_]", "_", s)
+        if not s: s = default
+        if s[0].isdigit(): s = f"w_{s}"
+        return s
+
+    @staticmethod
+    def _signal_events(idx: int, wf: Sequence[int], periodic: bool, unit_len: int, period_expr: Optional[str],
+                       gui_len: int, vhigh: float, vlow: float,
+                       edges: Sequence[int] = None, sink: array = None) -> Iterator[Tuple]:
+        """
+        신호 하나의 timer 이벤트를 시각 순으로 하나씩 생성 (edge를 chunk 단위로 읽으므로 메모리 일정).
+        이벤트 = (시각[tck 단위], 주기 식 또는 None, vsel, 전압, 종류["wrap"|"edge"|"end"])
+        edges가 주어지면(캐시) 파형 대신 그 edge 목록을 쓰고, sink에는 사용한 edge를 모은다.
+        """
+        vsel = f"vsel_{idx}"
+        prev_val = wf[0]
+        if periodic:
+            # (1) Wrap-around 처리 (마지막 값 -> 첫 값 변경 시 0초에 이벤트 필요)
+            # 주기적 신호는 wf[-1]에서 wf[0]으로 넘어갈 때 값이 다르면 0초 타이머가 필요함
+            # (최소 단위의 마지막 cycle은 wf[-1]과 같음)
+            if prev_val != wf[-1]:
+                yield 0, period_expr, vsel, vhigh if prev_val else vlow, "wrap"
+
+        # 2. 변경 포인트 감지 및 @timer 코드 생성
+        # 값이 바뀌는 지점(edge)만 순회 (waveform_edges: chunk 단위 추출)
+        for i in (find_transitions(wf) if edges is None else edges):
+            if i >= unit_len:
+                break
+            if sink is not None:
+                sink.append(i)
+            # 값이 변하는 순간! (주기 신호는 @timer(시작시간, 주기), One-shot은 단발성 타이머)
+            prev_val = 0 if prev_val else 1
+            yield i * 0.5, period_expr, vsel, vhigh if prev_val else vlow, "edge"
+
+        # One-shot: GUI 윈도우가 끝난 후 0(Low)으로 떨어지도록 설정 (옵션)
+        if not periodic and prev_val != 0:  # 마지막이 High 상태로 끝났다면
+            yield gui_len * 0.5, None, vsel, vlow, "end"
+
+    @staticmethod
+    def _event_line(event: Tuple) -> str:
+        """신호별 출력(share_timers=False)의 timer 한 줄. 형식을 바꾸면 waveform_cache.CACHE_VERSION을 올린다."""
+        time_offset, period_expr, vsel, volt, kind = event
+        if kind == "wrap":
+            return f"    @(timer(0, {period_expr})) {vsel} = {volt:.12g};"
+        if kind == "end":
+            return f"    @(timer(({time_offset:.12g} * tck))) {vsel} = {volt:.12g};"
+        if period_expr:
+            return f"    @(timer({time_offset:.12g} * tck, {period_expr})) {vsel} = {volt:.12g};"
+        return f"    @(timer({time_offset:.12g} * tck)) {vsel} = {volt:.12g};"
+
+    @staticmethod
+    def _shared_timer_lines(events: Iterator[Tuple]) -> Iterator[str]:
+        """
+        시각 순으로 merge된 모든 신호의 이벤트를 (시각, 주기)별 timer 블록으로 출력.
+        같은 키의 이벤트는 연속해서 들어오므로 한 블록씩만 들고 있으면 된다.
+        """
+        for (time_offset, period), group in groupby(events, key=lambda e: (e[0], e[1])):
+            assigns = [(e[2], e[3]) for e in group]
+            t_expr = "0" if time_offset == 0 else f"{time_offset:.12g} * tck"
+            timer = f"timer({t_expr}, {period})" if period else f"timer({t_expr})"
+            if len(assigns) == 1:
+                vsel, volt = assigns[0]
+                yield f"    @({timer}) {vsel} = {volt:.12g};"
+                continue
+            yield f"    @({timer}) begin"
+            for vsel, volt in assigns:
+                yield f"        {vsel} = {volt:.12g};"
+            yield "    end"
+
+    @staticmethod
+    def iter_lines(waveforms: Sequence[Sequence[int]],
+                   names: List[str],
+                   modes: List[str],
+                   params: Dict,
+                   cache: Optional[FragmentCache] = None) -> Iterator[str]:
+        """
+        Verilog-A 소스를 한 줄씩 생성한다 (헤더 -> 선언 -> 초기화 블록 -> timer -> transition).
+        전체 문자열을 만들지 않으므로 edge 수가 많아도 메모리가 일정하다.
+        cache를 주면 파형 내용이 같은 신호는 이전 분석 결과/코드 조각을 재사용한다.
+        (신호별 출력에서는 조각 하나가 여러 줄을 담은 문자열로 나올 수 있음)
+        """
+        # waveforms: List[int] 또는 BitWaveform (인덱싱/len/슬라이스만 사용)
+        
+        # share_timers: 같은 시각(과 주기)에 바뀌는 신호들의 할당을 timer 하나로 묶는다
+        share_timers = params.get('share_timers', True)
+        # minimize_period: "반복" 신호를 최소 반복 단위만큼만 timer로 출력 (신호별 주기 파라미터)
+        minimize_period = params.get('minimize_period', True)
+        tck_str = params.get('tck_str', '10n')
+        tr_str = params.get('tr_str', '10p')
+        tf_str = params.get('tf_str', '10p')
+        vhigh = params['vhigh']
+        vlow = params['vlow']
+        
+        sanitized_names = [VerilogAGenerator.sanitize_name(n, f"sig_{i}") for i, n in enumerate(names)]
+        
+        # 주기적 신호가 있는지 확인하고, 있다면 GUI 길이를 가져옴
+        has_periodic = any(m == "반복" for m in modes)
+        gui_len = len(waveforms[0]) if waveforms else 0
+        
+        yield from [
+            '// Auto-generated by Python Waveform Editor (Event-Driven Version)',
+            '`include "discipline.h"',
+            '`include "constants.h"',
+            '',
+            f'module pwl_waves({", ".join(sanitized_names)});',
+            f'    output {", ".join(sanitized_names)};',
+            f'    electrical {", ".join(sanitized_names)};',
+            '',
+            '    // User Parameters',
+            f'    parameter real tck = {tck_str};  // Clock Period (1 Cycle)',
+            f'    parameter real tr  = {tr_str};   // Rising Time',
+            f'    parameter real tf  = {tf_str};   // Falling Time',
+            f'    parameter real vlow = {vlow};',
+            f'    parameter real vhigh = {vhigh};',
+            ''
+            '    // Repetition Parameters (auto-generated for periodic signals)',
+        ]
+
+        # 주기적 신호가 있을 경우, 단일 period_factor 파라미터를 추가
+        if has_periodic and gui_len > 0:
+            period_factor_value = gui_len * 0.5
+            yield f"    parameter real period_factor = {period_factor_value:.12g}; // Period factor for all periodic signals"
+            yield '' # 가독성을 위한 공백
+
+        # 분석 단계: 신호별 반복 단위와 주기 식 (파라미터 선언이 timer보다 앞에 나와야 함)
+        plans = []
+        period_params = []
+        keys: List[Optional[str]] = [None] * len(waveforms)
+        fragments: List[Optional[Fragment]] = [None] * len(waveforms)
+        for idx, wf in enumerate(waveforms):
+            if cache is not None:
+                # 묶음 출력은 edge 목록만 캐시하므로 이름/번호/전압이 바뀌어도 재사용 가능
+                key_parts = (modes[idx], minimize_period, share_timers)
+                if not share_timers:
+                    key_parts += (sanitized_names[idx], idx, vhigh, vlow)
+                keys[idx] = content_key(wf, *key_parts)
+                fragments[idx] = cache.get(keys[idx])
+            if modes[idx] != "반복":
+                plans.append((False, gui_len, None))
+                continue
+            period_expr = "(period_factor * tck)"
+            if fragments[idx] is not None:
+                unit_len = fragments[idx].unit_len
+            else:
+                unit_len = minimal_period(wf) if minimize_period else gui_len
+            if 1 < unit_len < gui_len:
+                # 짧은 단위가 반복되는 파형: 한 단위의 edge만 출력하고 주기를 줄임
+                param = f"period_factor_{idx}"
+                period_params.append(f"    parameter real {param} = {unit_len * 0.5:.12g}; "
+                                     f"// {sanitized_names[idx]}: repeating unit of {unit_len}/{gui_len} cells")
+                period_expr = f"({param} * tck)"
+            else:
+                unit_len = gui_len
+            plans.append((True, unit_len, period_expr))
+
+        if period_params:
+            yield from period_params
+            yield ''
+
+        real_vars = sorted(f"vsel_{idx}" for idx in range(len(waveforms)))
+        if real_vars: yield f"    real {', '.join(real_vars)};"
+        
+        # 정수는 더 이상 필요 없음 (n_0, n_1 등 삭제)
+            
+        yield "\n    analog begin"
+        
+        # 1. 초기 상태 설정 (@initial_step): 파형의 0번째 값을 초기값으로 설정
+        if waveforms:
+            yield "        @(initial_step) begin"
+            for idx, wf in enumerate(waveforms):
+                init_val = vhigh if wf and wf[0] else vlow
+                yield f"        vsel_{idx} = {init_val:.12g};"
+            yield "        end\n"
+
+        def events(idx):
+            periodic, unit_len, period_expr = plans[idx]
+            fragment = fragments[idx]
+            edges = fragment.edges if fragment is not None else None
+            sink = array("I" if gui_len < 1 << 32 else "Q") if cache is not None and fragment is None else None
+            yield from VerilogAGenerator._signal_events(idx, waveforms[idx], periodic, unit_len, period_expr,
+                                                        gui_len, vhigh, vlow, edges, sink)
+            if sink is not None and share_timers:
+                cache.put(keys[idx], Fragment(unit_len, sink, None))
+
+        if share_timers:
+            # 신호별 이벤트 스트림을 (시각, 주기 없는 timer 먼저) 순으로 merge
+            merged = heapq.merge(*(events(idx) for idx in range(len(waveforms))),
+                                 key=lambda e: (e[0], e[1] or ""))
+            first = next(merged, None)
+            if first is not None:
+                yield "    // Shared timer events (signals switching at the same time)"
+                yield from VerilogAGenerator._shared_timer_lines(chain([first], merged))
+                yield ""
+        else:
+            for idx in range(len(waveforms)):
+                fragment = fragments[idx]
+                if fragment is not None:
+                    yield fragment.text
+                    continue
+                signal_lines = [f"    // Logic for {sanitized_names[idx]} ({modes[idx]}) - Event Driven"]
+                signal_lines.extend(VerilogAGenerator._event_line(event) for event in events(idx))
+                signal_lines.append("")
+                if cache is None:
+                    yield from signal_lines
+                else:
+                    text = "\n".join(signal_lines)
+                    cache.put(keys[idx], Fragment(plans[idx][1], None, text))
+                    yield text
+
+        for idx, name in enumerate(sanitized_names[:len(waveforms)]):
+            yield f"    V({name}) <+ transition(vsel_{idx}, 0, tr, tf);"
+        yield "    end"
+        yield "endmodule"
+
+    @staticmethod
+    def write(fp: TextIO,
+              waveforms: Sequence[Sequence[int]],
+              names: List[str],
+              modes: List[str],
+              params: Dict,
+              cache: Optional[FragmentCache] = None) -> None:
+        """열린 텍스트 파일(fp)에 소스를 줄 단위로 바로 쓴다 (generate()와 같은 내용)."""
+        lines = VerilogAGenerator.iter_lines(waveforms, names, modes, params, cache)
+        fp.write(next(lines))
+        for line in lines:
+            fp.write("\n")
+            fp.write(line)
+
+    @staticmethod
+    def generate(waveforms: Sequence[Sequence[int]], 
+                 names: List[str], 
+                 modes: List[str], 
+                 params: Dict,
+                 cache: Optional[FragmentCache] = None) -> str:
+        """전체 소스를 문자열로 반환 (큰 파형은 write()로 파일에 바로 쓰는 편이 메모리에 유리)."""
+        return "\n".join(VerilogAGenerator.iter_lines(waveforms, names, modes, params, cache))
+
+# ==========================================
+# 3. Data Model (신호, Undo/Redo 기록, 모델)
+# ==========================================
+class Signal:
+    """
+    하나의 파형에 대한 모든 데이터를 캡슐화하는 클래스.
+    이름/모드는 일반 문자열이다. 변경 알림이 필요하면 WaveformModel.set_meta()를 거친다.
+    """
+    __slots__ = ("name", "mode", "storage", "_loader", "_edge_index", "_waveform")
+
+    def __init__(self, name: str, mode: str, waveform: List[int], storage: type = BitWaveform):
+        self.name = name
+        self.mode = mode
+        self.storage = storage
+        self._loader = None
+        self._edge_index: Optional[EdgeIndex] = None
+        self.waveform = waveform
+
+    @property
+    def waveform(self) -> BitWaveform:
+        if self._loader is not None:
+            # 지연 로딩된 신호: 처음 접근할 때 decode
+            loader, self._loader = self._loader, None
+            self.waveform = loader()
+        return self._waveform
+
+    @waveform.setter
+    def waveform(self, values):
+        # 리스트로 대입해도 항상 지정된 저장소(BitWaveform/EdgeWaveform)로 보관
+        self._loader = None
+        self._edge_index = None
+        self._waveform = values if type(values) is self.storage else self.storage(values)
+
+    @property
+    def edge_index(self) -> EdgeIndex:
+        """pulse/edge 색인. 처음 접근할 때 만들고, 이후에는 모델의 편집마다 바뀐 구간만 갱신된다."""
+        wf = self.waveform
+        if self._edge_index is None or self._edge_index.length != len(wf):
+            # 길이 변경(resize)은 모델 편집을 거치지 않으므로 다시 만든다
+            self._edge_index = EdgeIndex(wf)
+        return self._edge_index
+
+    def changed(self, start: int, end: int):
+        """파형 [start, end) 구간이 제자리에서 바뀌었음을 알린다 (색인이 있을 때만 갱신)."""
+        if self._edge_index is not None:
+            self._edge_index.update(self._waveform, start, end)
+
+    def set_lazy(self, loader):
+        """파형을 처음 접근할 때 loader()로 불러오도록 설정 (큰 프로젝트 열기용)."""
+        self._loader = loader
+        self._edge_index = None
+        self._waveform = None
+
+    def get_data_dict(self) -> Dict:
+        """저장/내보내기를 위한 순수 데이터 딕셔너리 반환"""
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "waveform": self.waveform.tolist() # 참조가 아닌 리스트 복사본을 반환
+        }
+
+    def get_state(self) -> Dict:
+        """Undo 스냅샷용 딕셔너리 (파형은 bit-packed 복사본)"""
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "waveform": self.waveform.copy()
+        }
+
+class Selection(NamedTuple):
+    """신호 집합 x cycle 구간 [start, end)의 사각형 선택. rows는 연속이 아니어도 된다."""
+    rows: Tuple[int, ...]
+    start: int
+    end: int
+
+    @classmethod
+    def from_corners(cls, row_a: int, cycle_a: int, row_b: int, cycle_b: int) -> "Selection":
+        """드래그 시작/끝 셀(양 끝 포함)로 만든 연속 사각형."""
+        r0, r1 = sorted((row_a, row_b))
+        c0, c1 = sorted((cycle_a, cycle_b))
+        return cls(tuple(range(r0, r1 + 1)), c0, c1 + 1)
+
+    @property
+    def length(self) -> int:
+        return max(0, self.end - self.start)
+
+
+def _filled(storage: type, length: int, value: int):
+    wf = storage.zeros(length)
+    return wf.inverted() if value else wf
+
+
+def _shifted(seg, amount: int, wrap: bool):
+    """seg를 amount cycle만큼 민 새 구간 (양수: 뒤로/오른쪽). wrap이면 회전, 아니면 빈 자리는 0."""
+    n = len(seg)
+    if wrap:
+        k = amount % n if n else 0
+        return seg[n - k:] + seg[:n - k]
+    if abs(amount) >= n:
+        return type(seg).zeros(n)
+    if amount >= 0:
+        return type(seg).zeros(amount) + seg[:n - amount]
+    return seg[-amount:] + type(seg).zeros(-amount)
+
+
+def _tiled(pattern, length: int):
+    """pattern을 반복해서 length cycle을 채운 구간."""
+    return (pattern * -(-length // len(pattern)))[:length]
+
+
+class EditRecord:
+    """
+    Undo/Redo 기록 한 건 (사용자 동작 하나).
+    각 op는 '저장된 값과 현재 값을 맞바꾸는' 형태라서 같은 op 목록으로
+    Undo(역순 적용)와 Redo(정순 적용)를 모두 처리한다. 비용은 바뀐 구간 크기에 비례.
+      ["range", row, start, data]  : 파형 [start, start+len(data)) 구간
+      ["meta", row, name, mode]    : 신호 이름/모드
+      ["move", a, b]               : 두 신호 위치 교환
+      ["state", state]             : 전체 스냅샷 (그리드 크기 변경 등 구조 변경용)
+    """
+    __slots__ = ("ops", "active", "nbytes")
+
+    OP_OVERHEAD = 64  # op 하나의 대략적인 고정 메모리 (byte)
+
+    def __init__(self, active: int):
+        self.ops: List[list] = []
+        self.active = active
+        self.nbytes = 0
+
+    @property
+    def structural(self) -> bool:
+        """신호 구성이 바뀌는 기록인지 (컨트롤 패널 재구성 필요)."""
+        return any(op[0] in ("move", "state") for op in self.ops)
+
+    def dirty_ranges(self) -> List[Tuple[int, int, int]]:
+        """다시 그려야 할 (row, start, end) 목록."""
+        return [(op[1], op[2], op[2] + len(op[3])) for op in self.ops if op[0] == "range"]
+
+
+class WaveformModel:
+    """
+    애플리케이션의 데이터 모델과 비즈니스 로직을 관리.
+    변경은 subscribe()로 등록한 observer에게 callback(event, *args)로 알린다.
+      ("range", row, start, end)    : 파형 [start, end) 구간이 바뀜
+      ("meta", row, old_name, old_mode) : 신호 이름/모드가 바뀜
+      ("structure",)                : 신호 추가/삭제/이동, 길이 변경, 전체 상태 복원
+    """
+    def __init__(self, num_cycles: int, num_waves: int, storage: type = BitWaveform):
+        self.num_cycles = num_cycles
+        self.storage = storage # 파형 저장소 클래스
+        self.signals: List[Signal] = []
+        self.clipboard: Dict = None
+        self.range_clipboard: Optional[List] = None  # copy_selection()의 행별 구간
+        self.active_wave_idx = 0
+
+        # Undo/Redo 기록 (바뀐 구간만 저장, 전체 크기로 제한)
+        self.undo_stack: deque = deque()
+        self.redo_stack: deque = deque()
+        self.history_max_bytes = 64 * 1024 * 1024
+        self._history_bytes = 0
+        self._open_record: Optional[EditRecord] = None
+        self._edit_depth = 0  # begin_edit() 중첩 깊이
+        self.perf = PerfMonitor()  # 편집기가 자신의 계측기로 바꿔 끼운다
+        self._observers: List[Callable] = []
+        
+        for i in range(num_waves):
+            self.add_signal(f"Signal_{i+1}")
+
+    @property
+    def num_waves(self) -> int:
+        return len(self.signals)
+
+    # -------------------- 변경 알림 (observer) -------------------- #
+
+    def subscribe(self, callback: Callable) -> Callable:
+        """callback(event, *args)를 변경 알림 대상으로 등록하고 그대로 반환."""
+        self._observers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def _notify(self, event: str, *args):
+        for callback in tuple(self._observers):
+            callback(event, *args)
+
+    # -------------------- 신호 구성 -------------------- #
+
+    def add_signal(self, name: str, mode: str = "one-shot", waveform: List[int] = None):
+        if waveform is None:
+            waveform = self.storage.zeros(self.num_cycles)
+        self.signals.append(Signal(name, mode, waveform, self.storage))
+        self._notify("structure")
+
+    def set_meta(self, row: int, name: Optional[str] = None, mode: Optional[str] = None,
+                 record: bool = True):
+        """신호 이름/모드를 바꾼다 (None은 그대로). record=False면 Undo 기록 없이 바꾼다 (입력창 타이핑 등)."""
+        sig = self.signals[row]
+        old_name, old_mode = sig.name, sig.mode
+        name = old_name if name is None else name
+        mode = old_mode if mode is None else mode
+        if (name, mode) == (old_name, old_mode):
+            return
+        if record:
+            with self.edit():
+                self._record(["meta", row, old_name, old_mode], 0)
+        sig.name, sig.mode = name, mode
+        self._notify("meta", row, old_name, old_mode)
+
+    def reconfigure(self, num_cycles: int, num_waves: int):
+        """그리드 크기 변경: 신호 수를 맞추고(새 신호는 0) 모든 파형 길이를 num_cycles로 바꾼다."""
+        for i in range(self.num_waves, num_waves):
+            self.signals.append(Signal(f"Signal_{i+1}", "one-shot",
+                                       self.storage.zeros(self.num_cycles), self.storage))
+        del self.signals[num_waves:]
+        with self.perf.stage("mutation"):
+            for sig in self.signals:
+                sig.waveform.resize(num_cycles)
+            self.num_cycles = num_cycles
+        self._notify("structure")
+
+    def _get_state(self) -> Dict:
+        """현재 모델의 상태를 딕셔너리로 반환 (깊은 복사)"""
+        return {
+            "num_cycles": self.num_cycles,
+            "signals": [s.get_state() for s in self.signals]
+        }
+
+    def _set_state(self, state: Dict):
+        """주어진 상태로 모델을 복원"""
+        self.num_cycles = state["num_cycles"]
+        self.signals = [
+            Signal(s['name'], s['mode'], s['waveform'], self.storage) for s in state['signals']
+        ]
+        # 활성화 인덱스가 범위를 벗어나지 않도록 조정
+        if self.active_wave_idx >= self.num_waves:
+            self.active_wave_idx = self.num_waves - 1
+        self._notify("structure")
+
+    def set_storage(self, storage: type):
+        """모든 신호의 파형 저장소를 변환합니다."""
+        self.storage = storage
+        for sig in self.signals:
+            sig.storage = storage
+            sig.waveform = sig.waveform
+        self._notify("structure")
+
+    # -------------------- Undo/Redo (delta 기록) -------------------- #
+
+    def begin_edit(self):
+        """
+        Undo 단위를 연다. 짝이 되는 end_edit()까지의 write_range/move_wave 등은 하나의 기록으로 묶인다.
+        중첩할 수 있고, 바깥쪽 end_edit()에서 닫힌다. 열려 있지 않으면 편집 메서드마다 기록 하나.
+        """
+        if self._edit_depth == 0:
+            self._open_record = EditRecord(self.active_wave_idx)
+        self._edit_depth += 1
+
+    def end_edit(self):
+        """begin_edit()로 연 Undo 단위를 닫는다 (Undo/Redo로 이미 닫혔으면 아무 일도 안 함)."""
+        if self._edit_depth == 0:
+            return
+        self._edit_depth -= 1
+        if self._edit_depth == 0:
+            self._open_record = None
+
+    @contextmanager
+    def edit(self):
+        """with 블록 안의 편집을 Undo 단위 하나로 묶는다 (begin_edit/end_edit 짝)."""
+        self.begin_edit()
+        try:
+            yield self
+        finally:
+            self.end_edit()
+
+    def _record(self, op: list, nbytes: int):
+        """열려 있는 Undo 단위에 op를 추가 (편집 메서드는 항상 edit() 안에서 호출)."""
+        record = self._open_record
+        if not record.ops:
+            # 첫 변경이 생길 때 기록을 올리고, Redo 기록은 버린다
+            self.undo_stack.append(record)
+            self._history_bytes -= sum(r.nbytes for r in self.redo_stack)
+            self.redo_stack.clear()
+        nbytes += EditRecord.OP_OVERHEAD
+        record.ops.append(op)
+        record.nbytes += nbytes
+        self._history_bytes += nbytes
+        # 메모리 한도를 넘으면 가장 오래된 기록부터 버림 (진행 중인 기록은 유지)
+        while self._history_bytes > self.history_max_bytes and len(self.undo_stack) > 1:
+            self._history_bytes -= self.undo_stack.popleft().nbytes
+
+    def save_state_for_undo(self):
+        """전체 스냅샷을 Undo 기록으로 남긴다. 그리드 크기 변경처럼 구조가 바뀔 때만 사용."""
+        with self.perf.stage("undo"), self.edit():
+            state = self._get_state()
+            self._record(["state", state], sum(s["waveform"].nbytes for s in state["signals"]))
+
+    def write_range(self, row: int, start: int, end: int, value: int):
+        """파형 [start, end) 구간을 value로 채우고, 이전 값을 Undo 기록에 남긴다."""
+        wf = self.signals[row].waveform
+        start, end = max(0, start), min(len(wf), end)
+        if start >= end:
+            return
+        with self.perf.stage("undo"), self.edit():
+            old = wf[start:end]
+            self._record(["range", row, start, old], old.nbytes)
+        wf.fill(start, end, value)
+        self.signals[row].changed(start, end)
+        self._notify("range", row, start, end)
+
+    def _swap(self, op: list):
+        """op에 저장된 값과 현재 값을 맞바꾼다."""
+        kind = op[0]
+        if kind == "range":
+            _, row, start, data = op
+            sig = self.signals[row]
+            wf = sig.waveform
+            end = start + len(data)
+            op[3] = wf[start:end]
+            wf[start:end] = data
+            sig.changed(start, end)
+            self._notify("range", row, start, end)
+        elif kind == "meta":
+            sig = self.signals[op[1]]
+            name, mode = sig.name, sig.mode
+            sig.name, sig.mode = op[2], op[3]
+            op[2], op[3] = name, mode
+            self._notify("meta", op[1], name, mode)
+        elif kind == "move":
+            a, b = op[1], op[2]
+            self.signals[a], self.signals[b] = self.signals[b], self.signals[a]
+            self._notify("structure")
+        elif kind == "state":
+            current = self._get_state()
+            self._set_state(op[1])
+            op[1] = current
+
+    def _close_edit(self):
+        """열려 있는 Undo 단위를 모두 닫는다 (Undo/Redo 뒤의 편집은 새 기록)."""
+        self._open_record = None
+        self._edit_depth = 0
+
+    def undo(self) -> Optional[EditRecord]:
+        """마지막 기록을 되돌리고 그 기록을 반환 (없으면 None)."""
+        if not self.undo_stack: return None
+        self._close_edit()
+        record = self.undo_stack.pop()
+        for op in reversed(record.ops):
+            self._swap(op)
+        self.redo_stack.append(record)
+        self.active_wave_idx = min(record.active, self.num_waves - 1)
+        return record
+
+    def redo(self) -> Optional[EditRecord]:
+        if not self.redo_stack: return None
+        self._close_edit()
+        record = self.redo_stack.pop()
+        for op in record.ops:
+            self._swap(op)
+        self.undo_stack.append(record)
+        self.active_wave_idx = min(record.active, self.num_waves - 1)
+        return record
+
+    def move_wave(self, idx: int, direction: str):
+        target_idx = -1
+        if direction == 'up' and idx > 0:
+            target_idx = idx - 1
+        elif direction == 'down' and idx < self.num_waves - 1:
+            target_idx = idx + 1
+        
+        if target_idx != -1:
+            with self.edit():
+                self._record(["move", idx, target_idx], 0)
+            self.signals[idx], self.signals[target_idx] = self.signals[target_idx], self.signals[idx]
+            # 활성화 인덱스도 함께 조정
+            if self.active_wave_idx == idx:
+                self.active_wave_idx = target_idx
+            elif self.active_wave_idx == target_idx:
+                self.active_wave_idx = idx
+            self._notify("structure")
+
+    def copy_active_wave(self):
+        if 0 <= self.active_wave_idx < self.num_waves:
+            self.clipboard = self.signals[self.active_wave_idx].get_data_dict()
+
+    def paste_to_active_wave(self) -> bool:
+        if not self.clipboard: return False
+        active_sig = self.signals[self.active_wave_idx]
+        with self.edit():
+            # 이름(CLK 자동 생성 observer)을 먼저, 파형을 나중에 기록해야 Undo 순서가 맞다
+            self.set_meta(self.active_wave_idx, self.clipboard["name"], self.clipboard["mode"])
+            pasted_wave = self.storage(self.clipboard["waveform"])
+            pasted_wave.resize(self.num_cycles)
+            old = active_sig.waveform
+            self._record(["range", self.active_wave_idx, 0, old], old.nbytes)
+            active_sig.waveform = pasted_wave
+        self._notify("range", self.active_wave_idx, 0, self.num_cycles)
+        return True
+
+    # -------------------- 사각형 선택 일괄 편집 -------------------- #
+
+    def rewrite_selection(self, sel: Selection, transform: Callable) -> int:
+        """
+        선택된 각 행의 [start, end) 구간을 transform(row, segment)가 돌려준 같은 길이의 구간으로 바꾼다.
+        행마다 slice 읽기/쓰기 한 번(packed 정수 / edge 리스트 연산)이고, 전체가 Undo 기록 하나가 된다.
+        :return: 바뀐 행 수
+        """
+        rows = sorted({r for r in sel.rows if 0 <= r < self.num_waves})
+        start, end = max(0, sel.start), min(self.num_cycles, sel.end)
+        if not rows or start >= end:
+            return 0
+        with self.edit():
+            for row in rows:
+                sig = self.signals[row]
+                wf = sig.waveform
+                old = wf[start:end]
+                new = transform(row, old)
+                if type(new) is not type(wf):
+                    new = type(wf)(new)
+                with self.perf.stage("undo"):
+                    self._record(["range", row, start, old], old.nbytes)
+                wf[start:end] = new
+                sig.changed(start, end)
+                self._notify("range", row, start, end)
+        return len(rows)
+
+    def fill_selection(self, sel: Selection, value: int) -> int:
+        return self.rewrite_selection(sel, lambda row, seg: _filled(type(seg), len(seg), value))
+
+    def invert_selection(self, sel: Selection) -> int:
+        return self.rewrite_selection(sel, lambda row, seg: seg.inverted())
+
+    def shift_selection(self, sel: Selection, amount: int, wrap: bool = False) -> int:
+        """선택 구간 안에서 amount cycle 민다 (양수: 오른쪽). wrap=False면 밀려 들어온 자리는 0."""
+        return self.rewrite_selection(sel, lambda row, seg: _shifted(seg, amount, wrap))
+
+    def tile_selection(self, sel: Selection, period: int) -> int:
+        """각 행에서 선택 구간 앞쪽 period cycle을 구간 끝까지 반복한다."""
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        return self.rewrite_selection(sel, lambda row, seg: _tiled(seg[:period], len(seg)))
+
+    def copy_selection(self, sel: Selection) -> int:
+        """선택 구간을 행 순서대로 range_clipboard에 복사 (Undo 기록 없음)."""
+        rows = sorted({r for r in sel.rows if 0 <= r < self.num_waves})
+        start, end = max(0, sel.start), min(self.num_cycles, sel.end)
+        if not rows or start >= end:
+            return 0
+        self.range_clipboard = [self.signals[r].waveform[start:end] for r in rows]
+        return len(rows)
+
+    def paste_selection(self, sel: Selection) -> int:
+        """
+        range_clipboard를 선택 사각형에 붙여넣는다.
+        복사한 행 수/길이가 선택과 다르면 행은 순환, cycle은 반복/잘라서 맞춘다.
+        """
+        clip = self.range_clipboard
+        if not clip:
+            return 0
+        order = {r: k for k, r in enumerate(sorted(set(sel.rows)))}
+        return self.rewrite_selection(sel, lambda row, seg: _tiled(clip[order[row] % len(clip)], len(seg)))
+
+
+class DragStroke:
+    """
+    드래그 한 번(버튼 누름 ~ 뗌) 동안의 편집 구간을 모은다.
+    motion 이벤트 사이에 건너뛴 셀은 보간해서 채우고, 행별로 겹치거나 맞닿은 [start, end) 구간만 합쳐 둔다
+    (행을 벗어났다 돌아와도 그 사이의 셀은 칠하지 않는다).
+    """
+    def __init__(self, row: int, cell: int, value: int):
+        self.value = value
+        self.row = row
+        self.cell = cell
+        self.spans: Dict[int, List[Tuple[int, int]]] = {row: [(cell, cell + 1)]}
+
+    def add(self, row: int, cell: int):
+        """새 위치까지 이어서 칠한다. 같은 행이면 직전 위치부터 보간."""
+        if row == self.row:
+            lo, hi = min(self.cell, cell), max(self.cell, cell) + 1
+        else:
+            lo, hi = cell, cell + 1
+        spans = self.spans.setdefault(row, [])
+        # 정렬된 서로소 구간 목록에서 [lo, hi)와 겹치거나 맞닿은 구간 [i, j)를 하나로 합친다
+        i = bisect_left(spans, (lo,))
+        if i > 0 and spans[i - 1][1] >= lo:
+            i -= 1
+        j = i
+        while j < len(spans) and spans[j][0] <= hi:
+            lo, hi = min(lo, spans[j][0]), max(hi, spans[j][1])
+            j += 1
+        spans[i:j] = [(lo, hi)]
+        self.row, self.cell = row, cell
+
+    def take(self) -> Dict[int, List[Tuple[int, int]]]:
+        """모아 둔 행별 구간 목록을 꺼내고 비운다."""
+        spans, self.spans = self.spans, {}
+        return spans
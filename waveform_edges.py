@@ -0,0 +1,324 @@
+"""
+파형 edge / pulse 추출 (Vectorized edge & pulse detection).
+
+cycle 단위 Python 루프 대신 NumPy diff/flatnonzero로 한 번에 계산한다.
+NumPy가 없으면 bytes 정규식(C 루프) 기반 구현으로 동작한다.
+NumPy는 import 비용(~0.1 s)이 커서, 이미 import되어 있지 않으면 fallback으로 처리한 cell 수가
+그 비용만큼 쌓인 뒤에 불러온다. 짧은 스크립트는 NumPy를 아예 불러오지 않고,
+긴 작업도 처음부터 NumPy를 쓴 경우의 두 배 이상은 들지 않는다.
+
+- rising  : wf[i-1] == 0, wf[i] == 1 인 i (i >= 1)
+- falling : wf[i-1] == 1, wf[i] == 0 인 i (i >= 1)
+- pulses  : High 구간 (start, width). 파형 양 끝은 Low로 간주
+
+EdgeIndex는 편집될 때마다 바뀐 구간 근처만 다시 계산해서 pulse/edge 목록을 유지한다.
+"""
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from waveform_storage import BitWaveform, EdgeWaveform
+
+np = None  # _numpy()가 import를 결정하면 채워진다
+_numpy_checked = False
+NUMPY_IMPORT_CELLS = 1 << 20  # fallback으로 이만큼 처리하는 시간 ~= NumPy import 시간
+_fallback_cells = 0
+
+
+def _numpy(n: int = 0):
+    """
+    NumPy 모듈, 또는 아직 쓰지 않을 때/없을 때 None.
+    :param n: 이번에 처리할 cell 수 (None을 받으면 호출한 쪽이 fallback으로 처리한다)
+    """
+    global np, _numpy_checked, _fallback_cells
+    if not _numpy_checked:
+        _fallback_cells += n
+        if _fallback_cells < NUMPY_IMPORT_CELLS and "numpy" not in sys.modules:
+            return None
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # NumPy는 선택 사항
+            pass
+    return np
+
+
+class Edges(NamedTuple):
+    rising: List[int]
+    falling: List[int]
+    pulses: List[Tuple[int, int]]
+
+
+_RISE = re.compile(b"\x00\x01")
+_FALL = re.compile(b"\x01\x00")
+_HIGH_RUN = re.compile(b"\x01+")
+
+
+def _as_array(waveform):
+    """1-D 파형을 int8 배열로 변환. BitWaveform은 packed bytes를 바로 unpack."""
+    if isinstance(waveform, BitWaveform):
+        bits = np.frombuffer(waveform.tobytes(), dtype=np.uint8)
+        return np.unpackbits(bits, bitorder="little")[:len(waveform)].view(np.int8)
+    if isinstance(waveform, np.ndarray):
+        return (waveform != 0).view(np.int8)
+    try:
+        # 0/1 int 리스트는 bytes 변환이 np.asarray보다 훨씬 빠름
+        return np.frombuffer(bytes(waveform), dtype=np.int8)
+    except (TypeError, ValueError):
+        return (np.asarray(waveform) != 0).view(np.int8)
+
+
+def _as_bytes(waveform) -> bytes:
+    """0/1 시퀀스를 cycle당 1 byte로 변환 (정규식 fallback용)."""
+    if isinstance(waveform, BitWaveform):
+        waveform = waveform.tolist()
+    return bytes(waveform)
+
+
+def _edges_from_transitions(waveform: EdgeWaveform) -> Edges:
+    """EdgeWaveform은 edge를 이미 갖고 있으므로 배열 변환 없이 계산."""
+    edges = waveform.transitions()
+    first = waveform[0] if len(waveform) else 0
+    # 짝수 번째 edge는 초기값의 반대 방향
+    if first:
+        rising, falling = edges[1::2], edges[0::2]
+    else:
+        rising, falling = edges[0::2], edges[1::2]
+    last = first ^ (len(edges) & 1)
+    starts = ([0] if first else []) + rising
+    ends = falling + ([len(waveform)] if last else [])
+    return Edges(rising, falling, [(s, e - s) for s, e in zip(starts, ends)])
+
+
+def _edges_1d(waveform) -> Edges:
+    if isinstance(waveform, EdgeWaveform):
+        return _edges_from_transitions(waveform)
+    if _numpy(len(waveform)) is not None:
+        a = _as_array(waveform)
+        # 양 끝을 Low로 padding한 diff 한 번으로 edge와 pulse를 함께 구한다
+        padded = np.diff(a, prepend=0, append=0)
+        starts = np.flatnonzero(padded == 1)
+        ends = np.flatnonzero(padded == -1)
+        rising = starts[1:] if len(starts) and starts[0] == 0 else starts
+        falling = ends[:-1] if len(ends) and ends[-1] == len(a) else ends
+        return Edges(rising.tolist(), falling.tolist(),
+                     list(zip(starts.tolist(), (ends - starts).tolist())))
+    data = _as_bytes(waveform)
+    rising = [m.start() + 1 for m in _RISE.finditer(data)]
+    falling = [m.start() + 1 for m in _FALL.finditer(data)]
+    pulses = [(m.start(), m.end() - m.start()) for m in _HIGH_RUN.finditer(data)]
+    return Edges(rising, falling, pulses)
+
+
+def _edges_2d(array) -> List[Edges]:
+    """같은 길이의 파형 묶음(2-D)을 한 번의 diff로 처리."""
+    a = (np.asarray(array) != 0).view(np.int8)
+    k = a.shape[0]
+    padded = np.diff(a, axis=1, prepend=0, append=0)
+    inner = padded[:, 1:-1]
+
+    def split(mask, offset=0):
+        rows, cols = np.nonzero(mask)
+        bounds = np.searchsorted(rows, np.arange(k + 1))
+        cols = cols + offset
+        return [cols[bounds[r]:bounds[r + 1]] for r in range(k)]
+
+    rising = split(inner == 1, 1)
+    falling = split(inner == -1, 1)
+    starts = split(padded == 1)
+    ends = split(padded == -1)
+    return [Edges(rising[r].tolist(), falling[r].tolist(),
+                  list(zip(starts[r].tolist(), (ends[r] - starts[r]).tolist())))
+            for r in range(k)]
+
+
+def _is_batch(data) -> bool:
+    if _numpy() is not None and isinstance(data, np.ndarray):
+        return data.ndim == 2
+    if isinstance(data, (BitWaveform, EdgeWaveform)) or not len(data):
+        return False
+    return not isinstance(data[0], (int, bool)) and not (np is not None and isinstance(data[0], np.integer))
+
+
+def detect_edges(data) -> Union[Edges, List[Edges]]:
+    """
+    파형 하나(1-D) 또는 파형 묶음(2-D)의 rising/falling edge와 pulse를 한 번에 추출.
+    :param data: 0/1 시퀀스, BitWaveform, EdgeWaveform, 또는 그 리스트 / 2-D 배열
+    :return: Edges 또는 List[Edges]
+    """
+    if not _is_batch(data):
+        return _edges_1d(data)
+    if np is not None and (isinstance(data, np.ndarray) or
+                           all(isinstance(w, (list, tuple)) and len(w) == len(data[0]) for w in data)):
+        return _edges_2d(data)
+    return [_edges_1d(w) for w in data]
+
+
+def find_pulses(waveform: Sequence[int]) -> List[Tuple[int, int]]:
+    """High 구간의 (start_index, width) 목록."""
+    return _edges_1d(waveform).pulses
+
+
+def transitions(waveform: Sequence[int]) -> List[int]:
+    """값이 바뀌는 cycle 인덱스 목록 (rising/falling 합, 오름차순)."""
+    if isinstance(waveform, EdgeWaveform):
+        return waveform.transitions()
+    if _numpy(len(waveform)) is not None:
+        return (np.flatnonzero(np.diff(_as_array(waveform))) + 1).tolist()
+    if isinstance(waveform, BitWaveform):
+        return waveform.transitions()
+    e = _edges_1d(waveform)
+    return sorted(e.rising + e.falling)
+
+
+def _cyclic_period(seq: List[int]) -> int:
+    """
+    순환 수열 seq를 타일링하는 가장 짧은 단위 길이 (m의 약수).
+    약수 q마다 q만큼 민 수열과 비교 (리스트 비교는 C 루프, 불일치 시 바로 종료).
+    """
+    m = len(seq)
+    for q in range(1, m):
+        if m % q == 0 and seq[q:] == seq[:-q]:
+            return q
+    return m
+
+
+def minimal_period(waveform: Sequence[int]) -> int:
+    """
+    주기 반복 파형의 최소 반복 주기 (cycle 수, 파형 길이의 약수).
+    cycle 단위가 아니라 순환 edge 간격 수열의 주기를 찾으므로 edge 수에 비례.
+    값이 일정한 파형은 1을 반환한다.
+    """
+    n = len(waveform)
+    edges = transitions(waveform)
+    if n and waveform[0] != waveform[-1]:
+        edges = [0] + edges  # 마지막 -> 첫 cycle로 넘어가는 순환 edge
+    if not edges:
+        return min(n, 1)
+    gaps = [b - a for a, b in zip(edges, edges[1:])] + [edges[0] + n - edges[-1]]
+    q = _cyclic_period(gaps)
+    # edge를 홀수 개 건너뛰면 값이 반전되므로 단위는 짝수 개의 edge를 포함해야 함
+    if q % 2:
+        q *= 2
+    return sum(gaps[:q])
+
+
+def iter_transitions(waveform: Sequence[int], chunk: int = 1 << 16) -> Iterator[int]:
+    """transitions()와 같은 순서로 edge를 하나씩 생성. chunk 단위로 계산하므로 메모리가 파형 길이와 무관."""
+    if isinstance(waveform, EdgeWaveform):
+        yield from waveform.transitions()
+        return
+    n = len(waveform)
+    for start in range(0, n, chunk):
+        # 앞 chunk의 마지막 cycle과 한 칸 겹쳐서 경계의 edge도 잡는다
+        for i in transitions(waveform[start:min(n, start + chunk + 1)]):
+            yield start + i
+
+
+class EdgeIndex:
+    """
+    파형 하나의 pulse/edge 색인 (편집 구간 근처만 갱신).
+    pulse는 start 오름차순의 두 리스트(starts, widths)로 보관한다. edge는 pulse의 시작/끝 중
+    파형 양 끝(0, length)이 아닌 위치다.
+      - pulse 수, i번째 pulse, High cycle 수 : O(1)
+      - 다음/이전 edge                         : O(log n) (bisect)
+      - update(start, end)                      : 구간에 닿는 pulse만 다시 계산 (O(log n + 구간 크기),
+                                                  리스트 splice는 memmove)
+    """
+    __slots__ = ("starts", "widths", "length", "high", "_width_counts")
+
+    def __init__(self, waveform: Sequence[int]):
+        pulses = find_pulses(waveform)
+        self.starts: List[int] = [s for s, _ in pulses]
+        self.widths: List[int] = [w for _, w in pulses]
+        self.length = len(waveform)
+        self.high = sum(self.widths)
+        self._width_counts: Dict[int, int] = {}
+        self._count_widths(self.widths, 1)
+
+    def _count_widths(self, widths: List[int], sign: int):
+        counts = self._width_counts
+        for w in widths:
+            c = counts.get(w, 0) + sign
+            if c:
+                counts[w] = c
+            else:
+                del counts[w]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Tuple[int, int]:
+        return self.starts[i], self.widths[i]
+
+    def pulses(self, first: int = 0, stop: Optional[int] = None) -> List[Tuple[int, int]]:
+        """[first, stop)번째 pulse의 (start, width) 목록."""
+        return list(zip(self.starts[first:stop], self.widths[first:stop]))
+
+    def update(self, waveform: Sequence[int], start: int, end: int):
+        """파형의 [start, end) 구간이 바뀐 뒤 호출. 한 칸 쓰기, 구간 채우기, 지우기 모두 같은 경로."""
+        starts, widths = self.starts, self.widths
+        self.length = len(waveform)
+        start, end = max(0, start), min(self.length, end)
+        # 구간과 겹치거나 맞닿은 pulse [i0, i1): 합쳐지거나 나뉠 수 있으므로 통째로 다시 계산
+        i0 = bisect_left(starts, start)
+        if i0 and starts[i0 - 1] + widths[i0 - 1] >= start:
+            i0 -= 1
+        i1 = bisect_right(starts, end)
+        lo = min(start, starts[i0]) if i0 < i1 else start
+        hi = max(end, starts[i1 - 1] + widths[i1 - 1]) if i0 < i1 else end
+        hi = min(hi, self.length)
+        # lo-1, hi 위치는 Low(또는 파형 끝)라서 구간만 잘라 계산해도 pulse 경계가 같다
+        fresh = find_pulses(waveform[lo:hi]) if hi > lo else []
+        new_widths = [w for _, w in fresh]
+        old_widths = widths[i0:i1]
+        self.high += sum(new_widths) - sum(old_widths)
+        self._count_widths(old_widths, -1)
+        self._count_widths(new_widths, 1)
+        starts[i0:i1] = [lo + s for s, _ in fresh]
+        widths[i0:i1] = new_widths
+
+    def edge_count(self) -> int:
+        n = len(self.starts)
+        if not n:
+            return 0
+        return 2 * n - (self.starts[0] == 0) - (self.starts[-1] + self.widths[-1] == self.length)
+
+    def next_edge(self, i: int) -> Optional[int]:
+        """i보다 뒤의 첫 edge 위치 (없으면 None)."""
+        starts, widths = self.starts, self.widths
+        i = max(i, 0)
+        j = bisect_right(starts, i)
+        if j:
+            end = starts[j - 1] + widths[j - 1]
+            if end > i:
+                # i가 pulse 안: 그 pulse의 끝이 다음 edge
+                return end if end < self.length else None
+        return starts[j] if j < len(starts) else None
+
+    def prev_edge(self, i: int) -> Optional[int]:
+        """i보다 앞의 마지막 edge 위치 (없으면 None)."""
+        starts, widths = self.starts, self.widths
+        j = bisect_left(starts, i) - 1
+        if j < 0:
+            return None
+        end = starts[j] + widths[j]
+        if end < i and end < self.length:
+            return end
+        # i-1이 pulse 안 (또는 pulse가 파형 끝까지): 그 pulse의 시작이 이전 edge
+        return starts[j] if starts[j] > 0 else None
+
+    def summary(self) -> Dict[str, float]:
+        """pulse 수, High cycle 수, duty, 폭 min/max/mean (폭 분포를 따로 세어 두므로 pulse 수와 무관)."""
+        n = len(self.widths)
+        counts = self._width_counts
+        return {
+            "pulses": n,
+            "high": self.high,
+            "duty": self.high / self.length if self.length else 0.0,
+            "min": min(counts) if counts else 0,
+            "max": max(counts) if counts else 0,
+            "mean": self.high / n if n else 0.0,
+        }
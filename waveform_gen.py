@@ -1,8 +1,23 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-from typing import List, Tuple
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
 import re
 
+from waveform_storage import BitWaveform
+from waveform_edges import EdgeIndex, find_pulses, transitions
+
+# GUI 모듈은 편집기를 띄울 때 _load_tk()가 불러온다.
+# find_high_pulses / generate_veriloga만 쓰는 스크립트는 tkinter와 display 없이 import된다.
+tk = ttk = filedialog = messagebox = simpledialog = PulseTable = None
+
+
+def _load_tk() -> None:
+    """tkinter와 PulseTable을 import해서 module global에 묶는다."""
+    global tk, ttk, filedialog, messagebox, simpledialog, PulseTable
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, simpledialog
+    from waveform_panel import PulseTable
+
 
 CELL_WIDTH = 20   # 1 ??? ???
 CELL_HEIGHT = 60  # ?? ??
@@ -16,31 +31,126 @@ WAVE_COLOR = "#000000"
 SIDEBAR_WIDTH = 260  # fixed width for the pulse info pane
 
 
-def find_high_pulses(waveform: List[int]) -> List[Tuple[int, int]]:
+def find_high_pulses(waveform: Sequence[int]) -> List[Tuple[int, int]]:
     """
     High ??? ?? (start_index, width) ???? ??.
     :param waveform: 0/1 ???, index = clock
     :return: [(start_index, width), ...]
     """
-    pulses = []
-    in_pulse = False
-    start = 0
-
-    for i, value in enumerate(waveform):
-        if value == 1 and not in_pulse:
-            in_pulse = True
-            start = i
-        elif value == 0 and in_pulse:
-            in_pulse = False
-            width = i - start
-            pulses.append((start, width))
-
-    # ??? 1? ??
-    if in_pulse:
-        width = len(waveform) - start
-        pulses.append((start, width))
+    # waveform_edges의 vectorized 추출 사용 (NumPy diff 기반)
+    return find_pulses(waveform)
+
+
+def to_pwl_points(wf: Sequence[int], tclk: float, vlow: float, vhigh: float) -> List[Tuple[float, float]]:
+    """파형을 (시간, 전압) 점 목록으로 변환. 첫 점은 0초, 마지막 점은 파형 끝."""
+    points: List[Tuple[float, float]] = []
+    cur_val = wf[0]
+    cur_time = 0.0
+    points.append((cur_time, vhigh if cur_val else vlow))
+    for i in transitions(wf):
+        cur_val = 0 if cur_val else 1
+        cur_time = i * tclk
+        points.append((cur_time, vhigh if cur_val else vlow))
+    # 끝점 추가
+    points.append((len(wf) * tclk, vhigh if cur_val else vlow))
+    return points
+
+
+def _chain_lines(idx: int, out: str, mode: str, wf: Sequence[int], pwl_pts: List[Tuple[float, float]],
+                 tclk: float, edge_time: float) -> List[str]:
+    """if/else 비교 체인 방식. 매 timestep마다 edge 수만큼 비교한다."""
+    body_lines = []
+    times = [pt[0] for pt in pwl_pts]
+    vals = [pt[1] for pt in pwl_pts]
+    if mode == "pulse":
+        period = len(wf) * tclk
+        body_lines.append(f"    // {out} : pulse (periodic)")
+        body_lines.append(f"    real tau_{idx}, vsel_{idx};")
+        body_lines.append(f"    tau_{idx} = $abstime - {period:.12g}*floor($abstime/{period:.12g});")
+        conds = []
+        for i in range(1, len(times)):
+            conds.append((times[i], vals[i-1]))
+        for i, (t_edge, v_prev) in enumerate(conds):
+            if_clause = "if" if i == 0 else "else if"
+            body_lines.append(f"    {if_clause} (tau_{idx} < {t_edge:.12g}) vsel_{idx} = {v_prev:.12g};")
+        body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
+    else:
+        body_lines.append(f"    // {out} : pwl (one-shot, finite edge)")
+        body_lines.append(f"    real vsel_{idx};")
+        if len(times) == 1:
+            body_lines.append(f"    vsel_{idx} = {vals[0]:.12g};")
+        else:
+            for i in range(1, len(times)):
+                if_clause = "if" if i == 1 else "else if"
+                body_lines.append(f"    {if_clause} ($abstime < {times[i]:.12g}) vsel_{idx} = {vals[i-1]:.12g};")
+            body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
+    body_lines.append(f"    V({out}) <+ transition(vsel_{idx}, 0, {edge_time:.12g});")
+    return body_lines
+
+
+def _event_lines(idx: int, out: str, mode: str, wf: Sequence[int], pwl_pts: List[Tuple[float, float]],
+                 tclk: float, edge_time: float) -> List[str]:
+    """
+    @(timer) 이벤트 방식. 값은 edge 시각에만 바뀌므로 매 timestep 계산은 상수 시간.
+    (vsel_i는 값이 유지되어야 하므로 모듈 레벨에 선언된다)
+    """
+    body_lines = []
+    if mode == "pulse":
+        period = len(wf) * tclk
+        body_lines.append(f"    // {out} : pulse (periodic, event-driven)")
+        # 주기 시작점에서 마지막 값 -> 첫 값으로 돌아갈 때만 0초 타이머가 필요
+        if wf[0] != wf[-1]:
+            body_lines.append(f"    @(timer(0, {period:.12g})) vsel_{idx} = {pwl_pts[0][1]:.12g};")
+        for t_edge, v in pwl_pts[1:-1]:
+            body_lines.append(f"    @(timer({t_edge:.12g}, {period:.12g})) vsel_{idx} = {v:.12g};")
+    else:
+        body_lines.append(f"    // {out} : pwl (one-shot, event-driven)")
+        for t_edge, v in pwl_pts[1:-1]:
+            body_lines.append(f"    @(timer({t_edge:.12g})) vsel_{idx} = {v:.12g};")
+    body_lines.append(f"    V({out}) <+ transition(vsel_{idx}, 0, {edge_time:.12g});")
+    return body_lines
+
+
+def generate_veriloga(waveforms: Sequence[Sequence[int]], outs: List[str], modes: List[str],
+                      tclk: float, vlow: float, vhigh: float, edge_time: float,
+                      style: str = "event") -> str:
+    """
+    파형들을 Verilog-A 소스로 변환.
+    :param modes: 신호별 "pwl"(1회) 또는 "pulse"(주기 반복)
+    :param style: "event"(@timer 이벤트) 또는 "chain"(기존 $abstime if/else 비교 체인)
+    """
+    port_decl = ", ".join(outs)
+    if style == "chain":
+        body_lines = []
+        for idx, wf in enumerate(waveforms):
+            pwl_pts = to_pwl_points(wf, tclk, vlow, vhigh)
+            body_lines.extend(_chain_lines(idx, outs[idx], modes[idx], wf, pwl_pts, tclk, edge_time))
+        decl = ""
+    elif style == "event":
+        init_lines = []
+        body_lines = []
+        for idx, wf in enumerate(waveforms):
+            pwl_pts = to_pwl_points(wf, tclk, vlow, vhigh)
+            init_lines.append(f"        vsel_{idx} = {pwl_pts[0][1]:.12g};")
+            body_lines.extend(_event_lines(idx, outs[idx], modes[idx], wf, pwl_pts, tclk, edge_time))
+        decl = f"    real {', '.join(f'vsel_{idx}' for idx in range(len(waveforms)))};\n" if waveforms else ""
+        body_lines[:0] = ["    @(initial_step) begin"] + init_lines + ["    end"]
+    else:
+        raise ValueError(f"unknown export style: {style!r}")
+    body = "\n".join(body_lines)
+
+    return f"""// Auto-generated from WaveformEditor (all waves)
+`include "discipline.h"
+`include "constants.h"
 
-    return pulses
+module pwl_waves(output electrical {port_decl});
+    parameter real vlow = {vlow};
+    parameter real vhigh = {vhigh};
+{decl}    analog begin
+{body}
+    end
+endmodule
+"""
 
 
 class WaveformEditor:
@@ -48,20 +158,23 @@ class WaveformEditor:
     ?? ??(0/1)? ???? ?? ? ?? ??? GUI.
     """
     def __init__(self, master: tk.Tk):
+        _load_tk()
         self.master = master
         self.master.title("Waveform Editor (Clock-based Pulse Width)")
 
         # 파형 리스트(각 0/1 시퀀스), 활성 파형 인덱스, 신호 이름
-        self.waveforms: List[List[int]] = [[0] * NUM_CYCLES for _ in range(NUM_WAVES)]
+        self.waveforms: List[BitWaveform] = [BitWaveform.zeros(NUM_CYCLES) for _ in range(NUM_WAVES)]
         self.active_wave: int = 0
         self.signal_vars: List[tk.StringVar] = []
         self.mode_vars: List[tk.StringVar] = []  # 파형 타입: pwl(1회), pulse(주기 반복)
         self.canvases: List[tk.Canvas] = []
         self.grid_drawn: set[int] = set()  # 그리드는 한 번만 그림
+        self.wave_items: Dict[int, int] = {}  # canvas id -> 파형 polyline item (coords로 재사용)
         self._pending_update: Tuple[int, int, int] | None = None  # (wave_idx, index, value)
         self._after_id: str | None = None
         self.cursor_index: int = 0  # 키보드 입력용 현재 인덱스
         self._pulse_len_buf: str = ""  # 숫자 입력 버퍼(펄스 길이)
+        self._pulse_index: Tuple[int, BitWaveform, EdgeIndex] | None = None  # 활성 파형의 pulse 목록
 
         self._create_widgets()
         self._draw_all()
@@ -156,8 +269,8 @@ class WaveformEditor:
 
         ttk.Label(side_frame, text="High Pulse ?? (?? ??)", font=("", 10, "bold")).pack(anchor="w")
 
-        self.text_info = tk.Text(side_frame, width=30, height=20)
-        self.text_info.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.pulse_table = PulseTable(side_frame)
+        self.pulse_table.pack(fill=tk.BOTH, expand=True, pady=5)
 
         btn_frame = ttk.Frame(side_frame)
         btn_frame.pack(fill=tk.X, pady=5)
@@ -180,7 +293,6 @@ class WaveformEditor:
         """?? ???? ?? ??."""
         for idx in range(NUM_WAVES):
             canvas = self.canvases[idx]
-            canvas.delete("wave")
             self._draw_grid(canvas)
             self._draw_waveform(canvas, self.waveforms[idx])
         self._update_pulse_info()
@@ -188,7 +300,6 @@ class WaveformEditor:
     def _draw_one(self, wave_idx: int) -> None:
         """??? ??? ?? ?? (??? ? ?? ???)."""
         canvas = self.canvases[wave_idx]
-        canvas.delete("wave")
         self._draw_grid(canvas)
         self._draw_waveform(canvas, self.waveforms[wave_idx])
 
@@ -210,33 +321,27 @@ class WaveformEditor:
 
         self.grid_drawn.add(id(canvas))
 
-    def _draw_waveform(self, canvas: tk.Canvas, waveform: List[int]) -> None:
+    def _draw_waveform(self, canvas: tk.Canvas, waveform: Sequence[int]) -> None:
         """waveform ???? ???? ?? polyline ???."""
-        points = []
-
         def y_level(value: int) -> int:
             return HIGH_Y if value == 1 else LOW_Y
 
-        x0 = 0
-        y0 = y_level(waveform[0])
-        points.append((x0, y0))
-
-        for i in range(1, NUM_CYCLES):
-            prev_val = waveform[i - 1]
-            cur_val = waveform[i]
+        # 값이 바뀌는 cycle에서만 꺾이는 점을 찍는다
+        level = waveform[0]
+        flat_points = [0, y_level(level)]
+        for i in transitions(waveform):
             x = i * CELL_WIDTH
-            if cur_val != prev_val:
-                points.append((x, y_level(prev_val)))
-                points.append((x, y_level(cur_val)))
-            points.append((x, y_level(cur_val)))
-
-        points.append((NUM_CYCLES * CELL_WIDTH, y_level(waveform[-1])))
-
-        if len(points) >= 2:
-            flat_points = []
-            for (x, y) in points:
-                flat_points.extend([x, y])
-            canvas.create_line(*flat_points, fill=WAVE_COLOR, width=2, tags=("wave",))
+            flat_points.extend((x, y_level(level), x, y_level(1 - level)))
+            level = 1 - level
+        flat_points.extend((NUM_CYCLES * CELL_WIDTH, y_level(level)))
+
+        # item을 지우고 새로 만들지 않고 좌표만 갱신
+        item = self.wave_items.get(id(canvas))
+        if item is None:
+            self.wave_items[id(canvas)] = canvas.create_line(*flat_points, fill=WAVE_COLOR, width=2,
+                                                             tags=("wave",))
+        else:
+            canvas.coords(item, *flat_points)
 
     # -------------------- ??? ??? -------------------- #
 
@@ -257,7 +362,7 @@ class WaveformEditor:
             self.waveforms[wave_idx][index] = 1 if value else 0
             self.active_wave = wave_idx
             self._draw_one(wave_idx)
-            self._update_pulse_info()
+            self._update_pulse_info(index, index + 1)
             self.status_var.set(f"클럭 {index}: {'HIGH(1)' if value else 'LOW(0)'} (파형 {wave_idx+1}) 로 설정")
 
     def _schedule_wave_value(self, wave_idx: int, index: int, value: int) -> None:
@@ -321,7 +426,7 @@ class WaveformEditor:
         name = self.signal_vars[wave_idx].get().strip().lower()
         if name != "clk":
             return
-        self.waveforms[wave_idx] = [i % 2 for i in range(NUM_CYCLES)]
+        self.waveforms[wave_idx] = BitWaveform(i % 2 for i in range(NUM_CYCLES))
         self.active_wave = wave_idx
         self.cursor_index = 0
         self._pulse_len_buf = ""
@@ -343,10 +448,10 @@ class WaveformEditor:
             return
         start = self.cursor_index
         end = min(NUM_CYCLES, start + length)
-        self.waveforms[self.active_wave][start:end] = [fill_value] * (end - start)
+        self.waveforms[self.active_wave].fill(start, end, fill_value)
         self._pulse_len_buf = ""
         self._draw_one(self.active_wave)
-        self._update_pulse_info()
+        self._update_pulse_info(start, end)
         val_label = "HIGH" if fill_value == 1 else "LOW"
         self.status_var.set(f"클럭 {start}~{end-1} (총 {end-start}) {val_label} 설정 (파형 {self.active_wave+1})")
 
@@ -360,29 +465,22 @@ class WaveformEditor:
 
     # -------------------- Pulse 정보 / 유틸 -------------------- #
 
-    def _update_pulse_info(self) -> None:
+    def _update_pulse_info(self, start: int = 0, end: int | None = None) -> None:
         """?? ?? ???? High ?? ?? ??."""
+        # 같은 파형이면 바뀐 구간 [start, end)만 다시 계산, 아니면 새로 계산 (0/1 전체 dump 대신 요약 통계)
         waveform = self.waveforms[self.active_wave]
-        pulses = find_high_pulses(waveform)
-
-        self.text_info.delete("1.0", tk.END)
-
-        self.text_info.insert(tk.END, f"?? ??: {self.active_wave + 1}\n")
-        self.text_info.insert(tk.END, f"?? ?: {len(waveform)}\n")
-        self.text_info.insert(tk.END, f"High ?? ??: {len(pulses)}\n\n")
-
-        for idx, (start, width) in enumerate(pulses, start=1):
-            self.text_info.insert(
-                tk.END,
-                f"Pulse {idx}: start = {start}, width = {width} clocks\n"
-            )
-
-        self.text_info.insert(tk.END, "waveform ???(0/1):\n")
-        self.text_info.insert(tk.END, f"{waveform}\n")
+        cached = self._pulse_index
+        if cached is not None and cached[0] == self.active_wave and cached[1] is waveform:
+            index = cached[2]
+            index.update(waveform, start, len(waveform) if end is None else end)
+        else:
+            index = EdgeIndex(waveform)
+            self._pulse_index = (self.active_wave, waveform, index)
+        self.pulse_table.set_index(index, f"Wave {self.active_wave + 1}")
 
     def _clear_waveform(self) -> None:
         """?? ??? Low(0)?? ???."""
-        self.waveforms[self.active_wave] = [0] * NUM_CYCLES
+        self.waveforms[self.active_wave] = BitWaveform.zeros(NUM_CYCLES)
         self._draw_one(self.active_wave)
         self._update_pulse_info()
         self.status_var.set(f"?? {self.active_wave + 1} cleared (all LOW).")
@@ -391,7 +489,7 @@ class WaveformEditor:
         """?? ??? ??? ??."""
         wf = self.waveforms[self.active_wave]
         print(f"Current waveform #{self.active_wave + 1} (0/1 list):")
-        print(wf)
+        print(wf.tolist())
 
         pulses = find_high_pulses(wf)
         print("High pulses (start, width):")
@@ -430,6 +528,12 @@ class WaveformEditor:
             messagebox.showerror("입력 오류", "에지 시간을 올바르게 입력하세요 (예: 1e-12).")
             return
 
+        # 이벤트 방식: timestep당 계산량이 edge 수와 무관 (긴 파형 권장)
+        event_style = messagebox.askyesno(
+            "출력 방식",
+            "@(timer) 이벤트 방식으로 생성할까요?\n(아니오: 기존 if/else 비교 체인)",
+            parent=self.master)
+
         path = filedialog.asksaveasfilename(
             title="Verilog-A 파일 저장",
             defaultextension=".va",
@@ -438,20 +542,6 @@ class WaveformEditor:
         if not path:
             return
 
-        def to_pwl_points(wf: List[int]) -> List[Tuple[float, float]]:
-            points: List[Tuple[float, float]] = []
-            cur_val = wf[0]
-            cur_time = 0.0
-            points.append((cur_time, vhigh if cur_val else vlow))
-            for i in range(1, len(wf)):
-                if wf[i] != cur_val:
-                    cur_val = wf[i]
-                    cur_time = i * tclk
-                    points.append((cur_time, vhigh if cur_val else vlow))
-            # 끝점 추가
-            points.append((len(wf) * tclk, vhigh if cur_val else vlow))
-            return points
-
         def sanitize(name: str, default: str = "wave") -> str:
             s = name.strip()
             if not s:
@@ -476,61 +566,9 @@ class WaveformEditor:
             used.add(candidate)
             outs.append(candidate)
 
-        port_decl = ", ".join(outs)
-
-        body_lines = []
-        for idx, wf in enumerate(self.waveforms):
-            mode = self.mode_vars[idx].get().strip().lower()
-            pwl_pts = to_pwl_points(wf)
-            flat: List[str] = []
-            for t, v in pwl_pts:
-                flat.append(f"{t:.12g}")
-                flat.append(f"{v:.12g}")
-            pwl_str = ", ".join(flat)
-
-            if mode == "pulse":
-                period = len(wf) * tclk
-                times = [pt[0] for pt in pwl_pts]
-                vals = [pt[1] for pt in pwl_pts]
-                body_lines.append(f"    // {outs[idx]} : pulse (periodic)")
-                body_lines.append(f"    real tau_{idx}, vsel_{idx};")
-                body_lines.append(f"    tau_{idx} = $abstime - {period:.12g}*floor($abstime/{period:.12g});")
-                conds = []
-                for i in range(1, len(times)):
-                    conds.append((times[i], vals[i-1]))
-                for i, (t_edge, v_prev) in enumerate(conds):
-                    if_clause = "if" if i == 0 else "else if"
-                    body_lines.append(f"    {if_clause} (tau_{idx} < {t_edge:.12g}) vsel_{idx} = {v_prev:.12g};")
-                body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
-                body_lines.append(f"    V({outs[idx]}) <+ transition(vsel_{idx}, 0, {edge_time:.12g});")
-            else:
-                times = [pt[0] for pt in pwl_pts]
-                vals = [pt[1] for pt in pwl_pts]
-                body_lines.append(f"    // {outs[idx]} : pwl (one-shot, finite edge)")
-                body_lines.append(f"    real vsel_{idx};")
-                if len(times) == 1:
-                    body_lines.append(f"    vsel_{idx} = {vals[0]:.12g};")
-                else:
-                    for i in range(1, len(times)):
-                        if_clause = "if" if i == 1 else "else if"
-                        body_lines.append(f"    {if_clause} ($abstime < {times[i]:.12g}) vsel_{idx} = {vals[i-1]:.12g};")
-                    body_lines.append(f"    else vsel_{idx} = {vals[-1]:.12g};")
-                body_lines.append(f"    V({outs[idx]}) <+ transition(vsel_{idx}, 0, {edge_time:.12g});")
-
-        body = "\n".join(body_lines)
-
-        content = f"""// Auto-generated from WaveformEditor (all waves)
-`include "discipline.h"
-`include "constants.h"
-
-module pwl_waves(output electrical {port_decl});
-    parameter real vlow = {vlow};
-    parameter real vhigh = {vhigh};
-    analog begin
-{body}
-    end
-endmodule
-"""
+        modes = [v.get().strip().lower() for v in self.mode_vars]
+        style = "event" if event_style else "chain"
+        content = generate_veriloga(self.waveforms, outs, modes, tclk, vlow, vhigh, edge_time, style)
         try:
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
@@ -540,6 +578,7 @@ endmodule
 
 
 def main() -> None:
+    _load_tk()
     root = tk.Tk()
     app = WaveformEditor(root)
     root.mainloop()
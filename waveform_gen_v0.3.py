@@ -1,303 +1,54 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-from typing import List, Tuple, Dict
-import re
-import math
-import json
-# ==========================================
-# 1. Configuration Class (설정 관리)
-# ==========================================
-class WaveformConfig:
-    """애플리케이션의 모든 상수와 설정을 관리하는 클래스"""
-    def __init__(self):
-        self.num_cycles = 64      # 기본 사이클 수
-        self.num_waves = 4        # 기본 파형 개수
-        self.cell_width = 20      # 한 클럭의 픽셀 너비
-        self.row_height = 50      # 파형 한 줄의 높이
-        
-        # UI Colors & Layout
-        self.high_y_offset = 10
-        self.low_y_offset = 40
-        self.grid_color = "#e0e0e0"
-        self.wave_color = "#000000"
-        self.sidebar_width = 340  # 컨트롤 패널 너비
-
-    @property
-    def total_width(self):
-        return self.num_cycles * self.cell_width
-
-    @property
-    def total_height(self):
-        return self.num_waves * self.row_height
+from __future__ import annotations
+
+from typing import Callable, Tuple, Optional
+from waveform_storage import STORAGE_BACKENDS
+from waveform_render import WaveformRenderer
+from waveform_io import BINARY_EXT, read_project, write_project
+from waveform_cache import FragmentCache
+from waveform_spice import export_pwl
+from waveform_vcd import read_vcd, scan_vcd
+from waveform_perf import PerfMonitor
+# 데이터 모델과 Verilog-A generator는 Tk 없이 쓸 수 있도록 waveform_core에 있다 (여기서 다시 export)
+from waveform_core import (WaveformConfig, VerilogAGenerator, Signal, EditRecord,
+                           WaveformModel, DragStroke, Selection)
+
+# tkinter/ttk와 Tk 위젯 모듈은 편집기를 만들 때 불러온다 (display 없는 환경에서도 import 가능)
+tk = ttk = filedialog = messagebox = simpledialog = PulseTable = SignalList = None
+
+
+def _load_tk():
+    """GUI 모듈을 import해서 module global에 묶는다. 두 번째 호출부터는 sys.modules 조회뿐."""
+    global tk, ttk, filedialog, messagebox, simpledialog, PulseTable, SignalList
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, simpledialog
+    from waveform_panel import PulseTable, SignalList
 
 # ==========================================
-# 2. Logic Class: Verilog-A Generator
-# ==========================================
-class VerilogAGenerator:
-    """
-    GUI와 독립적으로 Verilog-A 코드를 생성하는 로직 클래스.
-    ★ Drift 해결: $abstime 계산 방식을 버리고, @timer 이벤트 기반으로 값을 직접 할당.
-    """
-    
-    @staticmethod
-    def sanitize_name(name: str, default: str = "wave") -> str:
-        s = name.strip()
-        s = re.sub(r"[^A-Za-z0-9_]", "_", s)
-        if not s: s = default
-        if s[0].isdigit(): s = f"w_{s}"
-        return s
-
-    @staticmethod
-    def generate(waveforms: List[List[int]], 
-                 names: List[str], 
-                 modes: List[str], 
-                 params: Dict) -> str:
-        
-        tck_str = params.get('tck_str', '10n')
-        tr_str = params.get('tr_str', '10p')
-        tf_str = params.get('tf_str', '10p')
-        vhigh = params['vhigh']
-        vlow = params['vlow']
-        
-        sanitized_names = [VerilogAGenerator.sanitize_name(n, f"sig_{i}") for i, n in enumerate(names)]
-        
-        # 주기적 신호가 있는지 확인하고, 있다면 GUI 길이를 가져옴
-        has_periodic = any(m == "반복" for m in modes)
-        gui_len = len(waveforms[0]) if waveforms else 0
-        
-        lines = [
-            '// Auto-generated by Python Waveform Editor (Event-Driven Version)',
-            '`include "discipline.h"',
-            '`include "constants.h"',
-            '',
-            f'module pwl_waves({", ".join(sanitized_names)});',
-            f'    output {", ".join(sanitized_names)};',
-            f'    electrical {", ".join(sanitized_names)};',
-            '',
-            '    // User Parameters',
-            f'    parameter real tck = {tck_str};  // Clock Period (1 Cycle)',
-            f'    parameter real tr  = {tr_str};   // Rising Time',
-            f'    parameter real tf  = {tf_str};   // Falling Time',
-            f'    parameter real vlow = {vlow};',
-            f'    parameter real vhigh = {vhigh};',
-            ''
-            '    // Repetition Parameters (auto-generated for periodic signals)',
-        ]
-
-        # 주기적 신호가 있을 경우, 단일 period_factor 파라미터를 추가
-        if has_periodic and gui_len > 0:
-            period_factor_value = gui_len * 0.5
-            lines.append(f"    parameter real period_factor = {period_factor_value:.12g}; // Period factor for all periodic signals")
-            lines.append('') # 가독성을 위한 공백
-
-        real_vars = set()
-        initial_block = []
-        analog_body = []
-        transitions = []
-
-        for idx, wf in enumerate(waveforms):
-            name = sanitized_names[idx]
-            mode = modes[idx]
-            vsel = f"vsel_{idx}"
-            real_vars.add(vsel)
-            
-            # 1. 초기 상태 설정 (@initial_step)
-            # 파형의 0번째 값을 초기값으로 설정
-            init_val = vhigh if wf and wf[0] else vlow
-            initial_block.append(f"        {vsel} = {init_val:.12g};")
-
-            analog_body.append(f"    // Logic for {name} ({mode}) - Event Driven")
-            
-            is_periodic = (mode == "반복")
-            
-            # 2. 변경 포인트 감지 및 @timer 코드 생성
-            
-            if is_periodic:
-                period_expr = "(period_factor * tck)"
-                
-                # (1) Wrap-around 처리 (마지막 값 -> 첫 값 변경 시 0초에 이벤트 필요)
-                # 주기적 신호는 wf[-1]에서 wf[0]으로 넘어갈 때 값이 다르면 0초 타이머가 필요함
-                prev_val = wf[-1] 
-                
-                # 0부터 끝까지 순회
-                for i in range(len(wf)):
-                    curr_val = wf[i]
-                    if curr_val != prev_val:
-                        # 값이 변하는 순간!
-                        time_offset = i * 0.5
-                        target_volt = vhigh if curr_val else vlow
-                        
-                        # @timer(시작시간, 주기)
-                        if time_offset == 0:
-                            # 0초(주기 시작점) 타이머
-                            analog_body.append(f"    @(timer(0, {period_expr})) {vsel} = {target_volt:.12g};")
-                        else:
-                            # 중간 타이머
-                            analog_body.append(f"    @(timer({time_offset:.12g} * tck, {period_expr})) {vsel} = {target_volt:.12g};")
-                    
-                    prev_val = curr_val
-                    
-            else:
-                # One-shot 모드
-                prev_val = wf[0]
-                # 0번째 인덱스는 초기값으로 설정되므로, 1번째부터 변화 감지
-                for i in range(1, len(wf)):
-                    curr_val = wf[i]
-                    if curr_val != prev_val:
-                        time_offset = i * 0.5
-                        target_volt = vhigh if curr_val else vlow
-                        # 반복 없는 단발성 타이머
-                        analog_body.append(f"    @(timer({time_offset:.12g} * tck)) {vsel} = {target_volt:.12g};")
-                        prev_val = curr_val
-                
-                # GUI 윈도우가 끝난 후 0(Low)으로 떨어지도록 설정 (옵션)
-                end_time_expr = f"({gui_len * 0.5:.12g} * tck)"
-                if prev_val != 0: # 마지막이 High 상태로 끝났다면
-                     analog_body.append(f"    @(timer({end_time_expr})) {vsel} = {vlow:.12g};")
-
-            analog_body.append("")
-            transitions.append(f"    V({name}) <+ transition({vsel}, 0, tr, tf);")
-
-        if real_vars: lines.append(f"    real {', '.join(sorted(list(real_vars)))};")
-        
-        # 정수는 더 이상 필요 없음 (n_0, n_1 등 삭제)
-            
-        lines.append("\n    analog begin")
-        
-        # 초기화 블록
-        if initial_block:
-            lines.append("        @(initial_step) begin")
-            lines.extend(initial_block)
-            lines.append("        end\n")
-            
-        lines.extend(analog_body)
-        lines.extend(transitions)
-        lines.append("    end")
-        lines.append("endmodule")
-        return "\n".join(lines)
-
-class Signal:
-    """하나의 파형에 대한 모든 데이터를 캡슐화하는 클래스"""
-    def __init__(self, name: str, mode: str, waveform: List[int]):
-        self.name = tk.StringVar(value=name)
-        self.mode = tk.StringVar(value=mode)
-        self.waveform = waveform
-
-    def get_data_dict(self) -> Dict:
-        """저장/내보내기를 위한 순수 데이터 딕셔너리 반환"""
-        return {
-            "name": self.name.get(),
-            "mode": self.mode.get(),
-            "waveform": list(self.waveform) # 참조가 아닌 리스트 복사본을 반환
-        }
-
-class WaveformModel:
-    """애플리케이션의 데이터 모델과 비즈니스 로직을 관리"""
-    def __init__(self, num_cycles: int, num_waves: int):
-        self.num_cycles = num_cycles
-        self.signals: List[Signal] = []
-        self.clipboard: Dict = None
-        self.active_wave_idx = 0
-
-        # Undo/Redo 스택
-        self.undo_stack: List[Dict] = []
-        self.redo_stack: List[Dict] = []
-        self.history_limit = 50 # 최대 저장 기록 수
-        
-        for i in range(num_waves):
-            self.add_signal(f"Signal_{i+1}")
-
-    @property
-    def num_waves(self) -> int:
-        return len(self.signals)
-
-    def add_signal(self, name: str, mode: str = "one-shot", waveform: List[int] = None):
-        if waveform is None:
-            waveform = [0] * self.num_cycles
-        self.signals.append(Signal(name, mode, waveform))
-
-    def _get_state(self) -> Dict:
-        """현재 모델의 상태를 딕셔너리로 반환 (깊은 복사)"""
-        return {
-            "num_cycles": self.num_cycles,
-            "signals": [s.get_data_dict() for s in self.signals]
-        }
-
-    def _set_state(self, state: Dict):
-        """주어진 상태로 모델을 복원"""
-        self.num_cycles = state["num_cycles"]
-        self.signals = [
-            Signal(s['name'], s['mode'], s['waveform']) for s in state['signals']
-        ]
-        # 활성화 인덱스가 범위를 벗어나지 않도록 조정
-        if self.active_wave_idx >= self.num_waves:
-            self.active_wave_idx = self.num_waves - 1
-
-    def save_state_for_undo(self):
-        """현재 상태를 Undo 스택에 저장합니다."""
-        self.undo_stack.append(self._get_state())
-        if len(self.undo_stack) > self.history_limit:
-            self.undo_stack.pop(0) # 가장 오래된 기록 삭제
-        self.redo_stack.clear() # 새로운 변경이 생겼으므로 Redo 스택은 비움
-
-    def undo(self) -> bool:
-        if not self.undo_stack: return False
-        current_state = self._get_state()
-        self.redo_stack.append(current_state)
-        self._set_state(self.undo_stack.pop())
-        return True
-
-    def redo(self) -> bool:
-        if not self.redo_stack: return False
-        current_state = self._get_state()
-        self.undo_stack.append(current_state)
-        self._set_state(self.redo_stack.pop())
-        return True
-
-    def move_wave(self, idx: int, direction: str):
-        target_idx = -1
-        if direction == 'up' and idx > 0:
-            target_idx = idx - 1
-        elif direction == 'down' and idx < self.num_waves - 1:
-            target_idx = idx + 1
-        
-        if target_idx != -1:
-            self.signals[idx], self.signals[target_idx] = self.signals[target_idx], self.signals[idx]
-            # 활성화 인덱스도 함께 조정
-            if self.active_wave_idx == idx:
-                self.active_wave_idx = target_idx
-            elif self.active_wave_idx == target_idx:
-                self.active_wave_idx = idx
-
-    def copy_active_wave(self):
-        if 0 <= self.active_wave_idx < self.num_waves:
-            self.clipboard = self.signals[self.active_wave_idx].get_data_dict()
-
-    def paste_to_active_wave(self) -> bool:
-        if not self.clipboard: return False
-        active_sig = self.signals[self.active_wave_idx]
-        active_sig.name.set(self.clipboard["name"])
-        active_sig.mode.set(self.clipboard["mode"])
-        copied_wave = self.clipboard["waveform"]
-        pasted_wave = (copied_wave + [0] * self.num_cycles)[:self.num_cycles]
-        active_sig.waveform = pasted_wave
-        return True
-
-# ==========================================
-# 3. Main GUI Class
+# 4. Main GUI Class
 # ==========================================
 class WaveformEditor:
     def __init__(self, master: tk.Tk):
+        _load_tk()
         self.master = master
         self.cfg = WaveformConfig()
         # Model 인스턴스 생성
-        self.model = WaveformModel(self.cfg.num_cycles, self.cfg.num_waves)
+        self.model = WaveformModel(self.cfg.num_cycles, self.cfg.num_waves,
+                                   STORAGE_BACKENDS[self.cfg.storage])
 
         self.master.title(f"Waveform Editor - {self.cfg.num_cycles} Cycles")
         
         # UI 상태 변수
         self.cursor_index = 0
         self.pulse_len_buf = ""
+        self._stroke: DragStroke = None   # 진행 중인 드래그
+        self._stroke_after_id = None
+        self.selection: Optional[Selection] = None  # Shift+드래그로 만든 신호 x cycle 사각형
+        self._select_anchor: Optional[Tuple[int, int]] = None
+
+        # 편집 단계별 계측 (보기 메뉴에서 켬)
+        self.perf = PerfMonitor()
+        self.model.perf = self.perf
+        self._perf_after_id = None
 
         # 모델의 active_wave_idx를 직접 사용하거나, getter/setter를 만들 수 있습니다.
         # self.active_wave_idx = self.model.active_wave_idx 
@@ -306,12 +57,12 @@ class WaveformEditor:
         # UI Setup
         self._setup_menu()
         self._setup_layout()
+        self.renderer = WaveformRenderer(self.canvas, self.cfg, self.model)
+        # 재export 시 바뀌지 않은 신호의 코드 조각 재사용
+        self.export_cache = FragmentCache(directory=self.cfg.export_cache_dir)
         
-        # 초기 파형 변수 생성
-        for i in range(self.cfg.num_waves):
-            self.model.signals[i].name.trace_add("write", lambda *_, i=i: self._check_clk_name(i))
-            
-        self._rebuild_control_panel()
+        self.model.subscribe(self._on_model_event)
+
         self._bind_events()
         self._redraw_all()
         
@@ -329,6 +80,7 @@ class WaveformEditor:
         menubar.add_cascade(label="파일 (File)", menu=file_menu)
         file_menu.add_command(label="파형 저장 (Save Waveform)...", command=self._save_waveform)
         file_menu.add_command(label="파형 불러오기 (Load Waveform)...", command=self._load_waveform)
+        file_menu.add_command(label="VCD 가져오기 (Import VCD)...", command=self._import_vcd)
         file_menu.add_separator()
         file_menu.add_command(label="종료 (Exit)", command=self.master.quit)
 
@@ -337,9 +89,57 @@ class WaveformEditor:
         edit_menu.add_command(label="실행 취소 (Undo)", accelerator="Ctrl+Z", command=self._undo)
         edit_menu.add_command(label="다시 실행 (Redo)", accelerator="Ctrl+Y", command=self._redo)
 
+        # 사각형 선택(Shift+드래그) 일괄 편집: 선택한 신호들의 cycle 구간에 한 번에 적용, Undo 한 번
+        select_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="선택 (Selection)", menu=select_menu)
+        select_menu.add_command(label="High로 채우기 (Fill High)", accelerator="Ctrl+H",
+                                command=lambda: self._fill_selection(1))
+        select_menu.add_command(label="Low로 채우기 (Fill Low)", accelerator="Ctrl+L",
+                                command=lambda: self._fill_selection(0))
+        select_menu.add_command(label="반전 (Invert)", accelerator="Ctrl+I", command=self._invert_selection)
+        select_menu.add_separator()
+        select_menu.add_command(label="왼쪽으로 밀기 (Shift Left)", accelerator="Ctrl+Left",
+                                command=lambda: self._shift_selection(-1, False))
+        select_menu.add_command(label="오른쪽으로 밀기 (Shift Right)", accelerator="Ctrl+Right",
+                                command=lambda: self._shift_selection(1, False))
+        select_menu.add_command(label="왼쪽으로 회전 (Rotate Left)", accelerator="Ctrl+Shift+Left",
+                                command=lambda: self._shift_selection(-1, True))
+        select_menu.add_command(label="오른쪽으로 회전 (Rotate Right)", accelerator="Ctrl+Shift+Right",
+                                command=lambda: self._shift_selection(1, True))
+        select_menu.add_command(label="밀기/회전 칸 수 지정 (Shift By)...", command=self._shift_selection_by)
+        select_menu.add_separator()
+        select_menu.add_command(label="앞부분 반복 (Repeat Tile)...", accelerator="Ctrl+T",
+                                command=self._tile_selection)
+        select_menu.add_command(label="구간 복사 (Copy Range)", accelerator="Ctrl+Shift+C",
+                                command=self._copy_selection)
+        select_menu.add_command(label="구간에 붙여넣기 (Paste Into Range)", accelerator="Ctrl+Shift+V",
+                                command=self._paste_selection)
+        select_menu.add_separator()
+        select_menu.add_command(label="선택 해제 (Clear Selection)", accelerator="Esc",
+                                command=self._clear_selection)
+
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="설정 (Settings)", menu=settings_menu)
         settings_menu.add_command(label="그리드 크기 변경 (Grid Size)...", command=self._open_grid_settings)
+        storage_menu = tk.Menu(settings_menu, tearoff=0)
+        settings_menu.add_cascade(label="파형 저장 방식 (Storage)", menu=storage_menu)
+        self.storage_var = tk.StringVar(value=self.cfg.storage)
+        storage_menu.add_radiobutton(label="Bit-packed (기본)", value="bits",
+                                     variable=self.storage_var, command=self._change_storage)
+        storage_menu.add_radiobutton(label="Edge list (긴 one-shot 파형)", value="edges",
+                                     variable=self.storage_var, command=self._change_storage)
+
+        view_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="보기 (View)", menu=view_menu)
+        view_menu.add_command(label="확대 (Zoom In)", accelerator="Ctrl+=", command=lambda: self._zoom(2.0))
+        view_menu.add_command(label="축소 (Zoom Out)", accelerator="Ctrl+-", command=lambda: self._zoom(0.5))
+        view_menu.add_command(label="전체 보기 (Fit)", accelerator="Ctrl+0", command=self._zoom_fit)
+        view_menu.add_command(label="원래 크기 (Reset Zoom)", command=self._zoom_reset)
+        view_menu.add_separator()
+        self.perf_hud_var = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(label="성능 HUD (Performance HUD)", variable=self.perf_hud_var,
+                                  command=self._toggle_perf_hud)
+        view_menu.add_command(label="성능 기록 CSV 저장 (Export Perf CSV)...", command=self._export_perf_csv)
         self.main_pane = ttk.PanedWindow(self.master, orient=tk.HORIZONTAL)
         self.main_pane.pack(fill=tk.BOTH, expand=True)
         
@@ -349,13 +149,15 @@ class WaveformEditor:
         
         info_frame = ttk.LabelFrame(self.sidebar, text="Info", padding=5)
         info_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self.text_info = tk.Text(info_frame, width=25, height=10, state="disabled", font=("Consolas", 9))
-        self.text_info.pack(fill=tk.BOTH, expand=True)
+        # 보이는 행만 그리는 pulse 표 (신호별 pulse 목록은 편집 구간만 갱신)
+        self.pulse_table = PulseTable(info_frame)
+        self.pulse_table.pack(fill=tk.BOTH, expand=True)
         
         btn_frame = ttk.Frame(self.sidebar, padding=5)
         btn_frame.pack(fill=tk.X, side=tk.BOTTOM)
         ttk.Button(btn_frame, text="Clear Wave", command=self._clear_current_wave).pack(fill=tk.X, pady=2)
         ttk.Button(btn_frame, text="Export Verilog-A", command=self._export_verilog_a).pack(fill=tk.X, pady=2)
+        ttk.Button(btn_frame, text="Export SPICE PWL", command=self._export_spice_pwl).pack(fill=tk.X, pady=2)
 
         # Work Area
         self.work_area = ttk.Frame(self.main_pane)
@@ -367,62 +169,46 @@ class WaveformEditor:
         self.wave_container = ttk.Frame(self.work_area)
         self.wave_container.pack(fill=tk.BOTH, expand=True)
         
-        self.controls_frame = ttk.Frame(self.wave_container, width=self.cfg.sidebar_width)
-        self.controls_frame.pack(side=tk.LEFT, fill=tk.Y)
-        self.controls_frame.pack_propagate(False)
+        # 신호별 컨트롤: 보이는 행만 위젯을 만들고 canvas 세로 스크롤을 따라간다 (_on_yscroll)
+        self.signal_list = SignalList(self.wave_container, self.model, self.cfg.row_height,
+                                      on_move=self._move_wave, on_wheel=self._on_mousewheel,
+                                      width=self.cfg.sidebar_width)
+        self.signal_list.pack(side=tk.LEFT, fill=tk.Y)
+        
+        self.v_scroll = ttk.Scrollbar(self.wave_container, orient="vertical")
+        self.v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.canvas = tk.Canvas(self.wave_container, bg="white", highlightthickness=0)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        self.canvas.configure(xscrollcommand=self.h_scroll.set)
+        # 스크롤 시 보이는 영역만 다시 그리도록 렌더러에 알림
+        self.canvas.configure(xscrollcommand=self._on_xscroll, yscrollcommand=self._on_yscroll)
         self.h_scroll.configure(command=self.canvas.xview)
+        self.v_scroll.configure(command=self.canvas.yview)
         
         self.status_var = tk.StringVar()
         self.statusbar = ttk.Label(self.master, textvariable=self.status_var, relief=tk.SUNKEN, anchor="w")
         self.statusbar.pack(side=tk.BOTTOM, fill=tk.X)
+        # 성능 HUD: 켰을 때만 상태 표시줄 위에 표시
+        self.perf_var = tk.StringVar()
+        self.perf_bar = ttk.Label(self.master, textvariable=self.perf_var, relief=tk.SUNKEN, anchor="w",
+                                  font=("Consolas", 9))
 
-    def _rebuild_control_panel(self):
-        for widget in self.controls_frame.winfo_children():
-            widget.destroy()
-            
-        for i, sig in enumerate(self.model.signals):
-            row_f = ttk.Frame(self.controls_frame, height=self.cfg.row_height, style="Controls.TFrame")
-            row_f.pack(fill=tk.X, pady=0)
-            row_f.pack_propagate(False)
-            
-            # 파형 이동 버튼
-            move_btn_frame = ttk.Frame(row_f, style="Controls.TFrame")
-            move_btn_frame.pack(side=tk.LEFT, padx=(2,0), fill=tk.Y)
-            
-            up_btn = ttk.Button(move_btn_frame, text="▲", width=2, command=lambda i=i: self._move_wave(i, 'up'))
-            up_btn.pack(side=tk.TOP, expand=True, fill=tk.BOTH, pady=(1,0))
-            if i == 0:
-                up_btn.config(state="disabled")
-
-            down_btn = ttk.Button(move_btn_frame, text="▼", width=2, command=lambda i=i: self._move_wave(i, 'down'))
-            down_btn.pack(side=tk.BOTTOM, expand=True, fill=tk.BOTH, pady=(0,1))
-            if i == self.model.num_waves - 1:
-                down_btn.config(state="disabled")
-
-            # 나머지 컨트롤
-            controls_inner_frame = ttk.Frame(row_f, style="Controls.TFrame")
-            controls_inner_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=10)
-            
-            ttk.Label(controls_inner_frame, text=f"W{i+1}", width=4, anchor="center").pack(side=tk.LEFT, padx=2)
-            entry = ttk.Entry(controls_inner_frame, textvariable=sig.name, width=10, justify="center")
-            entry.pack(side=tk.LEFT, padx=2)
-            
-            combo = ttk.Combobox(controls_inner_frame, textvariable=sig.mode, values=["one-shot", "반복"], width=8, state="readonly")
-            combo.pack(side=tk.LEFT, padx=2)
+    def _on_model_event(self, event: str, *args):
+        """모델 변경 알림. 이름이 바뀌면 CLK 자동 생성을 확인한다 (컨트롤 목록은 SignalList가 직접 구독).
+        파형 구간/구조 변경은 각 편집 handler가 모아서 다시 그리므로 여기서는 처리하지 않는다."""
+        if event == "meta" and self.model.signals[args[0]].name != args[1]:
+            self._check_clk_name(args[0])
 
     def _check_clk_name(self, idx):
         if idx >= self.model.num_waves: return
         
-        name = self.model.signals[idx].name.get().lower().strip()
+        name = self.model.signals[idx].name.lower().strip()
         if name == "clk":
             self.model.signals[idx].waveform = [i % 2 for i in range(self.cfg.num_cycles)]
-            self.model.signals[idx].mode.set("반복")
-            self._redraw_all()
+            self.model.set_meta(idx, mode="반복", record=False)
+            self._mark_dirty(idx)
+            self.renderer.flush()
             self.status_var.set(f"Wave {idx+1}: Auto-generated CLK pattern.")
 
     def _open_grid_settings(self):
@@ -455,36 +241,25 @@ class WaveformEditor:
         ttk.Button(top, text="Apply", command=on_confirm).place(x=100, y=110)
         top.bind("<Return>", lambda e: on_confirm())
 
+    def _change_storage(self):
+        """설정 메뉴에서 선택한 저장 방식으로 모든 파형을 변환합니다."""
+        self.cfg.storage = self.storage_var.get()
+        self.model.set_storage(STORAGE_BACKENDS[self.cfg.storage])
+        self.status_var.set(f"Storage: {self.cfg.storage}")
+
     def _reconfigure_grid(self, new_cycles: int, new_waves: int):
         self.model.save_state_for_undo()
-        old_cycles = self.cfg.num_cycles
-        old_waves = self.cfg.num_waves
 
         self.cfg.num_cycles = new_cycles
         self.cfg.num_waves = new_waves # cfg도 업데이트하지만, model의 길이가 기준이 됨
 
-        # 모델에게 그리드 재설정을 위임 (이 로직은 WaveformModel로 이동)
-        # self.model.reconfigure(new_cycles, new_waves)
-
-        if new_waves > old_waves:
-            for i in range(old_waves, new_waves):
-                self.model.add_signal(f"Signal_{i+1}", waveform=[0] * old_cycles)
-                self.model.signals[i].name.trace_add("write", lambda *_, i=i: self._check_clk_name(i))
-        elif new_waves < old_waves:
-            self.model.signals = self.model.signals[:new_waves]
-
-        for sig in self.model.signals:
-            curr = len(sig.waveform)
-            if new_cycles > curr:
-                sig.waveform.extend([0] * (new_cycles - curr))
-            elif new_cycles < curr:
-                sig.waveform = sig.waveform[:new_cycles]
-        self.model.num_cycles = new_cycles
-
-        self._rebuild_control_panel()
+        # 모델에게 그리드 재설정을 위임
+        self.model.reconfigure(new_cycles, new_waves)
+
         self.master.title(f"Waveform Editor - {self.cfg.num_cycles} Cycles")
         self.model.active_wave_idx = 0
         self.cursor_index = 0
+        self._set_selection(None)
         self._redraw_all()
         self.status_var.set(f"Resized: {new_waves} Waves x {new_cycles} Cycles")
 
@@ -493,6 +268,10 @@ class WaveformEditor:
         self.canvas.bind("<B1-Motion>", lambda e: self._handle_drag(e, 1))
         self.canvas.bind("<Button-3>", lambda e: self._handle_click(e, 0))
         self.canvas.bind("<B3-Motion>", lambda e: self._handle_drag(e, 0))
+        self.canvas.bind("<ButtonRelease-1>", self._end_stroke)
+        self.canvas.bind("<ButtonRelease-3>", self._end_stroke)
+        self.canvas.bind("<Shift-Button-1>", self._start_selection)
+        self.canvas.bind("<Shift-B1-Motion>", self._drag_selection)
         
         self.master.bind("<Key>", self._on_key_press)
         self.master.bind("<Return>", lambda e: self._apply_buffered_length(1))
@@ -506,55 +285,105 @@ class WaveformEditor:
         self.master.bind("<Control-z>", self._undo)
         self.master.bind("<Control-y>", self._redo)
 
+        # 선택 일괄 편집 단축키
+        self.master.bind("<Control-h>", lambda e: self._fill_selection(1))
+        self.master.bind("<Control-l>", lambda e: self._fill_selection(0))
+        self.master.bind("<Control-i>", lambda e: self._invert_selection())
+        self.master.bind("<Control-Left>", lambda e: self._shift_selection(-1, False))
+        self.master.bind("<Control-Right>", lambda e: self._shift_selection(1, False))
+        self.master.bind("<Control-Shift-Left>", lambda e: self._shift_selection(-1, True))
+        self.master.bind("<Control-Shift-Right>", lambda e: self._shift_selection(1, True))
+        self.master.bind("<Control-t>", lambda e: self._tile_selection())
+        self.master.bind("<Control-C>", lambda e: self._copy_selection())
+        self.master.bind("<Control-V>", lambda e: self._paste_selection())
+        self.master.bind("<Escape>", lambda e: self._clear_selection())
+
+        # 스크롤 / 줌 (Ctrl+휠: 커서 위치 기준 확대/축소)
+        self.canvas.bind("<Configure>", lambda e: self.renderer.request_view_update())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Shift-MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Control-MouseWheel>", self._on_mousewheel)
+        for num in (4, 5):
+            self.canvas.bind(f"<Button-{num}>", self._on_mousewheel)
+            self.canvas.bind(f"<Shift-Button-{num}>", self._on_mousewheel)
+            self.canvas.bind(f"<Control-Button-{num}>", self._on_mousewheel)
+        self.master.bind("<Control-equal>", lambda e: self._zoom(2.0))
+        self.master.bind("<Control-minus>", lambda e: self._zoom(0.5))
+        self.master.bind("<Control-0>", lambda e: self._zoom_fit())
+
+    def _on_xscroll(self, first, last):
+        self.h_scroll.set(first, last)
+        self.renderer.request_view_update()
+
+    def _on_yscroll(self, first, last):
+        self.v_scroll.set(first, last)
+        self.signal_list.set_offset(self.canvas.canvasy(0))
+        self.renderer.request_view_update()
+
+    def _on_mousewheel(self, event):
+        # Windows/macOS는 delta, X11은 Button-4/5
+        up = getattr(event, "delta", 0) > 0 or getattr(event, "num", None) == 4
+        if event.state & 0x0004:  # Control
+            self._zoom(1.25 if up else 0.8, event.x)
+        elif event.state & 0x0001:  # Shift
+            self.canvas.xview_scroll(-3 if up else 3, "units")
+        else:
+            self.canvas.yview_scroll(-1 if up else 1, "units")
+
+    def _zoom(self, factor: float, anchor_x=None):
+        self.renderer.zoom(factor, anchor_x)
+        self.status_var.set(f"Zoom: {self.cfg.cell_width:.4g} px/cycle")
+
+    def _zoom_fit(self):
+        self.renderer.zoom_fit()
+        self.status_var.set(f"Zoom: {self.cfg.cell_width:.4g} px/cycle")
+
+    def _zoom_reset(self):
+        self.renderer.zoom_reset()
+        self.status_var.set(f"Zoom: {self.cfg.cell_width:.4g} px/cycle")
+
+    # -------------------- 성능 HUD -------------------- #
+
+    def _toggle_perf_hud(self):
+        """보기 메뉴의 성능 HUD 토글. 켜는 동안만 계측하고 item 생성/삭제를 센다."""
+        if self.perf_hud_var.get():
+            self.perf.reset()
+            self.perf.on_edit = self._schedule_perf_hud
+            self.perf.enable(canvas=self.canvas, widget=self.master)
+            self.perf_var.set(self.perf.summary())
+            self.perf_bar.pack(side=tk.BOTTOM, fill=tk.X, after=self.statusbar)
+        else:
+            self.perf.disable()
+            self.perf_bar.pack_forget()
+
+    def _schedule_perf_hud(self):
+        # 편집마다 갱신하지 않고 최대 5번/초
+        if self._perf_after_id is None:
+            self._perf_after_id = self.master.after(200, self._refresh_perf_hud)
+
+    def _refresh_perf_hud(self):
+        self._perf_after_id = None
+        if self.perf.enabled:
+            self.perf_var.set(self.perf.summary())
+
+    def _export_perf_csv(self):
+        if not self.perf.edits:
+            messagebox.showinfo("Performance", "No measurements yet. Turn on View > Performance HUD and edit first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            self.perf.export_csv(path)
+            self.status_var.set(f"Performance log saved to {path}")
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save file:\n{e}")
+
     def _redraw_all(self):
-        self.canvas.delete("all")
-        total_w = self.cfg.total_width
-        total_h = self.cfg.total_height
-        
-        self.canvas.configure(scrollregion=(0, 0, total_w + 50, total_h))
-        
-        for i in range(self.cfg.num_waves):
-            y_base = i * self.cfg.row_height
-            self.canvas.create_line(0, y_base, total_w, y_base, fill=self.cfg.grid_color)
-            if i == self.model.active_wave_idx:
-                self.canvas.create_rectangle(0, y_base, total_w, y_base + self.cfg.row_height, 
-                                             fill="#f0f8ff", outline="", tags="bg")
-
-        for c in range(self.cfg.num_cycles + 1):
-            x = c * self.cfg.cell_width
-            self.canvas.create_line(x, 0, x, total_h, fill=self.cfg.grid_color, dash=(2, 4))
-            if c % 4 == 0:
-                self.canvas.create_text(x + 2, total_h - 10, text=str(c), anchor="sw", fill="gray", font=("", 8))
-
-        for i in range(self.cfg.num_waves):
-            self._draw_single_wave(i)
-
-    def _draw_single_wave(self, idx):
-        wf = self.model.signals[idx].waveform
-        y_base = idx * self.cfg.row_height
-        high_y = y_base + self.cfg.high_y_offset
-        low_y = y_base + self.cfg.low_y_offset
-        
-        points = []
-        cur_x = 0
-        cur_y = high_y if wf[0] else low_y
-        points.append(cur_x); points.append(cur_y)
-        
-        for c in range(1, len(wf)):
-            x = c * self.cfg.cell_width
-            prev = wf[c-1]
-            curr = wf[c]
-            target_y = high_y if curr else low_y
-            if prev != curr:
-                points.append(x); points.append(cur_y)
-                points.append(x); points.append(target_y)
-                cur_y = target_y
-        points.append(len(wf) * self.cfg.cell_width)
-        points.append(cur_y)
-        
-        color = "blue" if idx == self.model.active_wave_idx else self.cfg.wave_color
-        width = 3 if idx == self.model.active_wave_idx else 2
-        self.canvas.create_line(points, fill=color, width=width, tags=f"wave_{idx}")
+        """레이아웃 변경 시 전체 갱신 (그리드는 크기가 바뀔 때만 다시 그림)."""
+        with self.perf.stage("render"):
+            self.renderer.set_cursor(self.cursor_index)
+            self.renderer.rebuild()
 
     def _get_target_from_event(self, event) -> Tuple[int, int]:
         """
@@ -585,32 +414,71 @@ class WaveformEditor:
         if w_idx is None:  # 유효하지 않은 클릭 위치
             return
 
-        self.model.save_state_for_undo()
+        self._end_stroke()
         self.master.focus_set()
-        self.model.active_wave_idx = w_idx
-        self.cursor_index = c_idx
-        self.pulse_len_buf = ""
-        self.model.signals[w_idx].waveform[c_idx] = val
-        self._update_ui_after_change()
+        with self.perf.edit("click"):
+            self.model.active_wave_idx = w_idx
+            self.model.begin_edit()  # 드래그가 이어져도 Undo 기록은 이것 하나 (_end_stroke에서 닫음)
+            self.cursor_index = c_idx
+            self.pulse_len_buf = ""
+            with self.perf.stage("mutation"):
+                self.model.write_range(w_idx, c_idx, c_idx + 1, val)
+            with self.perf.stage("render"):
+                self._mark_dirty(w_idx, c_idx, c_idx + 1)
+            self._stroke = DragStroke(w_idx, c_idx, val)
+            self._stroke.take()
+            self._update_ui_after_change()
 
     def _handle_drag(self, event, val):
         w_idx, c_idx = self._get_target_from_event(event)
         if w_idx is None: # 유효하지 않은 드래그 위치
             return
 
-        # TODO: 드래그 시작 시 한 번만 상태를 저장하도록 개선할 수 있음
-        if w_idx != self.model.active_wave_idx:
-            self.model.active_wave_idx = w_idx
-        self.model.signals[w_idx].waveform[c_idx] = val
+        if self._stroke is None or self._stroke.value != val:
+            # 유효 영역 밖에서 시작한 드래그: 여기서 stroke 시작
+            self._end_stroke()
+            self.model.begin_edit()
+            self._stroke = DragStroke(w_idx, c_idx, val)
+        else:
+            self._stroke.add(w_idx, c_idx)
+        self.model.active_wave_idx = w_idx
         self.cursor_index = c_idx
-        self._update_ui_after_change()
+        # motion 이벤트마다 그리지 않고 한 frame에 한 번 몰아서 적용
+        if self._stroke_after_id is None:
+            self._stroke_after_id = self.master.after(self.cfg.stroke_interval_ms, self._flush_stroke)
+
+    def _flush_stroke(self):
+        """모아 둔 드래그 구간을 행별 range write 한 번으로 적용하고 한 번만 다시 그린다."""
+        self._stroke_after_id = None
+        if self._stroke is None:
+            return
+        spans = self._stroke.take()
+        if not spans:
+            return
+        with self.perf.edit("drag"):
+            for row, row_spans in spans.items():
+                for start, end in row_spans:
+                    with self.perf.stage("mutation"):
+                        self.model.write_range(row, start, end, self._stroke.value)
+                    with self.perf.stage("render"):
+                        self._mark_dirty(row, start, end)
+            self._update_ui_after_change()
+
+    def _end_stroke(self, event=None):
+        """버튼을 떼면 남은 구간을 바로 적용하고 stroke와 그 Undo 단위를 끝낸다."""
+        if self._stroke_after_id is not None:
+            self.master.after_cancel(self._stroke_after_id)
+        self._flush_stroke()
+        if self._stroke is not None:
+            self._stroke = None
+            self.model.end_edit()
 
     def _move_wave(self, idx: int, direction: str):
         """지정된 파형을 위 또는 아래로 한 칸 이동시킵니다."""
-        self.model.save_state_for_undo()
-        self.model.move_wave(idx, direction)
-        self._rebuild_control_panel()
-        self._redraw_all()
+        with self.perf.edit("move"):
+            with self.perf.stage("mutation"):
+                self.model.move_wave(idx, direction)
+            self._redraw_all()
 
     def _copy_wave(self, event=None):
         """활성화된 파형을 클립보드에 복사합니다 (Ctrl+C)."""
@@ -625,42 +493,164 @@ class WaveformEditor:
         if isinstance(self.master.focus_get(), ttk.Entry):
             return # 텍스트 입력 중에는 동작 안 함
         
-        self.model.save_state_for_undo()
-        if self.model.paste_to_active_wave():
-            self._update_ui_after_change()
-            self.status_var.set(f"Pasted to Wave {self.model.active_wave_idx + 1}.")
-        else:
-            self.status_var.set("Clipboard is empty.")
+        with self.perf.edit("paste"):
+            with self.perf.stage("mutation"):
+                pasted = self.model.paste_to_active_wave()
+            if pasted:
+                with self.perf.stage("render"):
+                    self._mark_dirty(self.model.active_wave_idx)
+                self._update_ui_after_change()
+                self._set_status(f"Pasted to Wave {self.model.active_wave_idx + 1}.")
+            else:
+                self._set_status("Clipboard is empty.")
+
+    # -------------------- 사각형 선택 일괄 편집 -------------------- #
+
+    def _cell_from_event(self, event) -> Tuple[int, int]:
+        """이벤트 좌표의 (행, cycle). 선택은 행 안 어디서나 잡을 수 있도록 범위 안으로 자른다."""
+        row = int(self.canvas.canvasy(event.y) // self.cfg.row_height)
+        cycle = int(self.canvas.canvasx(event.x) // self.cfg.cell_width)
+        return (min(max(row, 0), self.model.num_waves - 1),
+                min(max(cycle, 0), self.model.num_cycles - 1))
+
+    def _set_selection(self, selection: Optional[Selection]):
+        self.selection = selection
+        self.renderer.set_selection(selection)
+
+    def _start_selection(self, event):
+        self._end_stroke()
+        self.master.focus_set()
+        self._select_anchor = self._cell_from_event(event)
+        self._drag_selection(event)
+
+    def _drag_selection(self, event):
+        if self._select_anchor is None:
+            return self._start_selection(event)
+        row, cycle = self._cell_from_event(event)
+        sel = Selection.from_corners(*self._select_anchor, row, cycle)
+        self._set_selection(sel)
+        self._set_status(f"Selection: W{sel.rows[0] + 1}-W{sel.rows[-1] + 1} x "
+                         f"cycle {sel.start}-{sel.end - 1} ({sel.length} cycles)")
+
+    def _clear_selection(self):
+        self._select_anchor = None
+        self._set_selection(None)
+
+    def _require_selection(self) -> Optional[Selection]:
+        if self.selection is None:
+            self._set_status("No selection. Shift+드래그로 신호 x cycle 구간을 선택하세요.")
+        return self.selection
+
+    def _selection_op(self, label: str, apply: Callable[[Selection], int]):
+        """선택 사각형에 모델 일괄 연산 하나를 적용하고 바뀐 구간만 다시 그린다."""
+        if isinstance(self.master.focus_get(), ttk.Entry):
+            return  # 텍스트 입력 중에는 동작 안 함
+        sel = self._require_selection()
+        if sel is None:
+            return
+        self._end_stroke()
+        with self.perf.edit(label):
+            with self.perf.stage("mutation"):
+                changed = apply(sel)
+            if changed:
+                with self.perf.stage("render"):
+                    for row in sel.rows:
+                        self._mark_dirty(row, sel.start, sel.end)
+                self._update_ui_after_change()
+            self._set_status(f"{label}: {changed} signals x {sel.length} cycles")
+
+    def _fill_selection(self, value: int):
+        self._selection_op("fill high" if value else "fill low", lambda sel: self.model.fill_selection(sel, value))
+
+    def _invert_selection(self):
+        self._selection_op("invert", self.model.invert_selection)
+
+    def _shift_selection(self, amount: int, wrap: bool):
+        self._selection_op("rotate" if wrap else "shift",
+                           lambda sel: self.model.shift_selection(sel, amount, wrap))
+
+    def _shift_selection_by(self):
+        if self._require_selection() is None:
+            return
+        amount = simpledialog.askinteger("Shift By", "Cycles (음수: 왼쪽):", parent=self.master)
+        if not amount:
+            return
+        wrap = messagebox.askyesno("Shift By", "Rotate (밀려난 값을 반대쪽으로)?\nNo: 빈 자리는 0", parent=self.master)
+        self._shift_selection(amount, wrap)
+
+    def _tile_selection(self):
+        if self._require_selection() is None:
+            return
+        period = simpledialog.askinteger("Repeat Tile", "반복할 앞부분 길이 (cycles):", parent=self.master,
+                                         minvalue=1, maxvalue=max(1, self.selection.length))
+        if period:
+            self._selection_op("tile", lambda sel: self.model.tile_selection(sel, period))
+
+    def _copy_selection(self):
+        if isinstance(self.master.focus_get(), ttk.Entry):
+            return
+        if self._require_selection() is None:
+            return
+        n = self.model.copy_selection(self.selection)
+        self._set_status(f"Copied {n} signals x {self.selection.length} cycles.")
+
+    def _paste_selection(self):
+        if not self.model.range_clipboard:
+            self._set_status("Range clipboard is empty.")
+            return
+        self._selection_op("paste range", self.model.paste_selection)
 
     def _undo(self, event=None):
-        if self.model.undo():
-            self._full_ui_update_after_state_change()
-            self.status_var.set("Undo successful.")
-        else:
-            self.status_var.set("Nothing to undo.")
+        self._end_stroke()
+        with self.perf.edit("undo"):
+            with self.perf.stage("mutation"):
+                record = self.model.undo()
+            if record:
+                self._ui_update_after_history(record)
+                self._set_status("Undo successful.")
+            else:
+                self._set_status("Nothing to undo.")
 
     def _redo(self, event=None):
-        if self.model.redo():
+        self._end_stroke()
+        with self.perf.edit("redo"):
+            with self.perf.stage("mutation"):
+                record = self.model.redo()
+            if record:
+                self._ui_update_after_history(record)
+                self._set_status("Redo successful.")
+            else:
+                self._set_status("Nothing to redo.")
+
+    def _ui_update_after_history(self, record: EditRecord):
+        """Undo/Redo 후 갱신. 구간 편집이면 바뀐 구간만 다시 그린다."""
+        if record.structural:
             self._full_ui_update_after_state_change()
-            self.status_var.set("Redo successful.")
-        else:
-            self.status_var.set("Nothing to redo.")
+            return
+        with self.perf.stage("render"):
+            for row, start, end in record.dirty_ranges():
+                self._mark_dirty(row, start, end)
+        self.cursor_index = min(self.cursor_index, self.model.num_cycles - 1)
+        self._update_ui_after_change()
 
     def _update_ui_after_change(self):
-        self._redraw_all()
+        # dirty로 표시된 행, 활성 행 하이라이트, 커서만 갱신
+        with self.perf.stage("render"):
+            self.renderer.set_active(self.model.active_wave_idx)
+            self.renderer.set_cursor(self.cursor_index)
+            self.renderer.flush()
         self._update_info_panel()
         active_idx = self.model.active_wave_idx
         val = self.model.signals[active_idx].waveform[self.cursor_index]
         val_str = "HIGH" if val else "LOW"
-        self.status_var.set(f"Wave {active_idx+1} @ {self.cursor_index}: Set {val_str}")
+        self._set_status(f"Wave {active_idx+1} @ {self.cursor_index}: Set {val_str}")
 
     def _full_ui_update_after_state_change(self):
         """Undo/Redo 같이 모델 전체가 바뀔 때 UI를 완전히 새로고침합니다."""
         # 모델의 변경사항을 Config에도 반영
         self.cfg.num_cycles = self.model.num_cycles
         self.cfg.num_waves = self.model.num_waves
-        # 컨트롤 패널과 캔버스 모두 새로 그림
-        self._rebuild_control_panel()
+        # 캔버스를 새로 그림 (신호 컨트롤 목록은 모델의 structure 알림으로 이미 갱신됨)
         self._redraw_all()
         self._update_info_panel()
 
@@ -673,98 +663,165 @@ class WaveformEditor:
     def _apply_buffered_length(self, val):
         if not self.pulse_len_buf: return
         try:
-            self.model.save_state_for_undo()
             length = int(self.pulse_len_buf)
             start = self.cursor_index
             end = min(self.cfg.num_cycles, start + length)
-            active_wave = self.model.signals[self.model.active_wave_idx].waveform
-            for i in range(start, end):
-                active_wave[i] = val
-            self._update_ui_after_change()
+            with self.perf.edit("length"):
+                with self.perf.stage("mutation"):
+                    self.model.write_range(self.model.active_wave_idx, start, end, val)
+                with self.perf.stage("render"):
+                    self._mark_dirty(self.model.active_wave_idx, start, end)
+                self._update_ui_after_change()
             self.pulse_len_buf = ""
         except ValueError: pass
 
+    def _set_status(self, text: str):
+        with self.perf.stage("status"):
+            self.status_var.set(text)
+
+    def _mark_dirty(self, row: int, start: int = 0, end: Optional[int] = None):
+        """row의 [start, end) 구간이 바뀌었음을 렌더러에 알린다 (pulse 색인은 모델이 갱신)."""
+        self.renderer.mark_dirty(row, start, end)
+
     def _update_info_panel(self):
-        self.text_info.configure(state="normal")
-        self.text_info.delete("1.0", tk.END)
-        wf = self.model.signals[self.model.active_wave_idx].waveform
-        pulses = []
-        in_pulse = False
-        start = 0
-        for i, v in enumerate(wf):
-            if v == 1 and not in_pulse:
-                in_pulse = True; start = i
-            elif v == 0 and in_pulse:
-                in_pulse = False; pulses.append((start, i - start))
-        if in_pulse: pulses.append((start, len(wf) - start))
-        
-        self.text_info.insert(tk.END, f"[Signal {self.model.active_wave_idx+1}]\nTotal: {len(wf)}\nPulses: {len(pulses)}\n\n")
-        for i, (s, w) in enumerate(pulses):
-            self.text_info.insert(tk.END, f"#{i+1}: Start={s}, W={w}\n")
-        self.text_info.configure(state="disabled")
+        with self.perf.stage("info"):
+            idx = self.model.active_wave_idx
+            self.pulse_table.set_index(self.model.signals[idx].edge_index, f"[Signal {idx+1}]")
 
     def _clear_current_wave(self):
-        self.model.save_state_for_undo()
-        active_wave = self.model.signals[self.model.active_wave_idx].waveform
-        for i in range(len(active_wave)):
-            active_wave[i] = 0
-        self._update_ui_after_change()
+        with self.perf.edit("clear"):
+            with self.perf.stage("mutation"):
+                self.model.write_range(self.model.active_wave_idx, 0, self.model.num_cycles, 0)
+            with self.perf.stage("render"):
+                self._mark_dirty(self.model.active_wave_idx)
+            self._update_ui_after_change()
 
     def _save_waveform(self):
         # 저장/불러오기는 Undo/Redo 기록에 포함하지 않음
-        """현재 파형 상태를 JSON 파일로 저장합니다."""
+        """현재 파형 상태를 파일로 저장합니다 (.wfb: binary, .json: 기존 JSON 형식)."""
         path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("Waveform JSON", "*.json"), ("All Files", "*.*")]
+            defaultextension=BINARY_EXT,
+            filetypes=[("Waveform Binary", f"*{BINARY_EXT}"), ("Waveform JSON", "*.json"),
+                       ("All Files", "*.*")]
         )
         if not path:
             return
 
-        data_to_save = {
-            "config": {
-                "num_cycles": self.cfg.num_cycles,
-                "num_waves": self.cfg.num_waves,
-            },
-            "signals": [s.get_data_dict() for s in self.model.signals]
-        }
-
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, indent=2)
+            signals = [(s.name, s.mode, s.waveform) for s in self.model.signals]
+            write_project(path, self.model.num_cycles, signals)
             self.status_var.set(f"Waveform saved to {path}")
             messagebox.showinfo("Success", f"Waveform saved successfully!")
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save file:\n{e}")
 
     def _load_waveform(self):
-        """JSON 파일에서 파형 상태를 불러옵니다."""
+        """파형 파일(binary 또는 JSON)을 불러옵니다. binary는 파형을 화면에 필요할 때 decode."""
         path = filedialog.askopenfilename(
-            filetypes=[("Waveform JSON", "*.json"), ("All Files", "*.*")]
+            filetypes=[("Waveform Files", f"*{BINARY_EXT} *.json"), ("All Files", "*.*")]
         )
         if not path:
             return
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            num_cycles, signals = read_project(path)
 
             # 데이터 구조를 기반으로 그리드와 파형을 재설정합니다.
-            self._reconfigure_grid(data['config']['num_cycles'], data['config']['num_waves'])
-            for i, sig_data in enumerate(data['signals']):
-                self.model.signals[i].name.set(sig_data['name'])
-                self.model.signals[i].mode.set(sig_data['mode'])
-                self.model.signals[i].waveform = sig_data['waveform']
+            self._reconfigure_grid(num_cycles, len(signals))
+            for i, sig_data in enumerate(signals):
+                self.model.set_meta(i, sig_data.name, sig_data.mode, record=False)
+                self.model.signals[i].set_lazy(sig_data.load)
             self._redraw_all()
             self.status_var.set(f"Loaded waveform from {path}")
             messagebox.showinfo("Success", "Waveform loaded successfully!")
         except Exception as e:
             messagebox.showerror("Load Error", f"Failed to load or parse file:\n{e}")
 
+    def _import_vcd(self):
+        """VCD dump에서 선택한 신호를 샘플링해 현재 프로젝트를 대체합니다 (헤더만 먼저 읽음)."""
+        path = filedialog.askopenfilename(filetypes=[("VCD", "*.vcd"), ("All Files", "*.*")])
+        if not path:
+            return
+        try:
+            header = scan_vcd(path)
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Failed to read VCD header:\n{e}")
+            return
+
+        top = tk.Toplevel(self.master)
+        top.title("Import VCD")
+        top.geometry("420x460")
+        top.transient(self.master)
+        top.grab_set()
+
+        ttk.Label(top, text="[Signals] (vector는 bit마다 한 신호)").pack(anchor="w", padx=10, pady=(10, 5))
+        list_frame = ttk.Frame(top)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, exportselection=False)
+        scroll = ttk.Scrollbar(list_frame, orient="vertical", command=listbox.yview)
+        listbox.config(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for v in header.vars:
+            listbox.insert(tk.END, v.full_name)
+
+        var_sample = tk.StringVar(value="period")
+        var_period = tk.StringVar(value="5n")
+        var_clock = tk.StringVar(value="")
+        var_cycles = tk.StringVar(value="")
+
+        opt = ttk.Frame(top)
+        opt.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Radiobutton(opt, text="Period (1칸):", variable=var_sample, value="period").grid(row=0, column=0, sticky="w")
+        ttk.Entry(opt, textvariable=var_period, width=15).grid(row=0, column=1, padx=5, pady=2)
+        ttk.Radiobutton(opt, text="Clock edges:", variable=var_sample, value="clock").grid(row=1, column=0, sticky="w")
+        ttk.Combobox(opt, textvariable=var_clock, width=25,
+                     values=[v.full_name for v in header.vars if v.width == 1]).grid(row=1, column=1, padx=5, pady=2)
+        ttk.Label(opt, text="Cycles (빈칸=전체):").grid(row=2, column=0, sticky="w")
+        ttk.Entry(opt, textvariable=var_cycles, width=15).grid(row=2, column=1, padx=5, pady=2)
+
+        def on_import():
+            selected = [header.vars[i].full_name for i in listbox.curselection()]
+            if not selected:
+                messagebox.showerror("Error", "Select at least one signal.")
+                return
+            by_clock = var_sample.get() == "clock"
+            try:
+                cycles = int(var_cycles.get()) if var_cycles.get().strip() else None
+                num_cycles, signals = read_vcd(path, selected,
+                                               period=None if by_clock else var_period.get(),
+                                               clock=var_clock.get() if by_clock else None,
+                                               num_cycles=cycles, header=header)
+                if num_cycles < 1:
+                    raise ValueError("no samples in the selected time range")
+            except Exception as e:
+                messagebox.showerror("Import Error", str(e))
+                return
+            top.destroy()
+
+            self._reconfigure_grid(num_cycles, len(signals))
+            for i, (name, mode, waveform) in enumerate(signals):
+                self.model.set_meta(i, name, mode, record=False)
+                self.model.signals[i].waveform = waveform
+            self._redraw_all()
+            self.status_var.set(f"Imported {len(signals)} signals x {num_cycles} cycles from {path}")
+
+        btn_frame = ttk.Frame(top)
+        btn_frame.pack(pady=(0, 10))
+        ttk.Button(btn_frame, text="Import", command=on_import).pack(side=tk.LEFT, padx=10)
+        ttk.Button(btn_frame, text="Cancel", command=top.destroy).pack(side=tk.LEFT, padx=10)
+
     def _export_verilog_a(self):
-        # 1. Parameter Input Dialog
+        self._export_dialog(pwl=False)
+
+    def _export_spice_pwl(self):
+        self._export_dialog(pwl=True)
+
+    def _export_dialog(self, pwl: bool):
+        # 1. Parameter Input Dialog (Verilog-A / SPICE PWL 공용)
         top = tk.Toplevel(self.master)
         top.title("Export Settings")
-        top.geometry("350x250")
+        top.geometry("350x320" if pwl else "350x250")
         top.transient(self.master)
         top.grab_set()
         
@@ -802,6 +859,19 @@ class WaveformEditor:
         ttk.Entry(top, textvariable=var_vlow, width=15).grid(row=row, column=1, padx=5, pady=2)
         row += 1
 
+        var_fmt = tk.StringVar(value="spectre")
+        var_datafiles = tk.BooleanVar(value=False)
+        if pwl:
+            ttk.Label(top, text="[Netlist]").grid(row=row, column=0, sticky="w", padx=10, pady=(15,5))
+            row += 1
+            ttk.Label(top, text="Format:").grid(row=row, column=0, sticky="e", padx=5)
+            ttk.Combobox(top, textvariable=var_fmt, values=["spectre", "spice"], state="readonly",
+                         width=12).grid(row=row, column=1, padx=5, pady=2)
+            row += 1
+            ttk.Checkbutton(top, text="외부 PWL 파일로 저장", variable=var_datafiles).grid(
+                row=row, column=0, columnspan=2, sticky="w", padx=10)
+            row += 1
+
         def on_export():
             if not all([var_tck.get(), var_tr.get(), var_tf.get(), var_vhigh.get()]):
                 messagebox.showerror("Error", "All fields are required.")
@@ -823,22 +893,30 @@ class WaveformEditor:
 
             # 모델에서 데이터 가져오기
             waveforms = [s.waveform for s in self.model.signals]
-            names = [s.name.get() for s in self.model.signals]
-            modes = [s.mode.get() for s in self.model.signals]
+            names = [s.name for s in self.model.signals]
+            modes = [s.mode for s in self.model.signals]
             
+            fmt = var_fmt.get()
+            data_files = var_datafiles.get()
+            top.destroy()
+            if pwl:
+                ext = ".scs" if fmt == "spectre" else ".sp"
+                path = filedialog.asksaveasfilename(defaultextension=ext, filetypes=[("Netlist", f"*{ext}")])
+            else:
+                path = filedialog.asksaveasfilename(defaultextension=".va", filetypes=[("Verilog-A", "*.va")])
+            if not path:
+                return
             try:
-                # VerilogAGenerator는 순수 데이터 리스트를 받으므로 변경 없음
-                code = VerilogAGenerator.generate(waveforms, names, modes, params)
+                if pwl:
+                    export_pwl(path, waveforms, names, modes, params, fmt, data_files)
+                else:
+                    # 전체 문자열을 만들지 않고 파일에 줄 단위로 바로 씀
+                    with open(path, "w", encoding="utf-8") as f:
+                        VerilogAGenerator.write(f, waveforms, names, modes, params, self.export_cache)
             except Exception as e:
                 messagebox.showerror("Generation Error", str(e))
                 return
-            
-            top.destroy()
-            path = filedialog.asksaveasfilename(defaultextension=".va", filetypes=[("Verilog-A", "*.va")])
-            if path:
-                with open(path, "w", encoding="utf-8") as f:
-                    f.write(code)
-                messagebox.showinfo("Success", f"Saved to {path}")
+            messagebox.showinfo("Success", f"Saved to {path}")
 
         btn_frame = ttk.Frame(top)
         btn_frame.grid(row=row+1, column=0, columnspan=3, pady=20)
@@ -846,6 +924,7 @@ class WaveformEditor:
         ttk.Button(btn_frame, text="Cancel", command=top.destroy).pack(side=tk.LEFT, padx=10)
 
 if __name__ == "__main__":
+    _load_tk()
     root = tk.Tk()
     try:
         from ctypes import windll
@@ -0,0 +1,161 @@
+"""
+프로젝트 파일 입출력.
+
+- JSON (.json)  : 기존 형식. 사이클마다 숫자 하나라서 큰 프로젝트에는 느리다 (불러오기만 계속 지원).
+- Binary (.wfb) : 헤더(JSON 메타데이터) + 신호별 payload.
+    payload 인코딩
+      "bits"  : BitWaveform.tobytes() 그대로 (cycle당 1 bit)
+      "edges" : 초기값 1 byte + edge 인덱스 배열 (uint32/uint64 little-endian, run-length)
+  불러올 때는 파일을 mmap하고, 신호 파형은 처음 접근할 때 decode한다.
+
+파일 구조:
+    MAGIC(4) | header_len(uint32 LE) | header(JSON, utf-8) | padding | payload...
+    header = {"config": {"num_cycles", "num_waves"},
+              "signals": [{"name", "mode", "encoding", "offset", "size", ...}]}
+    offset은 payload 영역 시작 기준이며 8 byte 정렬.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from waveform_storage import BitWaveform, EdgeWaveform
+
+MAGIC = b"WFB1"
+BINARY_EXT = ".wfb"
+_PREFIX = struct.Struct("<4sI")
+_ALIGN = 8
+
+
+class LazySignal(NamedTuple):
+    """불러온 신호. load()를 호출해야 파형이 decode된다."""
+    name: str
+    mode: str
+    load: Callable[[], Sequence[int]]
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _edge_array(edges: List[int], num_cycles: int) -> array:
+    arr = array("I" if num_cycles < 1 << 32 else "Q", edges)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _encode(waveform, num_cycles: int) -> Tuple[Dict, bytes]:
+    """파형 하나를 (header 항목, payload)로 변환. EdgeWaveform은 더 작으면 edge 형식으로 저장."""
+    if isinstance(waveform, EdgeWaveform):
+        edges = _edge_array(waveform.transitions(), num_cycles)
+        if 1 + len(edges) * edges.itemsize < (len(waveform) + 7) // 8:
+            payload = bytes([waveform[0] if len(waveform) else 0]) + edges.tobytes()
+            return {"encoding": "edges", "itemsize": edges.itemsize}, payload
+        waveform = BitWaveform(waveform)
+    elif not isinstance(waveform, BitWaveform):
+        waveform = BitWaveform(waveform)
+    return {"encoding": "bits"}, waveform.tobytes()
+
+
+def _decoder(buf, start: int, entry: Dict, length: int) -> Callable[[], Sequence[int]]:
+    """mmap 버퍼의 payload를 필요할 때 decode하는 함수를 만든다."""
+    end = start + entry["size"]
+    encoding = entry["encoding"]
+
+    def load():
+        if encoding == "bits":
+            return BitWaveform.frombytes(buf[start:end], length)
+        if encoding == "edges":
+            edges = array("I" if entry["itemsize"] == 4 else "Q")
+            edges.frombytes(buf[start + 1:end])
+            if sys.byteorder == "big":
+                edges.byteswap()
+            return EdgeWaveform.from_edges(buf[start], edges, length)
+        raise ValueError(f"unknown waveform encoding: {encoding!r}")
+
+    return load
+
+
+def is_binary_project(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(path: str, num_cycles: int, signals: Sequence[Tuple[str, str, Sequence[int]]]):
+    """(name, mode, waveform) 목록을 binary 프로젝트로 저장 (임시 파일에 쓴 뒤 교체)."""
+    entries, payloads = [], []
+    offset = 0
+    for name, mode, waveform in signals:
+        entry, payload = _encode(waveform, num_cycles)
+        entry.update(name=name, mode=mode, offset=offset, size=len(payload))
+        entries.append(entry)
+        payloads.append(payload)
+        offset = _align(offset + len(payload))
+    header = json.dumps({
+        "config": {"num_cycles": num_cycles, "num_waves": len(entries)},
+        "signals": entries,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - _PREFIX.size - len(header)))
+        for entry, payload in zip(entries, payloads):
+            f.write(payload)
+            f.write(b"\0" * (_align(len(payload)) - len(payload)))
+    os.replace(tmp_path, path)
+
+
+def read_binary(path: str) -> Tuple[int, List[LazySignal]]:
+    """binary 프로젝트를 mmap으로 연다. 파형은 LazySignal.load() 때 decode."""
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a binary waveform project")
+    header = json.loads(buf[_PREFIX.size:_PREFIX.size + header_len].decode("utf-8"))
+    data_start = _align(_PREFIX.size + header_len)
+    num_cycles = header["config"]["num_cycles"]
+    signals = [LazySignal(e["name"], e["mode"], _decoder(buf, data_start + e["offset"], e, num_cycles))
+               for e in header["signals"]]
+    return num_cycles, signals
+
+
+def write_json(path: str, num_cycles: int, signals: Sequence[Tuple[str, str, Sequence[int]]]):
+    """기존 JSON 형식으로 저장."""
+    data = {
+        "config": {"num_cycles": num_cycles, "num_waves": len(signals)},
+        "signals": [{"name": name, "mode": mode, "waveform": list(waveform)}
+                    for name, mode, waveform in signals],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def read_json(path: str) -> Tuple[int, List[LazySignal]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["config"]["num_cycles"], [
+        LazySignal(s["name"], s["mode"], lambda w=s["waveform"]: w) for s in data["signals"]
+    ]
+
+
+def read_project(path: str) -> Tuple[int, List[LazySignal]]:
+    """파일 앞부분(MAGIC)으로 형식을 판별해서 (num_cycles, signals)를 반환."""
+    if is_binary_project(path):
+        return read_binary(path)
+    return read_json(path)
+
+
+def write_project(path: str, num_cycles: int, signals: Sequence[Tuple[str, str, Sequence[int]]]):
+    """확장자가 .json이면 JSON, 그 외에는 binary 형식으로 저장."""
+    if path.lower().endswith(".json"):
+        write_json(path, num_cycles, signals)
+    else:
+        write_binary(path, num_cycles, signals)
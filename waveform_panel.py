@@ -0,0 +1,246 @@
+"""
+가상화된 편집기 패널 (Virtualized panels).
+
+- PulseTable: waveform_edges.EdgeIndex의 pulse 목록 중 보이는 행만 tk.Text에 쓰는 표.
+  스크롤바 위치는 전체 행 수로 직접 계산한다.
+  요약(pulse 수, High cycle 수, duty, 폭 min/max/mean)은 pulse 목록 대신 항상 위에 표시된다.
+- SignalList: 신호별 컨트롤(이동 버튼, 이름, 모드) 목록. 화면에 보이는 행 수만큼의 위젯만 만들고
+  스크롤하면 재사용한다. 파형 canvas의 세로 스크롤 위치(set_offset)를 따라간다.
+"""
+import math
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple
+
+from waveform_edges import EdgeIndex
+
+
+class PulseTable(ttk.Frame):
+    """
+    요약 + 보이는 행만 그리는 pulse 목록.
+    set_index()로 표시할 EdgeIndex를 바꾸고, 내용이 바뀌면 refresh()를 호출한다.
+    """
+
+    def __init__(self, master, font=("Consolas", 9), **kw):
+        super().__init__(master, **kw)
+        self._font = tkfont.Font(font=font)
+        self._index: Optional[EdgeIndex] = None
+        self._title = ""
+        self._top = 0
+        self._rows = 1
+        self._shown: Tuple = ()
+
+        self.summary_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.summary_var, font=font, justify=tk.LEFT).pack(fill=tk.X)
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.scroll = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(body, width=25, height=10, wrap="none", state="disabled", font=font)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.text.bind("<Configure>", self._on_resize)
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll_by(3))
+
+    # -------------------- 데이터 -------------------- #
+
+    def set_index(self, index: Optional[EdgeIndex], title: str = ""):
+        """표시할 신호를 바꾼다. 같은 신호면 스크롤 위치를 유지."""
+        if index is not self._index:
+            self._top = 0
+        self._index = index
+        self._title = title
+        self.refresh()
+
+    def refresh(self):
+        """요약과 보이는 행을 다시 쓴다. 보이는 행이 그대로면 Text는 건드리지 않는다."""
+        index = self._index
+        if index is None:
+            self.summary_var.set(self._title)
+            self._show(())
+            return
+        st = index.summary()
+        self.summary_var.set(
+            f"{self._title}\nTotal: {index.length}  Pulses: {st['pulses']}\n"
+            f"High: {st['high']} ({st['duty']:.1%})\n"
+            f"W min/max/mean: {st['min']}/{st['max']}/{st['mean']:.1f}")
+        n = len(index)
+        self._top = max(0, min(self._top, n - self._rows))
+        stop = min(n, self._top + self._rows)
+        self._show(tuple(index[i] + (i,) for i in range(self._top, stop)))
+        self.scroll.set(*((self._top / n, stop / n) if n else (0.0, 1.0)))
+
+    def _show(self, rows: Tuple):
+        if rows == self._shown:
+            return
+        self._shown = rows
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(f"#{i + 1}: Start={s}, W={w}" for s, w, i in rows))
+        self.text.configure(state="disabled")
+
+    # -------------------- 스크롤 -------------------- #
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self._font.metrics("linespace"))
+        if rows != self._rows:
+            self._rows = rows
+            self.refresh()
+
+    def _scroll_by(self, delta: int):
+        self._top += delta
+        self.refresh()
+        return "break"
+
+    def _on_wheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, *args):
+        n = len(self._index) if self._index is not None else 0
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = self._rows if args[2] == "pages" else 1
+            self._top += int(args[1]) * step
+        self.refresh()
+
+
+class _SignalRow:
+    """SignalList의 재사용되는 행 위젯 묶음. row는 지금 표시 중인 신호 번호 (None이면 비어 있음)."""
+    __slots__ = ("frame", "up", "down", "label", "name_var", "mode_var", "row")
+
+    def __init__(self, owner: "SignalList"):
+        self.row: Optional[int] = None
+        self.frame = ttk.Frame(owner, style="Controls.TFrame")
+
+        # 파형 이동 버튼
+        move_btn_frame = ttk.Frame(self.frame, style="Controls.TFrame")
+        move_btn_frame.pack(side=tk.LEFT, padx=(2, 0), fill=tk.Y)
+        self.up = ttk.Button(move_btn_frame, text="▲", width=2, command=lambda: owner._move(self, 'up'))
+        self.up.pack(side=tk.TOP, expand=True, fill=tk.BOTH, pady=(1, 0))
+        self.down = ttk.Button(move_btn_frame, text="▼", width=2, command=lambda: owner._move(self, 'down'))
+        self.down.pack(side=tk.BOTTOM, expand=True, fill=tk.BOTH, pady=(0, 1))
+
+        # 나머지 컨트롤 (입력은 Undo 기록 없이 모델에 바로 반영)
+        inner = ttk.Frame(self.frame, style="Controls.TFrame")
+        inner.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=10)
+        self.label = ttk.Label(inner, width=4, anchor="center")
+        self.label.pack(side=tk.LEFT, padx=2)
+        self.name_var = tk.StringVar()
+        self.mode_var = tk.StringVar()
+        self.name_var.trace_add("write", lambda *_: owner._edited(self, name=self.name_var.get()))
+        self.mode_var.trace_add("write", lambda *_: owner._edited(self, mode=self.mode_var.get()))
+        ttk.Entry(inner, textvariable=self.name_var, width=10, justify="center").pack(side=tk.LEFT, padx=2)
+        ttk.Combobox(inner, textvariable=self.mode_var, values=owner.modes, width=8,
+                     state="readonly").pack(side=tk.LEFT, padx=2)
+
+        for widget in (self.frame, move_btn_frame, inner, self.label, self.up, self.down):
+            owner._bind_wheel(widget)
+
+
+class SignalList(ttk.Frame):
+    """
+    모델 신호마다 한 줄인 컨트롤 목록 (보이는 행만 위젯을 가진다).
+    신호 row는 항상 pool[row % len(pool)] 위젯에 표시되므로 한 줄 스크롤하면 한 줄만 다시 채운다.
+    모델을 구독해서 이름/모드 변경과 구조 변경(이동, Undo, 불러오기, 크기 변경)을 제자리에서 반영한다.
+    """
+
+    def __init__(self, master, model, row_height: int, on_move: Callable[[int, str], None],
+                 on_wheel: Optional[Callable] = None, modes=("one-shot", "반복"), **kw):
+        super().__init__(master, **kw)
+        self.model = model
+        self.row_height = row_height
+        self.modes = list(modes)
+        self.on_move = on_move
+        self.on_wheel = on_wheel
+        self._offset = 0.0
+        self._pool: List[_SignalRow] = []
+
+        self.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self)
+        model.subscribe(self._on_model_event)
+
+    # -------------------- 표시 -------------------- #
+
+    def set_offset(self, y: float):
+        """파형 canvas 맨 위의 canvas y 좌표. 보이는 행을 다시 배치한다."""
+        self._offset = y
+        self._layout()
+
+    def refresh(self):
+        """보이는 행 전체를 모델에서 다시 채운다."""
+        for slot in self._pool:
+            slot.row = None
+        self._layout()
+
+    def _layout(self):
+        pool, rh = self._pool, self.row_height
+        if not pool:
+            return
+        n = self.model.num_waves
+        first = max(0, int(self._offset // rh))
+        shown = set()
+        for row in range(first, min(n, first + len(pool))):
+            slot = pool[row % len(pool)]
+            if slot.row != row:
+                self._fill(slot, row)
+            slot.frame.place(x=0, y=row * rh - self._offset, relwidth=1.0, height=rh)
+            shown.add(id(slot))
+        for slot in pool:
+            if id(slot) not in shown:
+                slot.row = None
+                slot.frame.place_forget()
+
+    def _fill(self, slot: _SignalRow, row: int):
+        sig = self.model.signals[row]
+        # row를 먼저 바꿔야 변수 trace가 새 신호에 같은 값을 써서 아무 변화가 없다
+        slot.row = row
+        slot.label.configure(text=f"W{row + 1}")
+        slot.name_var.set(sig.name)
+        slot.mode_var.set(sig.mode)
+        slot.up.configure(state="disabled" if row == 0 else "normal")
+        slot.down.configure(state="disabled" if row == self.model.num_waves - 1 else "normal")
+
+    def _on_resize(self, event):
+        # 부분적으로 보이는 위/아래 행까지 덮을 만큼
+        need = math.ceil(event.height / self.row_height) + 1
+        if need > len(self._pool):
+            self._pool.extend(_SignalRow(self) for _ in range(need - len(self._pool)))
+            self.refresh()  # pool 크기가 바뀌면 row -> 위젯 대응이 바뀐다
+
+    # -------------------- 모델 / 입력 -------------------- #
+
+    def _slot_of(self, row: int) -> Optional[_SignalRow]:
+        if not self._pool:
+            return None
+        slot = self._pool[row % len(self._pool)]
+        return slot if slot.row == row else None
+
+    def _on_model_event(self, event: str, *args):
+        if event == "meta":
+            slot = self._slot_of(args[0])
+            if slot is not None:
+                sig = self.model.signals[slot.row]
+                for var, value in ((slot.name_var, sig.name), (slot.mode_var, sig.mode)):
+                    if var.get() != value:
+                        var.set(value)
+        elif event == "structure":
+            self.refresh()
+
+    def _edited(self, slot: _SignalRow, **meta):
+        if slot.row is not None and slot.row < self.model.num_waves:
+            self.model.set_meta(slot.row, record=False, **meta)
+
+    def _move(self, slot: _SignalRow, direction: str):
+        if slot.row is not None:
+            self.on_move(slot.row, direction)
+
+    def _bind_wheel(self, widget):
+        if self.on_wheel is None:
+            return
+        for seq in ("<MouseWheel>", "<Shift-MouseWheel>",
+                    "<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>"):
+            widget.bind(seq, self.on_wheel)
@@ -0,0 +1,227 @@
+"""
+편집 파이프라인 계측 (Performance HUD).
+
+편집 한 번(클릭, 드래그 frame, Undo/Redo, 붙여넣기 등)을 단계별로 나눠 시간을 잰다.
+    mutation : 모델 변경 (write_range, move_wave, undo/redo 적용 ...)
+    undo     : Undo 기록/스냅샷 (save_state_for_undo, 바뀔 구간 복사)
+    render   : 캔버스 갱신 (renderer flush / rebuild)
+    info     : 정보 패널 갱신
+    status   : 상태 표시줄 갱신
+    tk       : Tk의 idle 작업 (geometry 계산, 실제 그리기) - update_idletasks로 측정
+단계 시간은 중첩된 단계를 뺀 순수 시간이라서 합이 편집 전체 시간이 된다.
+캔버스 item 생성/삭제 수도 함께 센다.
+
+기본은 꺼져 있고, 꺼진 상태의 비용은 stage() 호출 한 번(공유 null context)뿐이다.
+최근 window개의 편집으로 p50/p95/p99를 계산하고 CSV로 내보낼 수 있다.
+"""
+import csv
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+STAGES = ("mutation", "undo", "render", "info", "status", "tk")
+_CREATE_METHODS = ("create_line", "create_rectangle", "create_polygon", "create_text",
+                   "create_oval", "create_image", "create_window")
+
+
+class _NullStage:
+    """계측이 꺼져 있을 때 쓰는 아무 일도 하지 않는 context."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullStage()
+
+
+class _Stage:
+    """한 단계의 시간을 잰다. 안쪽 단계 시간은 바깥 단계에서 빠진다."""
+    __slots__ = ("monitor", "name", "t0", "child")
+
+    def __init__(self, monitor: "PerfMonitor", name: str):
+        self.monitor = monitor
+        self.name = name
+        self.child = 0.0
+
+    def __enter__(self):
+        self.monitor._stack.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        stack = self.monitor._stack
+        stack.pop()
+        if stack:
+            stack[-1].child += elapsed
+        self.monitor._add(self.name, elapsed - self.child)
+        return False
+
+
+class _Edit:
+    """편집 한 건의 경계. 중첩되면 가장 바깥 것만 기록한다."""
+    __slots__ = ("monitor", "label", "outer")
+
+    def __init__(self, monitor: "PerfMonitor", label: str):
+        self.monitor = monitor
+        self.label = label
+
+    def __enter__(self):
+        m = self.monitor
+        self.outer = m._current is None
+        if self.outer:
+            m._current = {"label": self.label, "created": m.items_created, "deleted": m.items_deleted}
+            m._t_edit = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        m = self.monitor
+        if not self.outer:
+            return False
+        if m.widget is not None:
+            with m.stage("tk"):
+                m.widget.update_idletasks()
+        row, m._current = m._current, None
+        row["total"] = time.perf_counter() - m._t_edit
+        row["created"] = m.items_created - row["created"]
+        row["deleted"] = m.items_deleted - row["deleted"]
+        row["time"] = time.time()
+        m.edits.append(row)
+        m.count += 1
+        if m.on_edit is not None:
+            m.on_edit()
+        return False
+
+
+class PerfMonitor:
+    """
+    편집 단위 단계별 시간과 캔버스 item 수를 모으는 계측기.
+
+        with perf.edit("click"):
+            with perf.stage("mutation"): model.write_range(...)
+            with perf.stage("render"):   renderer.flush()
+    """
+
+    def __init__(self, window: int = 500):
+        self.enabled = False
+        self.edits: Deque[Dict] = deque(maxlen=window)
+        self.count = 0
+        self.items_created = 0
+        self.items_deleted = 0
+        self.widget = None        # update_idletasks로 Tk 시간을 잴 위젯
+        self.on_edit = None       # 편집 기록이 추가될 때 호출 (HUD 갱신용)
+        self._canvas = None
+        self._stack: List[_Stage] = []
+        self._current: Optional[Dict] = None
+        self._t_edit = 0.0
+
+    # -------------------- 계측 -------------------- #
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def edit(self, label: str):
+        if not self.enabled:
+            return _NULL
+        return _Edit(self, label)
+
+    def _add(self, name: str, seconds: float):
+        if self._current is not None:
+            self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def enable(self, canvas=None, widget=None):
+        """계측을 켠다. canvas를 주면 item 생성/삭제를 센다."""
+        self.enabled = True
+        self.widget = widget
+        if canvas is not None and self._canvas is None:
+            self._attach(canvas)
+
+    def disable(self):
+        self.enabled = False
+        self.widget = None
+        self._stack.clear()
+        self._current = None
+        if self._canvas is not None:
+            self._detach()
+
+    def reset(self):
+        self.edits.clear()
+        self.count = 0
+
+    def _attach(self, canvas):
+        """canvas 인스턴스의 create_*/delete를 세는 wrapper로 덮어쓴다 (클래스는 건드리지 않음)."""
+        self._canvas = canvas
+
+        def counting(create):
+            def wrapper(*args, **kw):
+                self.items_created += 1
+                return create(*args, **kw)
+            return wrapper
+
+        for name in _CREATE_METHODS:
+            if hasattr(canvas, name):
+                setattr(canvas, name, counting(getattr(canvas, name)))
+        delete = canvas.delete
+
+        def counting_delete(*tags):
+            for tag in tags:
+                self.items_deleted += len(canvas.find_withtag(tag))
+            return delete(*tags)
+
+        canvas.delete = counting_delete
+
+    def _detach(self):
+        canvas, self._canvas = self._canvas, None
+        for name in _CREATE_METHODS + ("delete",):
+            canvas.__dict__.pop(name, None)
+
+    # -------------------- 통계 -------------------- #
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        """nearest-rank percentile: 값의 q% 이상을 포함하는 가장 작은 순위 ceil(q/100 * n)."""
+        if not sorted_values:
+            return 0.0
+        k = max(0, min(len(sorted_values) - 1, math.ceil(q / 100.0 * len(sorted_values)) - 1))
+        return sorted_values[k]
+
+    def percentiles(self, name: str, qs=(50, 95, 99)) -> List[float]:
+        """최근 편집들에서 name 단계(또는 "total")의 percentile (초). 그 단계가 없던 편집은 0으로 본다."""
+        values = sorted(e.get(name, 0.0) for e in self.edits)
+        return [self._percentile(values, q) for q in qs]
+
+    def summary(self) -> str:
+        """상태 표시줄용 한 줄 요약 (ms)."""
+        if not self.edits:
+            return "perf: no edits yet"
+        parts = []
+        for name in ("total",) + STAGES:
+            p50, p95, p99 = self.percentiles(name)
+            if p99 > 0:
+                parts.append(f"{name} {p50 * 1e3:.1f}/{p95 * 1e3:.1f}/{p99 * 1e3:.1f}")
+        last = self.edits[-1]
+        return (f"p50/p95/p99 ms [{len(self.edits)} edits] " + "  ".join(parts) +
+                f"  | items +{last['created']}/-{last['deleted']}")
+
+    def export_csv(self, path: str):
+        """편집별 단계 시간(ms)과 item 수, 그 아래에 p50/p95/p99 요약 행을 쓴다."""
+        columns = ("total",) + STAGES
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["edit", "time", "label"] + [f"{c}_ms" for c in columns] +
+                            ["items_created", "items_deleted"])
+            first = self.count - len(self.edits)
+            for i, e in enumerate(self.edits):
+                writer.writerow([first + i + 1, f"{e['time']:.3f}", e["label"]] +
+                                [f"{e.get(c, 0.0) * 1e3:.4f}" for c in columns] +
+                                [e["created"], e["deleted"]])
+            for q in (50, 95, 99):
+                writer.writerow([f"p{q}", "", ""] +
+                                [f"{self.percentiles(c, (q,))[0] * 1e3:.4f}" for c in columns] + ["", ""])
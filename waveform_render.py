@@ -0,0 +1,481 @@
+"""
+캔버스 렌더링 레이어 (Incremental, virtualized canvas renderer).
+
+- 보이는 cycle 창과 행(+여백)만 그린다. 스크롤로 여백을 벗어나면 그 창을 다시 그린다.
+- 그리드/라벨은 편집 사이에 유지한다. 편집 시에는 변경된 행과 cycle 구간만
+  dirty로 표시하고, flush() 때 보이는 창과 겹치는 행만 갱신한다.
+- 1 pixel에 여러 cycle이 들어가는 축소 화면은 min/max 피라미드(MinMaxPyramid)로 그려서,
+  촘촘하게 토글하는 구간은 선분 대신 채워진 블록 하나가 된다.
+- canvas item은 지우고 새로 만들지 않고, 만들어 둔 item을 coords()/itemconfigure()로 갱신한다.
+  (행마다 polyline + 블록 polygon, 활성 행 하이라이트, 선택 사각형 풀, 커서, 그리드 item 풀)
+"""
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from waveform_edges import transitions
+from waveform_storage import BitWaveform
+
+# 피라미드 bucket code (bit mask: 1 = Low 포함, 2 = High 포함)
+LOW, HIGH, MIXED = 1, 2, 3
+BASE_BUCKET = 8  # level 0 bucket 크기 = BitWaveform 1 byte
+
+_BYTE_CODE = bytes(LOW if b == 0 else HIGH if b == 0xFF else MIXED for b in range(256))
+_CODE_RUN = re.compile(rb"(.)\1*", re.DOTALL)
+
+MAX_CELL_WIDTH = 200.0  # 최대 확대 (cycle당 pixel)
+
+
+def _reduce(codes: bytes) -> bytearray:
+    """인접한 두 bucket을 하나로 합친 상위 level (code OR)."""
+    a, b = codes[0::2], codes[1::2]
+    if len(b) < len(a):
+        b += b"\0"
+    merged = int.from_bytes(a, "little") | int.from_bytes(b, "little")
+    return bytearray(merged.to_bytes(len(a), "little"))
+
+
+class MinMaxPyramid:
+    """
+    파형 하나의 다해상도 min/max 요약.
+    level k의 bucket 하나는 BASE_BUCKET * 2^k cycle을 덮고, code로 Low/High/혼합을 나타낸다.
+    """
+
+    def __init__(self, waveform):
+        self.length = len(waveform)
+        self.levels: List[bytearray] = [self._base_codes(waveform, 0, self.length)]
+        while len(self.levels[-1]) > 1:
+            self.levels.append(_reduce(self.levels[-1]))
+
+    @staticmethod
+    def _base_codes(waveform, start: int, end: int) -> bytearray:
+        """[start, end) 구간(start는 8의 배수)의 level 0 code. packed byte를 그대로 translate."""
+        sub = waveform[start:end]
+        packed = (sub if isinstance(sub, BitWaveform) else BitWaveform(sub)).tobytes()
+        codes = bytearray(packed.translate(_BYTE_CODE))
+        rem = (end - start) & 7
+        if rem and codes:
+            # 마지막 bucket은 실제 길이만큼의 bit만 본다
+            mask = (1 << rem) - 1
+            v = packed[-1] & mask
+            codes[-1] = LOW if v == 0 else HIGH if v == mask else MIXED
+        return codes
+
+    def update(self, waveform, start: int, end: int):
+        """[start, end) 구간이 바뀌었을 때 해당 bucket만 모든 level에서 다시 계산."""
+        lo = start // BASE_BUCKET
+        hi = min((end + BASE_BUCKET - 1) // BASE_BUCKET, len(self.levels[0]))
+        if lo >= hi:
+            return
+        self.levels[0][lo:hi] = self._base_codes(
+            waveform, lo * BASE_BUCKET, min(hi * BASE_BUCKET, self.length))
+        for k in range(1, len(self.levels)):
+            lo, hi = lo >> 1, (hi + 1) >> 1
+            self.levels[k][lo:hi] = _reduce(self.levels[k - 1][2 * lo:2 * hi])
+
+    def level_for(self, cycles_per_pixel: float) -> int:
+        """bucket 하나가 1 pixel을 넘지 않는 가장 거친 level."""
+        k = int(math.floor(math.log2(max(cycles_per_pixel, BASE_BUCKET) / BASE_BUCKET)))
+        return max(0, min(k, len(self.levels) - 1))
+
+
+class _ItemPool:
+    """같은 종류의 canvas item 재사용 풀. 이번 그리기에서 쓰지 않은 item은 숨긴다."""
+
+    def __init__(self, canvas, kind: str, tag: str, **opts):
+        self.canvas = canvas
+        self.kind = kind
+        self.tag = tag
+        self.opts = opts
+        self.items: List[int] = []
+        self._used = 0
+        self._shown = 0
+
+    def begin(self):
+        self._used = 0
+
+    def place(self, *coords, **opts) -> int:
+        if self._used < len(self.items):
+            item = self.items[self._used]
+            self.canvas.coords(item, *coords)
+            if self._used >= self._shown:
+                opts["state"] = "normal"
+            if opts:
+                self.canvas.itemconfigure(item, **opts)
+        else:
+            create = getattr(self.canvas, f"create_{self.kind}")
+            item = create(*coords, tags=self.tag, **self.opts, **opts)
+            self.items.append(item)
+        self._used += 1
+        return item
+
+    def end(self):
+        for item in self.items[self._used:self._shown]:
+            self.canvas.itemconfigure(item, state="hidden")
+        self._shown = self._used
+
+
+class WaveformRenderer:
+    """WaveformEditor의 캔버스를 보이는 영역과 dirty-region 단위로 갱신하는 렌더러"""
+
+    def __init__(self, canvas, cfg, model):
+        self.canvas = canvas
+        self.cfg = cfg
+        self.model = model
+        self.base_cell_width = cfg.cell_width
+
+        self._layout_key: Optional[Tuple] = None
+        # 현재 그려진 창: (c0, c1, r0, r1) = cycle [c0, c1), row [r0, r1)
+        self._drawn: Optional[Tuple[int, int, int, int]] = None
+        self._pyramids: Dict[int, MinMaxPyramid] = {}
+        self._dirty: Dict[int, Tuple[int, int]] = {}  # row -> dirty cycle 구간 [start, end)
+        self._active: Optional[int] = None
+        self._cursor_cycle = 0
+        self._view_pending = False
+
+        # 재사용 item 레지스트리
+        self._row_items: Dict[int, Tuple[int, int]] = {}  # row -> (polyline, 블록 polygon)
+        self._row_style: Dict[int, bool] = {}             # row -> 활성 스타일 적용 여부
+        self._blocks_shown: set = set()
+        self._spare_items: List[Tuple[int, int]] = []     # 창 밖으로 나간 행의 item
+        self._highlight: Optional[int] = None
+        self._cursor: Optional[int] = None
+        self._selection = None  # rows/start/end를 가진 선택 (waveform_core.Selection) 또는 None
+        self._selection_boxes = _ItemPool(canvas, "rectangle", "selection", fill="#fff2cc", outline="#e0a000")
+        self._row_lines = _ItemPool(canvas, "line", "grid", fill=cfg.grid_color)
+        self._cycle_lines = _ItemPool(canvas, "line", "grid", fill=cfg.grid_color, dash=(2, 4))
+        self._labels = _ItemPool(canvas, "text", "grid", anchor="sw", fill="gray", font=("", 8))
+
+    # -------------------- Dirty 관리 -------------------- #
+
+    def mark_dirty(self, row: int, start: int = 0, end: Optional[int] = None):
+        """row의 [start, end) cycle 구간이 바뀌었음을 기록 (end=None이면 끝까지)."""
+        if end is None:
+            end = self.model.num_cycles
+        if row in self._pyramids:
+            self._pyramids[row].update(self.model.signals[row].waveform, start, end)
+        self._mark_redraw(row, start, end)
+
+    def _mark_redraw(self, row: int, start: int, end: int):
+        if row in self._dirty:
+            s, e = self._dirty[row]
+            start, end = min(s, start), max(e, end)
+        self._dirty[row] = (start, end)
+
+    def set_active(self, row: int):
+        """활성 행 변경: 하이라이트를 옮기고 이전/새 활성 행의 polyline 스타일만 바꾼다."""
+        if row == self._active:
+            return
+        old, self._active = self._active, row
+        for r in (old, row):
+            if r in self._row_items:
+                self._style_row(r)
+        self._place_highlight()
+
+    def set_cursor(self, cycle: int):
+        if cycle != self._cursor_cycle:
+            self._cursor_cycle = cycle
+            self._place_cursor()
+
+    def set_selection(self, selection):
+        """사각형 선택 표시를 바꾼다 (None이면 숨김)."""
+        if selection != self._selection:
+            self._selection = selection
+            if self._drawn is not None:
+                self._place_selection()
+
+    # -------------------- 뷰포트 / 줌 -------------------- #
+
+    def _viewport(self) -> Tuple[float, float, float, float]:
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if w <= 1:  # 아직 화면에 배치되지 않음
+            w, h = 1000, 600
+        return (self.canvas.canvasx(0), self.canvas.canvasx(w),
+                self.canvas.canvasy(0), self.canvas.canvasy(h))
+
+    def _visible_window(self) -> Tuple[int, int, int, int]:
+        cfg = self.cfg
+        x0, x1, y0, y1 = self._viewport()
+        c0 = max(0, int(x0 / cfg.cell_width))
+        c1 = min(cfg.num_cycles, int(x1 / cfg.cell_width) + 1)
+        r0 = max(0, int(y0 // cfg.row_height))
+        r1 = min(cfg.num_waves, int(y1 // cfg.row_height) + 1)
+        return c0, c1, r0, r1
+
+    def request_view_update(self):
+        """스크롤/크기 변경 시 호출. idle 시점에 한 번만 update_view를 실행."""
+        if not self._view_pending:
+            self._view_pending = True
+            self.canvas.after_idle(self.update_view)
+
+    def update_view(self, force: bool = False):
+        """보이는 창이 그려진 창(여백 포함)을 벗어났으면 새 창을 그린다."""
+        self._view_pending = False
+        c0, c1, r0, r1 = self._visible_window()
+        if not force and self._drawn is not None:
+            dc0, dc1, dr0, dr1 = self._drawn
+            if dc0 <= c0 and c1 <= dc1 and dr0 <= r0 and r1 <= dr1:
+                return
+        # 보이는 폭만큼 좌우, 보이는 높이의 절반만큼 위아래 여백
+        span_c = c1 - c0
+        span_r = (r1 - r0) // 2 + 1
+        self._drawn = (max(0, c0 - span_c), min(self.cfg.num_cycles, c1 + span_c),
+                       max(0, r0 - span_r), min(self.cfg.num_waves, r1 + span_r))
+        self._draw_window()
+
+    def zoom(self, factor: float, anchor_x: Optional[float] = None):
+        """anchor_x(화면 좌표) 아래의 cycle을 고정한 채로 확대/축소."""
+        cfg = self.cfg
+        x0, x1, _, _ = self._viewport()
+        view_w = x1 - x0
+        if anchor_x is None:
+            anchor_x = view_w / 2
+        anchor_cycle = self.canvas.canvasx(anchor_x) / cfg.cell_width
+        # 전체 파형이 한 화면에 들어오는 배율까지 축소 가능
+        min_cw = min(self.base_cell_width, view_w / max(1, cfg.num_cycles))
+        new_cw = max(min_cw, min(MAX_CELL_WIDTH, cfg.cell_width * factor))
+        if new_cw == cfg.cell_width:
+            return
+        cfg.cell_width = new_cw
+        self._configure_scrollregion()
+        left = anchor_cycle * new_cw - anchor_x
+        self.canvas.xview_moveto(max(0.0, left / (cfg.total_width + 50)))
+        self.update_view(force=True)
+
+    def zoom_fit(self):
+        x0, x1, _, _ = self._viewport()
+        self.zoom((x1 - x0) / max(1, self.cfg.num_cycles) / self.cfg.cell_width, 0)
+
+    def zoom_reset(self):
+        self.zoom(self.base_cell_width / self.cfg.cell_width)
+
+    # -------------------- 그리기 -------------------- #
+
+    def rebuild(self):
+        """레이아웃이 바뀌었을 때(크기 변경, 행 이동, Undo/Redo, 불러오기) 호출."""
+        cfg = self.cfg
+        layout_key = (cfg.num_cycles, cfg.num_waves, cfg.cell_width, cfg.row_height)
+        if layout_key != self._layout_key:
+            self._configure_scrollregion()
+            self._layout_key = layout_key
+        self._active = self.model.active_wave_idx
+        self._pyramids.clear()
+        self._dirty.clear()
+        self.update_view(force=True)
+
+    def flush(self):
+        """dirty로 표시된 행 중 그려진 창과 겹치는 행만 다시 그린다."""
+        dirty, self._dirty = self._dirty, {}
+        if self._drawn is None:
+            return
+        c0, c1, r0, r1 = self._drawn
+        for row, (start, end) in dirty.items():
+            # edge는 end 위치에도 생기므로 end를 포함해서 비교
+            if r0 <= row < min(r1, self.model.num_waves) and start <= c1 and end >= c0:
+                self._draw_wave(row)
+
+    def _configure_scrollregion(self):
+        cfg = self.cfg
+        self.canvas.configure(scrollregion=(0, 0, cfg.total_width + 50, cfg.total_height))
+
+    def _draw_window(self):
+        """그려진 창 전체(그리드, 하이라이트, 커서, 행들)를 갱신한다."""
+        c0, c1, r0, r1 = self._drawn
+        r1 = min(r1, self.model.num_waves)
+        # 창 밖으로 나간 행의 item은 숨겨서 다른 행이 재사용
+        for row in [r for r in self._row_items if not r0 <= r < r1]:
+            line, block = items = self._row_items.pop(row)
+            self._row_style.pop(row, None)
+            self.canvas.itemconfigure(line, state="hidden")
+            if block in self._blocks_shown:
+                self.canvas.itemconfigure(block, state="hidden")
+                self._blocks_shown.discard(block)
+            self._spare_items.append(items)
+        # 창 밖 행의 피라미드는 버린다 (다시 보이면 재계산)
+        for row in [r for r in self._pyramids if not r0 <= r < r1]:
+            del self._pyramids[row]
+        for row in range(r0, r1):
+            self._draw_wave(row)
+            self._style_row(row)
+        self._draw_grid()
+        self._place_highlight()
+        self._place_selection()
+        self._place_cursor()
+        self._dirty.clear()
+
+    @staticmethod
+    def _step_for(cell_width: float, min_px: float, base: int = 1) -> int:
+        """간격이 min_px 이상이 되는 base * 2^k cycle."""
+        step = base
+        while step * cell_width < min_px:
+            step *= 2
+        return step
+
+    def _draw_grid(self):
+        cfg = self.cfg
+        canvas = self.canvas
+        c0, c1, r0, r1 = self._drawn
+        cw = cfg.cell_width
+        total_h = cfg.total_height
+        x_left, x_right = c0 * cw, c1 * cw
+
+        self._row_lines.begin()
+        for i in range(r0, r1):
+            y_base = i * cfg.row_height
+            self._row_lines.place(x_left, y_base, x_right, y_base)
+        self._row_lines.end()
+
+        grid_step = self._step_for(cw, 10)
+        label_step = self._step_for(cw, 40, 4)
+        y_top, y_bottom = r0 * cfg.row_height, r1 * cfg.row_height
+        self._cycle_lines.begin()
+        self._labels.begin()
+        for c in range(c0 - c0 % grid_step, c1 + 1, grid_step):
+            x = c * cw
+            self._cycle_lines.place(x, y_top, x, y_bottom)
+            if c % label_step == 0:
+                self._labels.place(x + 2, total_h - 10, text=str(c))
+        self._cycle_lines.end()
+        self._labels.end()
+        # 쌓는 순서: 하이라이트 < 선택 < 그리드 < 파형 < 커서
+        canvas.tag_lower("grid")
+        canvas.tag_lower("selection")
+        canvas.tag_lower("bg")
+        canvas.tag_raise("cursor")
+
+    def _place_highlight(self):
+        cfg = self.cfg
+        if self._highlight is None:
+            self._highlight = self.canvas.create_rectangle(0, 0, 0, 0, fill="#f0f8ff", outline="",
+                                                           tags="bg")
+            self.canvas.tag_lower("bg")
+        if self._active is None or not 0 <= self._active < self.model.num_waves:
+            self.canvas.itemconfigure(self._highlight, state="hidden")
+            return
+        y_base = self._active * cfg.row_height
+        self.canvas.coords(self._highlight, 0, y_base, cfg.total_width, y_base + cfg.row_height)
+        self.canvas.itemconfigure(self._highlight, state="normal")
+
+    def _place_selection(self):
+        """그려진 창 안의 선택 행을 연속 구간마다 사각형 하나로 표시."""
+        cfg = self.cfg
+        self._selection_boxes.begin()
+        sel = self._selection
+        if sel is not None and self._drawn is not None:
+            c0, c1, r0, r1 = self._drawn
+            x0 = max(sel.start, c0) * cfg.cell_width
+            x1 = min(sel.end, c1) * cfg.cell_width
+            rows = sorted(r for r in set(sel.rows) if r0 <= r < min(r1, self.model.num_waves))
+            if rows and x0 < x1:
+                run_start = prev = rows[0]
+                for row in rows[1:] + [None]:
+                    if row != prev + 1:
+                        self._selection_boxes.place(x0, run_start * cfg.row_height,
+                                                    x1, (prev + 1) * cfg.row_height)
+                        run_start = row
+                    prev = row
+        self._selection_boxes.end()
+        self.canvas.tag_lower("selection")
+        self.canvas.tag_lower("bg")
+
+    def _place_cursor(self):
+        cfg = self.cfg
+        if self._cursor is None:
+            self._cursor = self.canvas.create_line(0, 0, 0, 0, fill="#ff6060", tags="cursor")
+        x = self._cursor_cycle * cfg.cell_width
+        self.canvas.coords(self._cursor, x, 0, x, cfg.total_height)
+
+    def _pyramid(self, row: int) -> MinMaxPyramid:
+        pyr = self._pyramids.get(row)
+        if pyr is None:
+            pyr = self._pyramids[row] = MinMaxPyramid(self.model.signals[row].waveform)
+        return pyr
+
+    def _wave_geometry(self, row: int) -> Tuple[List[float], List[float]]:
+        """그려진 cycle 창 안의 (polyline 좌표, 혼합 블록 polygon 좌표)."""
+        cfg = self.cfg
+        c0, c1, _, _ = self._drawn
+        wf = self.model.signals[row].waveform
+        c1 = min(c1, len(wf))
+        cw = cfg.cell_width
+        y_base = row * cfg.row_height
+        high_y = y_base + cfg.high_y_offset
+        low_y = y_base + cfg.low_y_offset
+        if c0 >= c1:
+            return [c0 * cw, low_y, c0 * cw, low_y], []
+
+        if 1.0 / cw < BASE_BUCKET:
+            # 확대 화면: 창 안의 edge만으로 정확한 polyline
+            sub = wf[c0:c1]
+            cur_y = high_y if sub[0] else low_y
+            points = [c0 * cw, cur_y]
+            for t in transitions(sub):
+                x = (c0 + t) * cw
+                target_y = low_y if cur_y == high_y else high_y
+                points.extend((x, cur_y, x, target_y))
+                cur_y = target_y
+            points.extend((c1 * cw, cur_y))
+            return points, []
+
+        # 축소 화면: bucket <= 1 pixel인 level에서 같은 code의 run 단위로 그림
+        pyr = self._pyramid(row)
+        k = pyr.level_for(1.0 / cw)
+        bucket = BASE_BUCKET << k
+        i0 = c0 // bucket
+        codes = pyr.levels[k][i0:-(-c1 // bucket)]
+        points: List[float] = []
+        blocks: List[float] = []
+        cur_y = None
+        for m in _CODE_RUN.finditer(codes):
+            code = m.group()[0]
+            xa = max(c0, (i0 + m.start()) * bucket) * cw
+            xb = min(c1, (i0 + m.end()) * bucket) * cw
+            if code == MIXED:
+                # 혼합 구간은 채워진 블록 (polygon 하나로 이어 붙임, Low 선을 따라 연결)
+                blocks.extend((xa, low_y, xa, high_y, xb, high_y, xb, low_y))
+                continue
+            y = high_y if code == HIGH else low_y
+            if cur_y is None:
+                points.extend((xa, y))
+            elif y != cur_y:
+                points.extend((xa, cur_y, xa, y))
+            cur_y = y
+        if cur_y is None:
+            cur_y = low_y
+            points.extend((c0 * cw, low_y))
+        points.extend((c1 * cw, cur_y))
+        return points, blocks
+
+    def _draw_wave(self, row: int):
+        """행의 polyline/블록 좌표만 갱신 (item이 없으면 재사용 풀에서 가져옴)."""
+        items = self._row_items.get(row)
+        if items is None:
+            if self._spare_items:
+                items = self._spare_items.pop()
+            else:
+                items = (self.canvas.create_line(0, 0, 0, 0, tags="wave"),
+                         self.canvas.create_polygon(0, 0, 0, 0, 0, 0, outline="", state="hidden",
+                                                    tags="wave"))
+            self._row_items[row] = items
+        line, block = items
+        points, blocks = self._wave_geometry(row)
+        self.canvas.coords(line, points)
+        if blocks:
+            self.canvas.coords(block, blocks)
+            if block not in self._blocks_shown:
+                self.canvas.itemconfigure(block, state="normal")
+                self._blocks_shown.add(block)
+        elif block in self._blocks_shown:
+            self.canvas.itemconfigure(block, state="hidden")
+            self._blocks_shown.discard(block)
+
+    def _style_row(self, row: int):
+        """활성 여부에 따라 색/두께 설정 (바뀐 경우에만)."""
+        is_active = row == self._active
+        if self._row_style.get(row) == is_active:
+            return
+        self._row_style[row] = is_active
+        line, block = self._row_items[row]
+        color = "blue" if is_active else self.cfg.wave_color
+        self.canvas.itemconfigure(line, fill=color, width=3 if is_active else 2, state="normal")
+        self.canvas.itemconfigure(block, fill=color)
@@ -0,0 +1,219 @@
+"""
+SPICE / Spectre PWL 전압원 출력 (Native PWL exporter).
+
+디지털 자극만 필요할 때는 Verilog-A behavioral 모듈보다 simulator 내장 PWL 전압원이 훨씬 빠르다.
+VerilogAGenerator와 같은 파라미터(tck/tr/tf/vhigh/vlow, GUI 1칸 = 0.5 tck)를 쓰고,
+edge마다 (edge 시각, 이전 전압) -> (edge 시각 + tr/tf, 새 전압) 두 점을 만든다.
+edge 간격보다 전환 시간이 길면 transition()처럼 다음 edge에서 중간 전압부터 다시 전환한다.
+tr/tf는 0보다 커야 하고, 길이 0인 파형은 PWL 점을 만들 수 없으므로 지원하지 않는다.
+
+- fmt="spectre" : V_x (x 0) vsource type=pwl wave=[...] [period=...]
+- fmt="spice"   : Vx x 0 PWL(...) [R=0]          (HSPICE 문법)
+- data_files=True 이면 점 목록을 신호별 외부 PWL 파일("시각 전압" 한 줄씩)로 쓰고 netlist에서 참조한다.
+점 목록은 생성하면서 바로 파일에 쓰므로 edge 수와 무관하게 메모리가 일정하다.
+
+"반복"/"pulse" 모드 신호는 최소 반복 단위만 출력하고 period(R)로 반복시킨다.
+단위의 마지막 값이 첫 값과 다르면 주기 끝에서 끝나도록 전환 구간을 넣는다.
+"""
+import os
+import re
+from typing import Dict, Iterator, List, Sequence, TextIO, Tuple
+
+from waveform_edges import iter_transitions, minimal_period
+
+PERIODIC_MODES = ("반복", "pulse")
+_SUFFIX = {"t": 1e12, "g": 1e9, "meg": 1e6, "k": 1e3, "m": 1e-3, "u": 1e-6,
+           "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18}
+_VALUE = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)\s*(meg|[tgkmunpfa])?[a-z]*\s*$", re.IGNORECASE)
+_POINTS_PER_LINE = 4
+
+
+def parse_spice_value(text: str) -> float:
+    """'10n', '1.5p', '2meg', '1e-9' 같은 SPICE 수치 표기를 float로 변환."""
+    m = _VALUE.match(str(text))
+    if not m:
+        raise ValueError(f"invalid SPICE value: {text!r}")
+    scale = _SUFFIX[m.group(2).lower()] if m.group(2) else 1.0
+    return float(m.group(1)) * scale
+
+
+def _sanitize(name: str, default: str) -> str:
+    s = re.sub(r"[^A-Za-z0-9_]", "_", name.strip())
+    if not s: s = default
+    if s[0].isdigit(): s = f"w_{s}"
+    return s
+
+
+def _check_edge_times(tr: float, tf: float):
+    if tr <= 0 or tf <= 0:
+        raise ValueError("tr and tf must be > 0 for PWL export (a zero edge time gives two points at one time)")
+
+
+def _check_length(unit_len: int, name: str = "waveform"):
+    if unit_len <= 0:
+        raise ValueError(f"{name} is empty (a PWL source needs at least one cycle)")
+
+
+def _pwl_points(v_init: float, steps: Iterator[Tuple[float, float, float]],
+                eps: float) -> Iterator[Tuple[float, float]]:
+    """
+    전환 목록 (시작 시각, 목표 전압, 전환 시간)을 시각이 엄격히 증가하는 PWL 점으로 바꾼다.
+    전환이 끝나기 전에 다음 전환이 시작되면 그 시각의 중간 전압에서 새 전환을 시작한다
+    (Verilog-A transition()이 진행 중인 전환을 중단하는 것과 같음). eps 안의 같은 시각 점은 하나로 합친다.
+    """
+    t_from = t_to = 0.0
+    v_from = v_to = v_init
+    pending = (0.0, v_init)
+    for t, v, ramp in steps:
+        if t >= t_to - eps:
+            start = v_to
+            points = ((t_to, v_to), (t, v_to))
+        else:
+            start = v_from + (v_to - v_from) * (t - t_from) / (t_to - t_from)
+            points = ((t, start),)
+        for point in points:
+            if point[0] > pending[0] + eps:
+                yield pending
+            pending = point
+        t_from, v_from, t_to, v_to = t, start, t + ramp, v
+    if t_to > pending[0] + eps:
+        yield pending
+        pending = (t_to, v_to)
+    yield pending
+
+
+def iter_points(wf: Sequence[int], unit_len: int, tck: float, tr: float, tf: float,
+                vhigh: float, vlow: float, periodic: bool) -> Iterator[Tuple[float, float]]:
+    """
+    파형 [0, unit_len) 구간의 PWL (시각, 전압) 점을 시각 순으로 생성.
+    edge i의 전환은 Verilog-A timer와 같은 시각 i * 0.5 tck에 시작해서 tr/tf 뒤에 끝난다.
+    간격이 좁아 전환이 겹치면 다음 edge에서 중간 전압부터 다시 전환한다 (시각은 항상 단조 증가).
+    one-shot은 마지막이 High면 GUI 길이 끝에서 Low로 떨어진다 (Verilog-A 출력과 동일).
+    tr/tf가 0이면 같은 시각에 두 점이 생기므로, 길이 0인 파형은 첫 값이 없으므로 지원하지 않는다 (ValueError).
+    """
+    _check_edge_times(tr, tf)
+    _check_length(min(unit_len, len(wf)))
+    volt = (vlow, vhigh)
+    ramp = (tf, tr)  # 목표 level별 전환 시간
+    first = 1 if wf[0] else 0
+    t_end = unit_len * 0.5 * tck
+
+    def steps():
+        level, t, t_done = first, 0.0, 0.0
+        for i in iter_transitions(wf):
+            if i >= unit_len:
+                break
+            level ^= 1
+            t = i * 0.5 * tck
+            t_done = t + ramp[level]
+            yield t, volt[level], ramp[level]
+        if periodic:
+            if level != first or t_done > t_end:
+                # 다음 주기의 첫 값에 주기 끝(t_end)에서 도달하도록. 마지막 전환과 겹치면 그만큼 짧게
+                start = max(t_end - ramp[first], t)
+                yield start, volt[first], t_end - start
+            else:
+                yield t_end, volt[level], 0.0
+        elif level:
+            yield t_end, vlow, tf
+
+    return _pwl_points(volt[first], steps(), min(tr, tf) * 1e-6)
+
+
+def _write_points(fp: TextIO, points: Iterator[Tuple[float, float]], prefix: str, suffix: str, per_line: int):
+    """점 목록을 줄 단위로 스트리밍 출력."""
+    buf: List[str] = []
+    for t, v in points:
+        buf.append(f"{t:.12g} {v:.12g}")
+        if len(buf) == per_line:
+            fp.write(prefix + " ".join(buf) + suffix + "\n")
+            buf.clear()
+    if buf:
+        fp.write(prefix + " ".join(buf) + suffix + "\n")
+
+
+def write_netlist(fp: TextIO,
+                  waveforms: Sequence[Sequence[int]],
+                  names: List[str],
+                  modes: List[str],
+                  params: Dict,
+                  fmt: str = "spectre",
+                  data_dir: str = None) -> List[str]:
+    """
+    PWL 전압원 netlist 조각을 fp에 쓴다.
+    :param params: VerilogAGenerator와 같은 dict (tck_str, tr_str, tf_str, vhigh, vlow)
+    :param data_dir: 주면 신호별 점 목록을 data_dir/<name>.pwl 파일로 쓰고 netlist에서 참조
+    :return: 작성한 외부 PWL 파일 경로 목록
+    """
+    if fmt not in ("spectre", "spice"):
+        raise ValueError(f"unknown netlist format: {fmt!r}")
+    tck = parse_spice_value(params.get('tck_str', '10n'))
+    tr = parse_spice_value(params.get('tr_str', '10p'))
+    tf = parse_spice_value(params.get('tf_str', '10p'))
+    _check_edge_times(tr, tf)  # 파일에 쓰기 전에 확인
+    for idx, wf in enumerate(waveforms):
+        _check_length(len(wf), f"signal {names[idx]!r}")
+    vhigh = params['vhigh']
+    vlow = params['vlow']
+    minimize_period = params.get('minimize_period', True)
+    comment = "//" if fmt == "spectre" else "*"
+
+    fp.write(f"{comment} Auto-generated by Python Waveform Editor (native PWL sources)\n")
+    fp.write(f"{comment} tck={params.get('tck_str', '10n')} tr={params.get('tr_str', '10p')} "
+             f"tf={params.get('tf_str', '10p')} vlow={vlow} vhigh={vhigh}\n")
+    if fmt == "spectre":
+        fp.write("simulator lang=spectre\n")
+
+    data_files = []
+    used = set()
+    for idx, wf in enumerate(waveforms):
+        name = _sanitize(names[idx], f"sig_{idx}")
+        while name in used:
+            name += "_"
+        used.add(name)
+        periodic = modes[idx] in PERIODIC_MODES
+        unit_len = len(wf)
+        if periodic and minimize_period:
+            unit = minimal_period(wf)
+            if unit > 1:
+                unit_len = unit
+        period = unit_len * 0.5 * tck
+        points = iter_points(wf, unit_len, tck, tr, tf, vhigh, vlow, periodic)
+
+        fp.write(f"\n{comment} {name} ({modes[idx]})\n")
+        if data_dir is not None:
+            path = os.path.join(data_dir, f"{name}.pwl")
+            with open(path, "w", encoding="utf-8") as df:
+                _write_points(df, points, "", "", 1)
+            data_files.append(path)
+            if fmt == "spectre":
+                repeat = f" period={period:.12g}" if periodic else ""
+                fp.write(f'V_{name} ({name} 0) vsource type=pwl file="{path}"{repeat}\n')
+            else:
+                repeat = " R=0" if periodic else ""
+                fp.write(f"V{name} {name} 0 PWL PWLFILE='{path}'{repeat}\n")
+        elif fmt == "spectre":
+            fp.write(f"V_{name} ({name} 0) vsource type=pwl wave=[ \\\n")
+            _write_points(fp, points, "    ", " \\", _POINTS_PER_LINE)
+            fp.write(f"    ]{f' period={period:.12g}' if periodic else ''}\n")
+        else:
+            fp.write(f"V{name} {name} 0 PWL(\n")
+            _write_points(fp, points, "+ ", "", _POINTS_PER_LINE)
+            fp.write(f"+ ){' R=0' if periodic else ''}\n")
+    return data_files
+
+
+def export_pwl(path: str,
+               waveforms: Sequence[Sequence[int]],
+               names: List[str],
+               modes: List[str],
+               params: Dict,
+               fmt: str = "spectre",
+               data_files: bool = False) -> List[str]:
+    """netlist 파일(path)을 쓰고, data_files면 같은 폴더의 <netlist>_pwl/ 에 PWL 파일을 쓴다 (netlist에는 절대 경로로 참조)."""
+    data_dir = None
+    if data_files:
+        data_dir = os.path.abspath(os.path.splitext(path)[0] + "_pwl")
+        os.makedirs(data_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        return write_netlist(fp, waveforms, names, modes, params, fmt, data_dir)
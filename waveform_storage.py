@@ -0,0 +1,486 @@
+"""
+파형 저장소 (Waveform storage backends).
+
+BitWaveform: 0/1 파형을 cycle당 1 bit로 bytearray에 packing한 시퀀스.
+EdgeWaveform: 초기값 + 정렬된 edge 리스트로 저장하는 run-length 파형.
+둘 다 List[int]와 같은 인덱싱/슬라이싱/순회를 지원하므로 기존 코드에 그대로 넘길 수 있다.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Union
+
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_BYTE_BITS = [tuple(b for b in range(8) if n >> b & 1) for n in range(256)]
+
+
+def _repeat(wf, times: int, empty):
+    """wf를 times번 이어 붙인다. 두 배씩 키워서 이어 붙이기는 O(log times)번."""
+    out, block = empty, wf
+    while times > 0:
+        if times & 1:
+            out = out + block
+        times >>= 1
+        if times:
+            block = block + block
+    return out
+
+
+def _pack_int(values: List[int]) -> int:
+    """0/1 시퀀스를 LSB-first 정수로 packing (bit i = values[i])."""
+    digits = "".join("1" if v else "0" for v in reversed(values))
+    return int(digits, 2) if digits else 0
+
+
+class BitWaveform:
+    """
+    bytearray 기반 bit-packed 파형.
+    boxed int 리스트 대비 메모리 64배 절약 (포인터 8 byte -> 1 bit).
+    """
+    __slots__ = ("_bits", "_len")
+
+    def __init__(self, values: Iterable[int] = ()):
+        if isinstance(values, BitWaveform):
+            self._bits = bytearray(values._bits)
+            self._len = values._len
+        elif isinstance(values, EdgeWaveform):
+            # High run 단위 memset (cycle 단위 변환 없음)
+            self._len = len(values)
+            self._bits = bytearray((self._len + 7) // 8)
+            bounds = [0] + values.transitions() + [self._len]
+            for k in range(0 if values._init else 1, len(bounds) - 1, 2):
+                self.fill(bounds[k], bounds[k + 1], 1)
+        else:
+            values = list(values)
+            self._len = len(values)
+            self._bits = bytearray(_pack_int(values).to_bytes((self._len + 7) // 8, "little"))
+
+    @classmethod
+    def zeros(cls, length: int) -> "BitWaveform":
+        wf = cls.__new__(cls)
+        wf._bits = bytearray((length + 7) // 8)
+        wf._len = length
+        return wf
+
+    @classmethod
+    def frombytes(cls, data: bytes, length: int) -> "BitWaveform":
+        """tobytes() 결과(LSB-first packed bytes)로부터 복원."""
+        if len(data) != (length + 7) // 8:
+            raise ValueError("packed data size does not match length")
+        wf = cls.__new__(cls)
+        wf._bits = bytearray(data)
+        wf._len = length
+        return wf
+
+    @classmethod
+    def _from_int(cls, n: int, length: int) -> "BitWaveform":
+        wf = cls.__new__(cls)
+        wf._bits = bytearray(n.to_bytes((length + 7) // 8, "little"))
+        wf._len = length
+        return wf
+
+    def _as_int(self) -> int:
+        return int.from_bytes(self._bits, "little")
+
+    def _window(self, start: int, stop: int):
+        """[start, stop)을 덮는 byte 범위와 그 안에서의 bit 오프셋 (슬라이스 비용을 구간 크기로 제한)."""
+        b0, b1 = start >> 3, (stop + 7) >> 3
+        return b0, b1, start - (b0 << 3)
+
+    # -------------------- 시퀀스 프로토콜 -------------------- #
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _check_index(self, i: int) -> int:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("waveform index out of range")
+        return i
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return BitWaveform(self.tolist()[key])
+            length = max(0, stop - start)
+            b0, b1, shift = self._window(start, stop)
+            n = int.from_bytes(self._bits[b0:b1], "little") >> shift
+            return BitWaveform._from_int(n & ((1 << length) - 1), length)
+        i = self._check_index(key)
+        return (self._bits[i >> 3] >> (i & 7)) & 1
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if isinstance(value, int):
+                if step != 1:
+                    raise ValueError("scalar assignment requires a contiguous slice")
+                self.fill(start, stop, value)
+                return
+            indices = range(start, stop, step)
+            if isinstance(value, BitWaveform) and step == 1:
+                if len(value) != len(indices):
+                    raise ValueError("BitWaveform slice assignment cannot change length")
+                packed = value._as_int()
+            else:
+                values = list(value)
+                if len(values) != len(indices):
+                    raise ValueError("BitWaveform slice assignment cannot change length")
+                if step != 1:
+                    for i, v in zip(indices, values):
+                        self[i] = v
+                    return
+                packed = _pack_int(values)
+            if not indices:
+                return
+            b0, b1, shift = self._window(start, stop)
+            mask = ((1 << len(indices)) - 1) << shift
+            n = (int.from_bytes(self._bits[b0:b1], "little") & ~mask) | (packed << shift)
+            self._bits[b0:b1] = n.to_bytes(b1 - b0, "little")
+            return
+        i = self._check_index(key)
+        if value:
+            self._bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self._bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BitWaveform):
+            return self._len == other._len and self._bits == other._bits
+        try:
+            return self.tolist() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BitWaveform({self.tolist()!r})"
+
+    # -------------------- 범위 연산 -------------------- #
+
+    def fill(self, start: int, end: int, value: int) -> None:
+        """[start, end) 구간을 value로 채운다. 중간의 완전한 byte는 한 번에 memset."""
+        start = max(0, start)
+        end = min(self._len, end)
+        if start >= end:
+            return
+        first_full = (start + 7) >> 3
+        last_full = end >> 3
+        if first_full >= last_full:
+            # 구간이 한 byte 경계 안쪽에 있음
+            for i in range(start, end):
+                self[i] = value
+            return
+        for i in range(start, first_full << 3):
+            self[i] = value
+        byte = 0xFF if value else 0x00
+        self._bits[first_full:last_full] = bytes([byte]) * (last_full - first_full)
+        for i in range(last_full << 3, end):
+            self[i] = value
+
+    def resize(self, length: int) -> None:
+        """길이를 변경한다. 늘어난 cycle은 0(Low)."""
+        if length < self._len:
+            self._bits = self._bits[:(length + 7) // 8]
+            self._len = length
+            # 마지막 byte의 잘려 나간 bit 정리
+            if length & 7:
+                self._bits[-1] &= (1 << (length & 7)) - 1
+        else:
+            self._bits.extend(bytes((length + 7) // 8 - len(self._bits)))
+            self._len = length
+
+    def extend(self, values: Iterable[int]) -> None:
+        values = list(values)
+        old = self._len
+        self.resize(old + len(values))
+        self[old:old + len(values)] = values
+
+    def __add__(self, other) -> "BitWaveform":
+        """이어 붙인 새 파형 (list + list와 같음). packed 정수 shift/or 한 번."""
+        if not isinstance(other, BitWaveform):
+            other = BitWaveform(other)
+        return BitWaveform._from_int(self._as_int() | (other._as_int() << self._len), self._len + other._len)
+
+    def __mul__(self, times: int) -> "BitWaveform":
+        """times번 반복한 새 파형 (list * n과 같음)."""
+        return _repeat(self, times, BitWaveform.zeros(0))
+
+    def inverted(self) -> "BitWaveform":
+        """0/1을 뒤집은 새 파형."""
+        return BitWaveform._from_int(~self._as_int() & ((1 << self._len) - 1), self._len)
+
+    def copy(self) -> "BitWaveform":
+        return BitWaveform(self)
+
+    def tobytes(self) -> bytes:
+        """packed bit 배열 (LSB-first, bit i = wf[i])"""
+        return bytes(self._bits)
+
+    def tolist(self) -> List[int]:
+        if not self._len:
+            return []
+        digits = format(self._as_int(), f"0{self._len}b")[::-1]
+        return [1 if c == "1" else 0 for c in digits[:self._len]]
+
+    def count(self, value: int = 1) -> int:
+        ones = self._as_int().bit_count()
+        return ones if value else self._len - ones
+
+    def transitions(self) -> List[int]:
+        """값이 바뀌는 cycle 인덱스 목록 (i >= 1 이고 wf[i] != wf[i-1])."""
+        if self._len < 2:
+            return []
+        n = self._as_int()
+        x = (n ^ (n << 1)) & ((1 << self._len) - 1) & ~1
+        edges = []
+        # 0이 아닌 byte만 정규식(C 루프)으로 건너뛰며 찾는다
+        for m in _NONZERO_BYTE.finditer(x.to_bytes(len(self._bits), "little")):
+            base = m.start() << 3
+            edges.extend(base + b for b in _BYTE_BITS[m.group()[0]])
+        return edges
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class EdgeWaveform:
+    """
+    Edge-list 기반 파형 (run-length).
+    초기값 + 값이 바뀌는 cycle 인덱스의 정렬 리스트만 저장한다.
+    범위 쓰기/클리어/길이 변경이 O(log n + 건드린 edge 수)이므로,
+    edge가 적은 긴 one-shot 파형에 적합하다.
+    """
+    __slots__ = ("_init", "_edges", "_len")
+
+    def __init__(self, values: Iterable[int] = ()):
+        if isinstance(values, EdgeWaveform):
+            self._init, self._edges, self._len = values._init, list(values._edges), values._len
+        elif isinstance(values, BitWaveform):
+            self._len = len(values)
+            self._init = values[0] if self._len else 0
+            self._edges = values.transitions()
+        else:
+            values = list(values)
+            self._len = len(values)
+            self._init = 1 if values and values[0] else 0
+            self._edges = [i for i in range(1, self._len) if bool(values[i]) != bool(values[i - 1])]
+
+    @classmethod
+    def zeros(cls, length: int) -> "EdgeWaveform":
+        wf = cls.__new__(cls)
+        wf._init, wf._edges, wf._len = 0, [], length
+        return wf
+
+    @classmethod
+    def from_edges(cls, init: int, edges: Iterable[int], length: int) -> "EdgeWaveform":
+        """초기값과 정렬된 edge 인덱스(1 <= e < length)로부터 생성."""
+        wf = cls.__new__(cls)
+        wf._init, wf._edges, wf._len = (1 if init else 0), list(edges), length
+        if wf._edges and not (0 < wf._edges[0] and wf._edges[-1] < length):
+            raise ValueError("edge index out of range")
+        return wf
+
+    def _value_at(self, i: int) -> int:
+        return self._init ^ (bisect_right(self._edges, i) & 1)
+
+    # -------------------- 시퀀스 프로토콜 -------------------- #
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return EdgeWaveform(self.tolist()[key])
+            wf = EdgeWaveform.zeros(max(0, stop - start))
+            if wf._len:
+                wf._init = self._value_at(start)
+                lo = bisect_right(self._edges, start)
+                hi = bisect_left(self._edges, stop)
+                wf._edges = [e - start for e in self._edges[lo:hi]]
+            return wf
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("waveform index out of range")
+        return self._value_at(key)
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if isinstance(value, int):
+                if step != 1:
+                    raise ValueError("scalar assignment requires a contiguous slice")
+                self.fill(start, stop, value)
+                return
+            indices = range(start, stop, step)
+            if isinstance(value, EdgeWaveform) and step == 1:
+                if len(value) != len(indices):
+                    raise ValueError("EdgeWaveform slice assignment cannot change length")
+                self._splice(start, value)
+                return
+            values = list(value)
+            if len(values) != len(indices):
+                raise ValueError("EdgeWaveform slice assignment cannot change length")
+            if step != 1:
+                for i, v in zip(indices, values):
+                    self[i] = v
+                return
+            # 같은 값이 이어지는 run 단위로 채운다
+            run_start = 0
+            for i in range(1, len(values) + 1):
+                if i == len(values) or bool(values[i]) != bool(values[run_start]):
+                    self.fill(start + run_start, start + i, values[run_start])
+                    run_start = i
+            return
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("waveform index out of range")
+        self.fill(key, key + 1, value)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EdgeWaveform):
+            return (self._len, self._init, self._edges) == (other._len, other._init, other._edges)
+        try:
+            return self.tolist() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EdgeWaveform(len={self._len}, init={self._init}, edges={self._edges!r})"
+
+    # -------------------- 범위 연산 -------------------- #
+
+    def fill(self, start: int, end: int, value: int) -> None:
+        """[start, end) 구간을 value로 채운다. 구간 안의 edge만 제거/추가."""
+        start = max(0, start)
+        end = min(self._len, end)
+        if start >= end:
+            return
+        value = 1 if value else 0
+        edges = self._edges
+        before = self._value_at(start - 1) if start > 0 else None
+        after = self._value_at(end) if end < self._len else None
+
+        lo = bisect_left(edges, start)
+        hi = bisect_right(edges, end)
+        new_edges = []
+        if start == 0:
+            self._init = value
+        elif before != value:
+            new_edges.append(start)
+        if after is not None and after != value:
+            new_edges.append(end)
+        edges[lo:hi] = new_edges
+
+    def _splice(self, start: int, other: "EdgeWaveform") -> None:
+        """[start, start + len(other)) 구간을 other로 교체. edge 리스트끼리만 계산."""
+        end = start + other._len
+        if start >= end:
+            return
+        edges = self._edges
+        first = other._init
+        last = first ^ (len(other._edges) & 1)
+        before = self._value_at(start - 1) if start > 0 else None
+        after = self._value_at(end) if end < self._len else None
+
+        lo = bisect_left(edges, start)
+        hi = bisect_right(edges, end)
+        new_edges = []
+        if start == 0:
+            self._init = first
+        elif before != first:
+            new_edges.append(start)
+        new_edges.extend(e + start for e in other._edges)
+        if after is not None and after != last:
+            new_edges.append(end)
+        edges[lo:hi] = new_edges
+
+    def resize(self, length: int) -> None:
+        """길이를 변경한다. 늘어난 cycle은 0(Low)."""
+        if length < self._len:
+            del self._edges[bisect_left(self._edges, length):]
+            if length == 0:
+                self._init = 0
+        elif length > self._len:
+            if self._len == 0:
+                self._init = 0
+            elif self._value_at(self._len - 1):
+                self._edges.append(self._len)
+        self._len = length
+
+    def extend(self, values: Iterable[int]) -> None:
+        values = list(values)
+        old = self._len
+        self.resize(old + len(values))
+        self[old:old + len(values)] = values
+
+    def __add__(self, other) -> "EdgeWaveform":
+        """이어 붙인 새 파형 (list + list와 같음). 경계에서 값이 바뀌면 edge 하나를 추가."""
+        if not isinstance(other, EdgeWaveform):
+            other = EdgeWaveform(other)
+        if not self._len:
+            return other.copy()
+        wf = self.copy()
+        if other._len:
+            if other._init != self._init ^ (len(self._edges) & 1):
+                wf._edges.append(self._len)
+            wf._edges.extend(e + self._len for e in other._edges)
+            wf._len += other._len
+        return wf
+
+    def __mul__(self, times: int) -> "EdgeWaveform":
+        """times번 반복한 새 파형 (list * n과 같음)."""
+        return _repeat(self, times, EdgeWaveform.zeros(0))
+
+    def inverted(self) -> "EdgeWaveform":
+        """0/1을 뒤집은 새 파형 (초기값만 바뀌고 edge는 그대로)."""
+        wf = self.copy()
+        if wf._len:
+            wf._init ^= 1
+        return wf
+
+    def copy(self) -> "EdgeWaveform":
+        return EdgeWaveform(self)
+
+    def tolist(self) -> List[int]:
+        out: List[int] = []
+        val = self._init
+        prev = 0
+        for e in self._edges + [self._len]:
+            out.extend([val] * (e - prev))
+            val ^= 1
+            prev = e
+        return out
+
+    def count(self, value: int = 1) -> int:
+        bounds = [0] + self._edges + [self._len]
+        first = 0 if self._init else 1
+        ones = sum(bounds[k + 1] - bounds[k] for k in range(first, len(bounds) - 1, 2))
+        return ones if value else self._len - ones
+
+    def transitions(self) -> List[int]:
+        return list(self._edges)
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * len(self._edges)
+
+
+WAVEFORM_TYPES = (BitWaveform, EdgeWaveform)
+
+# 설정 이름 -> 저장소 클래스
+STORAGE_BACKENDS = {
+    "bits": BitWaveform,
+    "edges": EdgeWaveform,
+}
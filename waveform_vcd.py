@@ -0,0 +1,346 @@
+"""
+VCD 가져오기 (Streaming VCD importer).
+
+RTL 시뮬레이션의 VCD dump에서 선택한 scalar/vector 신호를 GUI 파형(cycle 단위 0/1)으로 변환한다.
+
+- 헤더($enddefinitions까지)만 먼저 읽어 신호 목록을 보여준다 (scan_vcd).
+- 본문은 큰 chunk 단위로 읽고, 선택한 신호의 변화와 timestamp만 정규식(C 루프)으로 골라낸다.
+  선택하지 않은 신호의 줄은 Python 코드를 거치지 않으므로 수 GB dump도 일정한 메모리로 처리된다.
+- 샘플링: 일정 주기(period, 기본 1칸 = 0.5 tck) 또는 VCD 안의 clock 신호 edge마다 한 칸.
+  칸 k의 값은 샘플 시각 t_k에 유효한 값 (t_k에 일어난 변화 포함). x/z는 0으로 본다.
+- 결과 파형은 edge 목록에서 바로 EdgeWaveform(또는 지정한 저장소)으로 만든다 (cycle 단위 리스트 없음).
+
+vector 신호는 bit마다 하나의 신호("bus[3]")가 된다. 이름만 선택하면("bus") MSB부터 모든 bit.
+bit마다 따로 선언된 변수("data [0]", "data [1]")는 범위를 붙인 이름("data[0]")으로 선택한다.
+이름이 서로 다른 변수 여럿에 해당하면(같은 계층 이름이 두 번 선언됨 등) ValueError.
+값 변화는 표준 VCD writer처럼 한 줄에 하나씩 있다고 가정한다.
+
+    python waveform_vcd.py dump.vcd -s tb.clk -s tb.data --period 5ns -o seed.wfb
+"""
+import argparse
+import re
+import sys
+from fractions import Fraction
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from waveform_io import write_project
+from waveform_spice import parse_spice_value
+from waveform_storage import EdgeWaveform
+
+CHUNK_SIZE = 8 << 20
+_RANGE = re.compile(r"\[(\d+)(?::(\d+))?\]$")
+
+
+class VcdVar(NamedTuple):
+    """VCD $var 선언 하나. lsb/msb는 bit 번호 (scalar는 0, 0). ranged: 선언에 bit 범위가 있었는지."""
+    code: str
+    name: str  # 계층 이름 (scope.ref, 범위 제외)
+    width: int
+    msb: int
+    lsb: int
+    ranged: bool = False
+
+    @property
+    def full_name(self) -> str:
+        """범위까지 붙인 이름 ("tb.bus[7:0]", "tb.data[0]", scalar는 "tb.clk")."""
+        if not self.ranged:
+            return self.name
+        if self.msb == self.lsb:
+            return f"{self.name}[{self.msb}]"
+        return f"{self.name}[{self.msb}:{self.lsb}]"
+
+    def bit_names(self) -> List[str]:
+        """MSB부터의 bit 신호 이름. 범위 없는 1 bit 변수는 자기 이름 하나."""
+        if self.width == 1 and not self.ranged:
+            return [self.name]
+        step = -1 if self.msb >= self.lsb else 1
+        return [f"{self.name}[{b}]" for b in range(self.msb, self.lsb + step, step)]
+
+
+class VcdHeader(NamedTuple):
+    timescale: float  # 1 tick의 길이 (초)
+    vars: List[VcdVar]
+    body_offset: int  # $enddefinitions $end 다음 byte 위치
+
+
+def _parse_timescale(text: str) -> float:
+    return parse_spice_value(text.replace(" ", ""))
+
+
+def scan_vcd(path: str) -> VcdHeader:
+    """헤더만 읽어 timescale과 변수 목록을 반환 (본문은 읽지 않음)."""
+    scopes: List[str] = []
+    variables: List[VcdVar] = []
+    timescale = 1e-9
+    buf = b""
+    with open(path, "rb") as f:
+        while True:
+            end = buf.find(b"$enddefinitions")
+            if end >= 0:
+                close = buf.find(b"$end", end + len(b"$enddefinitions"))
+                if close >= 0:
+                    break
+            chunk = f.read(1 << 20)
+            if not chunk:
+                raise ValueError("VCD header is not terminated by $enddefinitions")
+            buf += chunk
+    body_offset = close + len(b"$end")
+    tokens = buf[:end].decode("utf-8", "replace").split()
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        try:
+            stop = tokens.index("$end", i + 1)
+        except ValueError:
+            stop = len(tokens)
+        args = tokens[i + 1:stop]
+        if tok == "$timescale" and args:
+            timescale = _parse_timescale("".join(args))
+        elif tok == "$scope" and len(args) >= 2:
+            scopes.append(args[1])
+        elif tok == "$upscope" and scopes:
+            scopes.pop()
+        elif tok == "$var" and len(args) >= 4:
+            width, code, ref = int(args[1]), args[2], args[3]
+            rng = "".join(args[4:]) or ""
+            m = _RANGE.search(ref) if not rng else _RANGE.match(rng)
+            if m and not rng:
+                ref = ref[:m.start()]
+            msb = int(m.group(1)) if m else width - 1
+            lsb = int(m.group(2)) if m and m.group(2) is not None else (msb if m else 0)
+            variables.append(VcdVar(code, ".".join(scopes + [ref]), width, msb, lsb, m is not None))
+        i = stop + 1 if tok.startswith("$") else i + 1
+    return VcdHeader(timescale, variables, body_offset)
+
+
+class _Bit:
+    """선택한 bit 하나의 샘플링 상태 (edge 목록 + 아직 확정되지 않은 마지막 변화)."""
+    __slots__ = ("name", "init", "level", "edges", "pend_k", "pend_v")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.init = 0
+        self.level = 0
+        self.edges: List[int] = []
+        self.pend_k = 0
+        self.pend_v = 0
+
+    def commit(self):
+        """pending 변화를 확정. 같은 칸 안의 여러 변화는 마지막 값만 남는다 (glitch 제거)."""
+        if self.pend_v != self.level:
+            if self.pend_k == 0:
+                self.init = self.pend_v
+            else:
+                self.edges.append(self.pend_k)
+            self.level = self.pend_v
+
+    def set(self, k: int, v: int):
+        if k != self.pend_k:
+            self.commit()
+            self.pend_k = k
+        self.pend_v = v
+
+
+def _find(header: VcdHeader, name: str) -> List[Tuple[VcdVar, List[int]]]:
+    """
+    선택 이름에 해당하는 (변수, LSB 기준 bit 위치 목록[MSB부터]).
+    범위까지 붙인 이름 -> bit 이름("bus[3]") -> 범위 없는 이름("bus": 모든 bit) 순으로 찾는다.
+    같은 id code의 중복 선언은 하나로 본다.
+    """
+    for match in (lambda v: v.full_name == name,
+                  lambda v: name in v.bit_names() and v.width > 1,
+                  lambda v: v.name == name):
+        found = {}
+        for v in header.vars:
+            if match(v):
+                found.setdefault((v.code, v.msb, v.lsb), v)
+        if found:
+            break
+    else:
+        raise KeyError(f"signal not found in VCD: {name}")
+    if len(found) > 1:
+        raise ValueError(f"ambiguous VCD signal name {name!r}: matches "
+                         f"{', '.join(sorted(v.full_name + ' (' + v.code + ')' for v in found.values()))}")
+    var = next(iter(found.values()))
+    names = var.bit_names()
+    if name in names and var.width > 1:
+        return [(var, [var.width - 1 - names.index(name)])]
+    return [(var, [var.width - 1 - i for i in range(var.width)])]
+
+
+def _select(header: VcdHeader, names: Sequence[str]) -> Tuple[Dict[str, List[Tuple[int, _Bit]]], List[_Bit]]:
+    """
+    선택 이름을 (id code -> [(LSB 기준 bit 위치, _Bit)]) 로 변환.
+    "bus"는 모든 bit, "bus[3]"은 한 bit, 따로 선언된 bit 변수는 "data[0]".
+    """
+    watch: Dict[str, List[Tuple[int, _Bit]]] = {}
+    bits: List[_Bit] = []
+    for name in names:
+        for var, positions in _find(header, name):
+            bit_names = var.bit_names()
+            for pos in positions:
+                bit = _Bit(bit_names[var.width - 1 - pos])
+                bits.append(bit)
+                watch.setdefault(var.code, []).append((pos, bit))
+    return watch, bits
+
+
+def _body_pattern(codes: Sequence[str]) -> "re.Pattern":
+    """timestamp와 선택한 id code의 scalar/vector 변화만 매칭하는 정규식."""
+    alt = b"|".join(re.escape(c.encode()) for c in sorted(codes, key=len, reverse=True))
+    return re.compile(
+        rb"^[ \t]*(?:#(\d+)|([01xXzZ])(" + alt + rb")|[bB]([01xXzZ]+)[ \t]+(" + alt + rb"))[ \t]*\r?$",
+        re.MULTILINE)
+
+
+def read_vcd(path: str,
+             signals: Sequence[str],
+             period: Optional[str] = None,
+             clock: Optional[str] = None,
+             clock_edges: str = "both",
+             offset: str = "0",
+             num_cycles: Optional[int] = None,
+             storage: type = EdgeWaveform,
+             header: Optional[VcdHeader] = None) -> Tuple[int, List[Tuple[str, str, Sequence[int]]]]:
+    """
+    VCD를 스트리밍으로 읽어 선택한 신호를 cycle 파형으로 변환.
+    :param period: 샘플 간격 ("5n" 등, GUI 한 칸). clock을 주지 않으면 필수
+    :param clock: 샘플 기준 clock 신호 이름. clock_edges="both"면 edge마다 한 칸 (한 칸 = 0.5 tck),
+                  "rising"이면 상승 edge마다 한 칸
+    :param offset: 일정 주기 샘플링의 첫 샘플 시각
+    :param num_cycles: 칸 수. 주면 그 이후의 dump는 읽지 않는다. 없으면 마지막 timestamp까지
+    :return: (num_cycles, [(name, "one-shot", waveform)]) - write_project()에 그대로 넘길 수 있다
+    """
+    if header is None:
+        header = scan_vcd(path)
+    if (period is None) == (clock is None):
+        raise ValueError("specify exactly one of period or clock")
+    watch, bits = _select(header, signals)
+
+    clk_code = None
+    if clock is not None:
+        (clk_var, _), = _find(header, clock)
+        if clk_var.width != 1:
+            raise KeyError(f"clock must be a scalar signal in the VCD: {clock}")
+        clk_code = clk_var.code
+        clk_rise_only = clock_edges == "rising"
+    else:
+        # 주기/시작 시각을 tick 단위 유리수로 (정수 연산으로 칸 번호 계산)
+        step = Fraction(parse_spice_value(period) / header.timescale).limit_denominator(1 << 20)
+        start = Fraction(parse_spice_value(offset) / header.timescale).limit_denominator(1 << 20)
+        if step <= 0:
+            raise ValueError("sampling period must be positive")
+        # 칸 번호 = ceil((t - start) / step) = -((s_num - t * s_den) // s_div)
+        s_den = step.denominator * start.denominator
+        s_num = start.numerator * step.denominator
+        s_div = step.numerator * start.denominator
+
+    codes = set(watch)
+    if clk_code is not None:
+        codes.add(clk_code)
+    pattern = _body_pattern(sorted(codes))
+    scalar = {b"1": 1}
+    vec_fill = {"x", "X", "z", "Z"}
+
+    k = 0            # 현재 timestamp의 변화가 반영되는 첫 칸
+    t_last = 0
+    clk_level = None
+    clk_count = 0    # 지금까지 지나간 clock 샘플 edge 수
+    done = False
+    watch_b = {c.encode(): v for c, v in watch.items()}
+    clk_b = clk_code.encode() if clk_code is not None else None
+
+    with open(path, "rb") as f:
+        f.seek(header.body_offset)
+        rest = b""
+        while not done:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                buf, rest = rest + b"\n", b""
+            else:
+                buf = rest + chunk
+                cut = buf.rfind(b"\n") + 1
+                buf, rest = buf[:cut], buf[cut:]
+            for m in pattern.finditer(buf):
+                ts, sval, scode, vval, vcode = m.groups()
+                if ts is not None:
+                    t_last = int(ts)
+                    if clk_b is None:
+                        # 샘플 시각 >= t 인 첫 칸
+                        k = max(0, -((s_num - t_last * s_den) // s_div))
+                    else:
+                        k = clk_count
+                    if num_cycles is not None and k >= num_cycles:
+                        done = True
+                        break
+                    continue
+                if scode is not None:
+                    code, v = scode, scalar.get(sval, 0)
+                    if code == clk_b:
+                        if clk_level is not None and v != clk_level and (v or not clk_rise_only):
+                            clk_count += 1
+                        clk_level = v
+                    for _, bit in watch_b.get(code, ()):
+                        bit.set(k, v)
+                else:
+                    targets = watch_b.get(vcode)
+                    if not targets:
+                        continue
+                    s = vval.decode()
+                    pad = s[0] if s[0] in vec_fill else "0"
+                    for pos, bit in targets:
+                        c = s[-1 - pos] if pos < len(s) else pad
+                        bit.set(k, 1 if c == "1" else 0)
+            if not chunk:
+                break
+
+    if num_cycles is None:
+        if clk_b is not None:
+            num_cycles = clk_count
+        else:
+            num_cycles = max(0, (t_last * s_den - s_num) // s_div + 1)
+    num_cycles = int(num_cycles)
+
+    result = []
+    for bit in bits:
+        if bit.pend_k < num_cycles:
+            bit.commit()
+        edges = bit.edges
+        if edges and edges[-1] >= num_cycles:
+            edges = [e for e in edges if e < num_cycles]
+        wf = EdgeWaveform.from_edges(bit.init, edges, num_cycles)
+        result.append((bit.name, "one-shot", wf if storage is EdgeWaveform else storage(wf)))
+    return num_cycles, result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert selected VCD signals to a waveform project.")
+    parser.add_argument("vcd", help="input .vcd file")
+    parser.add_argument("-s", "--signal", action="append", default=[],
+                        help="hierarchical signal name (vector name, or name[bit]); repeatable")
+    parser.add_argument("-o", "--output", help="output project (.wfb or .json)")
+    parser.add_argument("--list", action="store_true", help="list signals in the VCD and exit")
+    parser.add_argument("--period", help="sampling period per GUI cell (e.g. 5ns)")
+    parser.add_argument("--clock", help="sample on edges of this VCD clock signal")
+    parser.add_argument("--rising", action="store_true", help="with --clock, sample on rising edges only")
+    parser.add_argument("--offset", default="0", help="time of the first sample (with --period)")
+    parser.add_argument("-n", "--cycles", type=int, help="number of cells (default: whole dump)")
+    args = parser.parse_args(argv)
+
+    header = scan_vcd(args.vcd)
+    if args.list:
+        for v in header.vars:
+            print(v.full_name)
+        return 0
+    if not args.signal or not args.output:
+        parser.error("--signal and --output are required unless --list is given")
+    num_cycles, signals = read_vcd(args.vcd, args.signal, args.period, args.clock,
+                                   "rising" if args.rising else "both", args.offset, args.cycles,
+                                   header=header)
+    write_project(args.output, num_cycles, signals)
+    print(f"{len(signals)} signals x {num_cycles} cycles -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())